@@ -0,0 +1,280 @@
+"""
+작업 수락 제어와 스케줄링 모듈
+
+동시에 실행할 작업 수와 대기열 길이(전체, 클라이언트별)를 제한한다.
+한도를 넘은 요청은 거절하고, 현재 대기열의 예상 남은 작업량으로 다시 시도할 시각(Retry-After)을 계산한다.
+대기 작업은 예상 처리 시간이 짧은 순서로 실행하되(SJF), 오래 기다린 작업의 우선순위를 올려(aging)
+긴 작업도 결국 실행되도록 한다.
+"""
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import Counter
+
+from config import Config
+from logger import get_logger
+
+logger = get_logger('admission')
+
+
+def job_priority(estimated_seconds: float, waited_seconds: float, policy: str = None,
+                 aging: float = None) -> float:
+    """
+    대기 작업의 우선순위 (작을수록 먼저 실행)
+
+    Args:
+        estimated_seconds: 예상 처리 시간 (초)
+        waited_seconds: 대기열에서 기다린 시간 (초)
+        policy: 'sjf' (짧은 작업 우선 + aging) 또는 'fifo' (None이면 Config.SCHEDULER_POLICY)
+        aging: 기다린 1초당 줄어드는 예상 처리 시간 (None이면 Config.SCHEDULER_AGING)
+
+    Returns:
+        우선순위 값
+    """
+    policy = policy or Config.SCHEDULER_POLICY
+    if policy == 'fifo':
+        return -waited_seconds
+    aging = Config.SCHEDULER_AGING if aging is None else aging
+    return estimated_seconds - aging * waited_seconds
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차 요청을 받을 수 없음"""
+
+    def __init__(self, reason: str, retry_after: int):
+        """
+        Args:
+            reason: 'global' (전체 한도) 또는 'client' (클라이언트별 한도)
+            retry_after: 다시 시도할 때까지 기다릴 시간 (초)
+        """
+        super().__init__(f"대기열이 가득 찼습니다 ({reason}). {retry_after}초 후 다시 시도하세요.")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """
+    수락된 작업 하나의 대기열 자리
+
+    사용법:
+        ticket = admission.admit(client)
+        with ticket:        # 실행 슬롯을 얻을 때까지 대기
+            ...             # 다운로드/분리
+    """
+
+    def __init__(self, controller, seq: int, client: str, duration: float):
+        self._controller = controller
+        self.seq = seq
+        self.client = client
+        self.duration = duration
+        self.admitted_at = time.time()
+        self.started_at = None
+        self.ready = False           # 실행 슬롯을 기다리기 시작했는지 (업로드 수신 중이면 False)
+        self.released = False
+
+    @property
+    def estimated_seconds(self) -> float:
+        """예상 처리 시간 (초)"""
+        return self._controller.estimate_seconds(self.duration)
+
+    def update_duration(self, duration: float) -> None:
+        """곡 길이를 알게 되면 예상 처리 시간 갱신"""
+        self.duration = duration
+
+    def __enter__(self):
+        self._controller.wait_for_slot(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+    def release(self, observed_seconds: float = None) -> None:
+        """
+        대기열/실행 슬롯 반환 (여러 번 호출해도 안전)
+
+        Args:
+            observed_seconds: 분리 단계에 실제로 걸린 시간 (초, 분리를 끝까지 했을 때만)
+        """
+        self._controller.release(self, observed_seconds)
+
+
+class AdmissionController:
+    """제한된 대기열과 실행 슬롯 관리 (job_priority 순서로 실행)"""
+
+    def __init__(self, max_running: int = None, max_queued: int = None, max_per_client: int = None):
+        """
+        Args:
+            max_running: 동시에 실행할 최대 작업 수
+            max_queued: 실행을 기다릴 수 있는 최대 작업 수 (전체)
+            max_per_client: 클라이언트 하나가 동시에 가질 수 있는 최대 작업 수 (대기 + 실행)
+        """
+        self.max_running = max_running or Config.MAX_RUNNING_JOBS
+        self.max_queued = Config.MAX_QUEUED_JOBS if max_queued is None else max_queued
+        self.max_per_client = max_per_client or Config.MAX_JOBS_PER_CLIENT
+        self.rtf = Config.ADMISSION_INITIAL_RTF
+
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._waiting = []
+        self._running = []
+        self._admitted_total = 0
+        self._completed_total = 0
+        self._rejected = Counter()
+
+    def estimate_seconds(self, duration: float = None) -> float:
+        """
+        곡 길이로 예상 처리 시간 계산 (길이를 모르면 Config.ADMISSION_DEFAULT_DURATION)
+
+        Args:
+            duration: 곡 길이 (초)
+
+        Returns:
+            예상 처리 시간 (초)
+        """
+        return (duration or Config.ADMISSION_DEFAULT_DURATION) * self.rtf
+
+    def outstanding(self) -> int:
+        """수락된 뒤 아직 끝나지 않은 작업 수 (실행 중 + 대기 중)"""
+        with self._cond:
+            return len(self._running) + len(self._waiting)
+
+    def _finish_times(self, now: float) -> dict:
+        """
+        현재 실행/대기 중인 작업의 예상 완료 시각 (lock 안에서 호출)
+
+        실행 중인 작업은 남은 예상 시간, 대기 작업은 실행 순서대로 먼저 비는 슬롯에 배정해 계산한다.
+
+        Returns:
+            dict: {Ticket: 지금부터 완료까지 예상 시간 (초)}
+        """
+        finish = {}
+        slots = []
+        for ticket in self._running:
+            remaining = max(ticket.estimated_seconds - (now - ticket.started_at), 0)
+            finish[ticket] = remaining
+            slots.append(remaining)
+        slots += [0.0] * (self.max_running - len(slots))
+        heapq.heapify(slots)
+
+        for ticket in self._schedule_order(now):
+            start = heapq.heappop(slots)
+            finish[ticket] = start + ticket.estimated_seconds
+            heapq.heappush(slots, finish[ticket])
+        return finish
+
+    def _retry_after(self, tickets: list, now: float) -> int:
+        """주어진 작업 중 하나가 끝나 자리가 날 때까지의 예상 시간 (초, lock 안에서 호출)"""
+        finish = self._finish_times(now)
+        soonest = min((finish[ticket] for ticket in tickets), default=0)
+        return int(min(max(math.ceil(soonest), 1), Config.MAX_RETRY_AFTER))
+
+    def admit(self, client: str, duration: float = None) -> Ticket:
+        """
+        작업을 대기열에 넣기 (한도를 넘으면 거절)
+
+        Args:
+            client: 클라이언트 식별자 (IP 등)
+            duration: 곡 길이 (초, 모르면 None)
+
+        Returns:
+            Ticket: 대기열 자리
+
+        Raises:
+            QueueFullError: 전체 또는 클라이언트별 한도 초과
+        """
+        with self._cond:
+            now = time.time()
+            owned = [ticket for ticket in self._running + self._waiting if ticket.client == client]
+            if len(owned) >= self.max_per_client:
+                self._rejected['client'] += 1
+                retry_after = self._retry_after(owned, now)
+                logger.warning(f"클라이언트 한도 초과: {client} ({len(owned)}개 진행 중), {retry_after}초 후 재시도")
+                raise QueueFullError('client', retry_after)
+
+            if len(self._running) >= self.max_running and len(self._waiting) >= self.max_queued:
+                self._rejected['global'] += 1
+                retry_after = self._retry_after(self._running + self._waiting, now)
+                logger.warning(f"대기열 가득 참: 대기 {len(self._waiting)}개, {retry_after}초 후 재시도")
+                raise QueueFullError('global', retry_after)
+
+            ticket = Ticket(self, next(self._seq), client, duration)
+            self._waiting.append(ticket)
+            self._admitted_total += 1
+            logger.info(f"작업 수락: {client} (실행 {len(self._running)}개, 대기 {len(self._waiting)}개)")
+            return ticket
+
+    def _schedule_order(self, now: float) -> list:
+        """대기 작업을 실행할 순서로 정렬 (lock 안에서 호출)"""
+        return sorted(self._waiting, key=lambda ticket: (
+            job_priority(ticket.estimated_seconds, now - ticket.admitted_at), ticket.seq
+        ))
+
+    def _next_ticket(self) -> Ticket:
+        """다음에 실행할 대기 작업 (슬롯을 기다리는 작업 중에서, lock 안에서 호출)"""
+        order = [ticket for ticket in self._schedule_order(time.time()) if ticket.ready]
+        return order[0] if order else None
+
+    def wait_for_slot(self, ticket: Ticket) -> None:
+        """실행 슬롯이 비고 이 작업 차례가 될 때까지 대기"""
+        with self._cond:
+            ticket.ready = True
+            self._cond.notify_all()
+            while not (len(self._running) < self.max_running and self._next_ticket() is ticket):
+                self._cond.wait()
+            self._waiting.remove(ticket)
+            ticket.started_at = time.time()
+            self._running.append(ticket)
+            self._cond.notify_all()
+        waited = ticket.started_at - ticket.admitted_at
+        if waited >= 1:
+            logger.info(f"대기 후 실행 시작: {ticket.client} ({waited:.1f}초 대기)")
+
+    def release(self, ticket: Ticket, observed_seconds: float = None) -> None:
+        """
+        대기열/실행 슬롯 반환하고, 분리를 끝낸 작업이면 처리 속도 추정 갱신
+
+        다운로드/변환 시간이 섞이지 않도록 분리 단계의 시간만 반영한다.
+        지문으로 기존 결과를 재사용했거나 실패한 작업(observed_seconds 없음)은 반영하지 않는다.
+
+        Args:
+            ticket: 반환할 대기열 자리
+            observed_seconds: 분리 단계에 실제로 걸린 시간 (초)
+        """
+        with self._cond:
+            if ticket.released:
+                return
+            ticket.released = True
+            if ticket in self._running:
+                self._running.remove(ticket)
+                self._completed_total += 1
+                if observed_seconds is not None and ticket.duration:
+                    observed = observed_seconds / ticket.duration
+                    self.rtf += Config.ADMISSION_RTF_SMOOTHING * (observed - self.rtf)
+            elif ticket in self._waiting:
+                self._waiting.remove(ticket)
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """
+        모니터링용 대기열 상태
+
+        Returns:
+            dict: 실행/대기 작업 수, 한도, 누적 수락/거절 수, 예상 남은 작업량 등
+        """
+        with self._cond:
+            finish = self._finish_times(time.time())
+            return {
+                'running': len(self._running),
+                'queued': len(self._waiting),
+                'max_running': self.max_running,
+                'max_queued': self.max_queued,
+                'max_per_client': self.max_per_client,
+                'admitted_total': self._admitted_total,
+                'completed_total': self._completed_total,
+                'rejected_total': {'global': self._rejected['global'], 'client': self._rejected['client']},
+                'backlog_seconds': round(max(finish.values(), default=0), 1),
+                'rtf': round(self.rtf, 3),
+            }
@@ -9,11 +9,22 @@ from config import Config
 from downloader import YouTubeDownloader
 from separator import AudioSeparator
 from routes import init_routes
+from result_index import ResultIndex
+from jobs import JobStore
+from admission import AdmissionController
+from thread_tuner import tune_threads
+from checkpoint import prune_workspaces
 from logger import setup_logger, get_logger
 
 
-def create_app():
-    """Flask 애플리케이션 생성 및 설정"""
+def create_app(downloader: YouTubeDownloader = None, separator: AudioSeparator = None):
+    """
+    Flask 애플리케이션 생성 및 설정
+
+    Args:
+        downloader: 사용할 다운로더 (None이면 YouTubeDownloader, 부하 테스트는 가짜 다운로더를 넘김)
+        separator: 사용할 음원 분리기 (None이면 Config.DEMUCS_MODEL로 생성)
+    """
 
     # 설정 초기화
     Config.init_directories()
@@ -26,21 +37,39 @@ def create_app():
     logger.info("="*50)
 
     # Flask 앱 생성
-    app = Flask(__name__)
+    app = Flask(__name__, static_folder=None)  # 정적 파일은 /assets (assets.py)
     logger.info("Flask 애플리케이션 생성")
 
+    # 재개되지 않고 오래 남은 작업 디렉토리 정리
+    prune_workspaces(Config.TEMP_DIR)
+
     # 다운로더 초기화
-    downloader = YouTubeDownloader(Config.TEMP_DIR)
+    if downloader is None:
+        downloader = YouTubeDownloader(Config.TEMP_DIR)
+
+    if separator is None:
+        # torch 스레드 수 설정 (모델 로딩 전에 적용해야 함)
+        tune_threads(Config.DEMUCS_MODEL)
+
+        # 음원 분리기 초기화
+        separator = AudioSeparator(
+            model_name=Config.DEMUCS_MODEL,
+            output_dir=Config.OUTPUT_DIR,
+            use_gpu=Config.USE_GPU
+        )
+
+    # 작업/결과 인덱스 초기화
+    index = ResultIndex(Config.RESULT_INDEX)
+    index.prune(force=True)
+
+    # 작업 저장소 초기화
+    jobs = JobStore(Config.JOB_HISTORY_LIMIT, index)
 
-    # 음원 분리기 초기화
-    separator = AudioSeparator(
-        model_name=Config.DEMUCS_MODEL,
-        output_dir=Config.OUTPUT_DIR,
-        use_gpu=Config.USE_GPU
-    )
+    # 작업 수락 제어 (동시 실행/대기열 한도)
+    admission = AdmissionController()
 
     # 라우트 등록
-    init_routes(app, downloader, separator)
+    init_routes(app, downloader, separator, jobs, index, admission)
     logger.info("라우트 등록 완료")
 
     return app
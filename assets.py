@@ -0,0 +1,147 @@
+"""
+프론트엔드 정적 파일 모듈
+
+시작할 때 static/의 CSS/JS/favicon을 한 번 읽어 내용 해시가 들어간 이름(app.3f2a9c1b7d4e.css)을 붙이고,
+gzip과 brotli(brotli 패키지가 있을 때)로 미리 압축해 메모리에 보관한다.
+메인 페이지 HTML도 해시 이름을 넣어 한 번만 만든다 (요청마다 템플릿을 렌더링하지 않음).
+
+해시 이름의 파일은 내용이 바뀌면 이름도 바뀌므로 1년 동안 캐시하게 하고 (immutable),
+메인 페이지와 /favicon.ico는 ETag로 변경 여부만 확인하게 한다.
+요청의 Accept-Encoding에 따라 br → gzip → 원본 순서로 고른다.
+"""
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+
+from flask import Response, request
+
+from config import Config
+from templates import HTML_TEMPLATE
+from logger import get_logger
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = get_logger('assets')
+
+# 응답 형식 우선순위 (앞에 있을수록 먼저 고름)
+ENCODINGS = ('br', 'gzip')
+
+
+class Asset:
+    """파일 하나의 원본과 미리 압축한 버전"""
+
+    def __init__(self, content: bytes, mimetype: str):
+        """
+        Args:
+            content: 원본 내용
+            mimetype: Content-Type
+        """
+        self.mimetype = mimetype
+        self.digest = hashlib.sha256(content).hexdigest()
+        self.variants = {'identity': content}
+        if len(content) >= Config.ASSET_COMPRESS_MIN_BYTES:
+            compressed = {'gzip': gzip.compress(content, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                compressed['br'] = brotli.compress(content, quality=11)
+            # 압축해도 작아지지 않으면 보관하지 않음
+            self.variants.update({encoding: data for encoding, data in compressed.items()
+                                  if len(data) < len(content)})
+
+    def hashed_name(self, name: str) -> str:
+        """내용 해시를 넣은 파일명 (app.css → app.3f2a9c1b7d4e.css)"""
+        path = Path(name)
+        return f"{path.stem}.{self.digest[:Config.ASSET_HASH_LENGTH]}{path.suffix}"
+
+    def choose_encoding(self) -> str:
+        """요청의 Accept-Encoding으로 보낼 형식 선택"""
+        for encoding in ENCODINGS:
+            if encoding in self.variants and request.accept_encodings[encoding] > 0:
+                return encoding
+        return 'identity'
+
+    def response(self, max_age: int, immutable: bool = False) -> Response:
+        """
+        압축 형식을 고르고 ETag로 조건부 응답
+
+        Args:
+            max_age: Cache-Control max-age (초)
+            immutable: True면 immutable 추가 (해시 이름의 파일)
+
+        Returns:
+            Response (304 또는 200)
+        """
+        encoding = self.choose_encoding()
+        etag = f"{self.digest[:Config.ASSET_HASH_LENGTH]}-{encoding}"
+        headers = {
+            'Cache-Control': f"public, max-age={max_age}" + (', immutable' if immutable else ''),
+            'Vary': 'Accept-Encoding',
+            'ETag': f'"{etag}"',
+        }
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers=headers)
+
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return Response(self.variants[encoding], content_type=self.mimetype, headers=headers)
+
+
+class AssetBundle:
+    """static/ 파일과 메인 페이지를 시작 시 한 번 준비"""
+
+    def __init__(self, static_dir: Path = None):
+        """
+        Args:
+            static_dir: 정적 파일 디렉토리 (None이면 Config.STATIC_DIR)
+        """
+        static_dir = Path(static_dir or Config.STATIC_DIR)
+        self.assets = {}      # {해시 이름: Asset}
+        self.urls = {}        # {원래 이름: /assets/해시 이름}
+        self.files = {}       # {원래 이름: Asset}
+
+        for path in sorted(static_dir.iterdir()):
+            if not path.is_file():
+                continue
+            mimetype = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+            if mimetype.startswith('text/') or mimetype == 'application/javascript':
+                mimetype += '; charset=utf-8'
+            asset = Asset(path.read_bytes(), mimetype)
+            hashed = asset.hashed_name(path.name)
+            self.assets[hashed] = asset
+            self.files[path.name] = asset
+            self.urls[path.name] = f"/assets/{hashed}"
+
+        page = (HTML_TEMPLATE
+                .replace('__CSS_URL__', self.urls['app.css'])
+                .replace('__JS_URL__', self.urls['app.js'])
+                .replace('__FAVICON_URL__', self.urls['favicon.ico']))
+        self.page = Asset(page.encode('utf-8'), 'text/html; charset=utf-8')
+
+        sizes = ', '.join(
+            f"{name} {len(asset.variants['identity']) / 1024:.1f}KB"
+            + ''.join(f"/{encoding} {len(asset.variants[encoding]) / 1024:.1f}KB"
+                      for encoding in ENCODINGS if encoding in asset.variants)
+            for name, asset in [('index.html', self.page), *self.files.items()]
+        )
+        logger.info(f"정적 파일 준비: {sizes}" + ('' if brotli is not None else ' (brotli 없음, gzip만 사용)'))
+
+    def page_response(self) -> Response:
+        """메인 페이지 (매번 ETag로 확인, 배포 후 바뀐 해시 이름을 바로 받도록)"""
+        return self.page.response(max_age=0)
+
+    def asset_response(self, hashed_name: str) -> Response:
+        """해시 이름의 정적 파일 (없으면 None)"""
+        asset = self.assets.get(hashed_name)
+        if asset is None:
+            return None
+        return asset.response(max_age=Config.ASSET_MAX_AGE, immutable=True)
+
+    def file_response(self, name: str) -> Response:
+        """고정 이름으로 요청되는 파일 (예: /favicon.ico, 없으면 None)"""
+        asset = self.files.get(name)
+        if asset is None:
+            return None
+        return asset.response(max_age=Config.FAVICON_MAX_AGE)
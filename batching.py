@@ -0,0 +1,165 @@
+"""
+작업 간 배치 추론 모듈
+
+apply_model은 작업마다 고정 길이 segment를 하나씩 (batch=1) 모델에 넣는다.
+동시에 실행 중인 여러 작업의 segment를 모아 한 번의 forward로 실행하고 결과를 나눠 돌려준다.
+각 작업은 자기 segment의 결과를 받을 때까지 기다리므로 작업 안의 순서는 그대로 유지된다.
+
+별도 스레드 없이, 가장 먼저 기다린 요청의 스레드가 배치를 실행한다 (leader).
+배치는 다음 중 하나를 만족하면 실행한다:
+    - 같은 모델/입력 형태의 요청이 max_batch개 모임
+    - 분리 중인 작업이 모두 요청을 넣고 기다리는 중 (더 기다려도 올 요청이 없음)
+    - 가장 오래 기다린 요청이 max_wait만큼 기다림
+"""
+import threading
+import time
+
+import torch
+
+from config import Config
+from logger import get_logger
+
+logger = get_logger('batching')
+
+
+class _Request:
+    """모델 forward 요청 하나"""
+
+    def __init__(self, key: tuple, forward, mix: torch.Tensor):
+        self.key = key
+        self.forward = forward
+        self.mix = mix
+        self.created_at = time.perf_counter()
+        self.output = None
+        self.error = None
+        self.taken = False   # 다른 스레드의 배치에 포함됨
+        self.done = False
+
+
+class InferenceBatcher:
+    """동시에 들어온 같은 형태의 forward 요청을 batch 차원으로 묶어 실행"""
+
+    def __init__(self, max_batch: int = None, max_wait: float = None, concurrency=None):
+        """
+        Args:
+            max_batch: 한 번에 묶을 최대 요청 수 (None이면 Config.INFERENCE_BATCH_MAX)
+            max_wait: 배치를 채우기 위해 기다릴 최대 시간 (초, None이면 Config.INFERENCE_BATCH_WAIT)
+            concurrency: 현재 요청을 넣을 수 있는 작업 수를 반환하는 함수 (None이면 항상 max_batch)
+        """
+        self.max_batch = max_batch or Config.INFERENCE_BATCH_MAX
+        self.max_wait = Config.INFERENCE_BATCH_WAIT if max_wait is None else max_wait
+        self._concurrency = concurrency or (lambda: self.max_batch)
+        self._cond = threading.Condition()
+        self._queue = []
+        self._batches = 0
+        self._items = 0
+        self._sizes = {}
+
+    def wrap(self, module: torch.nn.Module) -> None:
+        """
+        모듈의 forward를 배치 실행으로 교체 (인스턴스 속성으로 덮어쓰므로 isinstance 검사는 그대로)
+
+        Args:
+            module: batch 차원이 있는 입력을 받는 모델 (예: HTDemucs)
+        """
+        forward = module.forward
+
+        def batched_forward(mix):
+            return self.submit(forward, mix)
+
+        module.forward = batched_forward
+
+    def submit(self, forward, mix: torch.Tensor) -> torch.Tensor:
+        """
+        forward 요청을 넣고 결과를 기다림 (차례가 되면 이 스레드가 배치를 실행)
+
+        Args:
+            forward: 원래 모델 forward
+            mix: 입력 텐서 (batch, ...)
+
+        Returns:
+            forward(mix) 결과
+        """
+        request = _Request((id(forward), tuple(mix.shape[1:]), mix.dtype, mix.device), forward, mix)
+        with self._cond:
+            self._queue.append(request)
+            self._cond.notify_all()
+            batch = None
+            while True:
+                if request.taken:
+                    self._cond.wait_for(lambda: request.done)
+                    break
+                batch, wait = self._take_batch(request)
+                if batch:
+                    break
+                self._cond.wait(timeout=wait)
+
+        if batch:
+            self._run(batch)
+        if request.error is not None:
+            raise request.error
+        return request.output
+
+    def _take_batch(self, request: _Request) -> tuple:
+        """
+        request가 자기 그룹의 가장 오래된 요청이고 실행 조건을 만족하면 배치를 꺼냄 (lock 안에서 호출)
+
+        Returns:
+            tuple: (배치 요청 목록 또는 None, 다시 확인할 때까지 기다릴 시간)
+        """
+        group = [other for other in self._queue if other.key == request.key]
+        if group[0] is not request:
+            return None, None
+
+        waited = time.perf_counter() - request.created_at
+        full = len(group) >= self.max_batch
+        everyone = len(group) >= max(self._concurrency(), 1)
+        if not (full or everyone or waited >= self.max_wait):
+            return None, self.max_wait - waited
+
+        batch = group[:self.max_batch]
+        for item in batch:
+            item.taken = True
+            self._queue.remove(item)
+        return batch, None
+
+    def _run(self, batch: list) -> None:
+        """배치 하나 실행 후 결과를 요청별로 나눠 전달"""
+        try:
+            if len(batch) == 1:
+                outputs = [batch[0].forward(batch[0].mix)]
+            else:
+                sizes = [item.mix.shape[0] for item in batch]
+                output = batch[0].forward(torch.cat([item.mix for item in batch]))
+                outputs = torch.split(output, sizes)
+            for item, output in zip(batch, outputs):
+                item.output = output
+        except BaseException as e:
+            for item in batch:
+                item.error = e
+        finally:
+            with self._cond:
+                for item in batch:
+                    item.done = True
+                self._batches += 1
+                self._items += len(batch)
+                self._sizes[len(batch)] = self._sizes.get(len(batch), 0) + 1
+                self._cond.notify_all()
+        if len(batch) > 1:
+            logger.debug(f"배치 추론: {len(batch)}개")
+
+    def stats(self) -> dict:
+        """
+        모니터링용 배치 통계
+
+        Returns:
+            dict: {'max_batch', 'max_wait', 'batches', 'items', 'sizes': {배치 크기: 횟수}}
+        """
+        with self._cond:
+            return {
+                'max_batch': self.max_batch,
+                'max_wait': self.max_wait,
+                'batches': self._batches,
+                'items': self._items,
+                'sizes': dict(sorted(self._sizes.items())),
+            }
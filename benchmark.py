@@ -0,0 +1,525 @@
+"""
+성능 벤치마크 스크립트
+
+사용법:
+    python benchmark.py presets [--duration 60] [--input song.wav] [--output presets.md]
+    python benchmark.py precision [--duration 60] [--preset fast] [--output precision.md]
+    python benchmark.py batch [--duration 30] [--jobs 4] [--max-batch 1,4] [--output batch.md]
+    python benchmark.py live [--duration 60] [--window 6,4] [--overlap 1] [--output live.md]
+    python benchmark.py stream [--duration 180] [--bandwidth 1,5,20] [--output stream.md]
+    python benchmark.py schedule [--jobs 500] [--load 0.8] [--trace trace.json] [--output schedule.md]
+"""
+import argparse
+import heapq
+import json
+import math
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from scipy.io import wavfile
+
+from admission import job_priority
+from config import Config
+from memprofile import profiler
+from separator import AudioSeparator
+from streaming import SegmentStreamer
+from realtime import SlidingWindowSeparator
+from utils import load_audio_with_pydub, save_audio_wav
+from logger import setup_logger, get_logger
+
+logger = get_logger('benchmark')
+
+
+def synthetic_audio(duration: float, sr: int = 44100, seed: int = 0) -> torch.Tensor:
+    """
+    벤치마크용 합성 스테레오 오디오 생성 (화음 + 베이스 + 타악기성 노이즈)
+
+    Args:
+        duration: 길이 (초)
+        sr: 샘플레이트
+        seed: 난수 시드
+
+    Returns:
+        오디오 텐서 (2, samples)
+    """
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sr), dtype=np.float32) / sr
+
+    chord = sum(np.sin(2 * math.pi * f * t) for f in (261.63, 329.63, 392.0)) / 3
+    bass = np.sin(2 * math.pi * 65.41 * t)
+
+    # 0.5초마다 감쇠하는 노이즈 버스트
+    envelope = np.exp(-20 * (t % 0.5))
+    hits = rng.standard_normal(t.shape).astype(np.float32) * envelope
+
+    mono = 0.3 * chord + 0.3 * bass + 0.2 * hits
+    stereo = np.stack([mono, np.roll(mono, 200)]).astype(np.float32)
+    return torch.from_numpy(stereo)
+
+
+def load_benchmark_input(args) -> tuple:
+    """
+    벤치마크 입력 오디오 준비 (--input이 없으면 합성 오디오)
+
+    Returns:
+        tuple: (오디오 텐서, 샘플레이트)
+    """
+    if args.input:
+        return load_audio_with_pydub(args.input)
+    return synthetic_audio(args.duration), 44100
+
+
+def read_wav(path: str) -> np.ndarray:
+    """int16 WAV 파일을 float32 배열로 읽기"""
+    _, data = wavfile.read(path)
+    return data.astype(np.float32) / 32767
+
+
+def sdr(reference: np.ndarray, estimate: np.ndarray) -> float:
+    """
+    기준 신호 대비 SDR (dB)
+
+    Args:
+        reference: 기준 신호
+        estimate: 비교할 신호
+
+    Returns:
+        SDR (dB)
+    """
+    n = min(len(reference), len(estimate))
+    reference, estimate = reference[:n], estimate[:n]
+    noise = np.sum((reference - estimate) ** 2)
+    signal = np.sum(reference ** 2)
+    return float(10 * np.log10((signal + 1e-9) / (noise + 1e-9)))
+
+
+def format_table(headers: list, rows: list) -> str:
+    """Markdown 표 문자열 생성"""
+    lines = ['| ' + ' | '.join(headers) + ' |',
+             '|' + '|'.join('---' for _ in headers) + '|']
+    for row in rows:
+        lines.append('| ' + ' | '.join(str(cell) for cell in row) + ' |')
+    return '\n'.join(lines)
+
+
+def write_report(table: str, output: str) -> None:
+    """표를 출력하고 --output이 있으면 파일로 저장"""
+    print(table)
+    if output:
+        Path(output).write_text(table + '\n', encoding='utf-8')
+        logger.info(f"벤치마크 결과 저장: {output}")
+
+
+def bench_presets(args) -> None:
+    """프리셋별 처리 시간과 quality 프리셋 대비 SDR 측정"""
+    wav, sr = load_benchmark_input(args)
+    duration = wav.shape[-1] / sr
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        separator = AudioSeparator(
+            model_name=args.model,
+            output_dir=output_dir,
+            use_gpu=Config.USE_GPU
+        )
+
+        results = {}
+        for preset in Config.SEPARATION_PRESETS:
+            logger.info(f"프리셋 벤치마크: {preset}")
+            start = time.perf_counter()
+            result = separator.separate(wav.clone(), sr, f"bench_{preset}", preset=preset)
+            elapsed = time.perf_counter() - start
+            stems = {name: read_wav(path) for name, path in result['stems'].items()}
+            results[preset] = (result['params'], elapsed, stems)
+
+    reference = results.get('quality')
+    rows = []
+    for preset, (params, elapsed, stems) in results.items():
+        if reference is None:
+            quality_sdr = '-'
+        elif preset == 'quality':
+            quality_sdr = '기준'
+        else:
+            scores = [sdr(reference[2][name], stems[name]) for name in stems]
+            quality_sdr = f"{np.mean(scores):.1f}"
+        rows.append([
+            preset, params['shifts'], params['overlap'], params['segment'] or '기본',
+            f"{elapsed:.1f}", f"{elapsed / duration:.2f}", quality_sdr
+        ])
+
+    headers = ['프리셋', 'shifts', 'overlap', 'segment', '처리 시간(초)',
+               '실시간 배율(RTF)', 'quality 대비 SDR(dB)']
+    write_report(format_table(headers, rows), args.output)
+
+
+def bench_precision(args) -> None:
+    """float32와 bfloat16 autocast의 처리 시간, 최대 메모리, float32 대비 SDR 측정"""
+    wav, sr = load_benchmark_input(args)
+    duration = wav.shape[-1] / sr
+
+    results = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for precision in ['float32', 'bfloat16']:
+            separator = AudioSeparator(
+                model_name=args.model,
+                output_dir=output_dir,
+                use_gpu=False,
+                precision=precision
+            )
+            best = None
+            for repeat in range(args.repeat):
+                logger.info(f"정밀도 벤치마크: {precision} ({repeat + 1}/{args.repeat})")
+                with profiler.stage(f'bench_{precision}') as memory:
+                    start = time.perf_counter()
+                    result = separator.separate(wav.clone(), sr, f"bench_{precision}", preset=args.preset)
+                    elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            stems = {name: read_wav(path) for name, path in result['stems'].items()}
+            rss_growth = memory['rss_peak_mb'] - memory['rss_start_mb']
+            results[precision] = (result['precision'], best, rss_growth, stems)
+            del separator
+
+    reference = results['float32'][3]
+    rows = []
+    for precision, (used, elapsed, rss_growth, stems) in results.items():
+        if precision == 'float32':
+            quality_sdr = '기준'
+        else:
+            quality_sdr = ', '.join(f"{name} {sdr(reference[name], stems[name]):.1f}" for name in stems)
+        rows.append([
+            precision, used, f"{elapsed:.1f}", f"{elapsed / duration:.2f}",
+            f"{rss_growth:.0f}", quality_sdr
+        ])
+
+    headers = ['요청 정밀도', '실제 정밀도', '처리 시간(초)', '실시간 배율(RTF)',
+               '최대 RSS 증가(MB)', 'float32 대비 SDR(dB)']
+    write_report(format_table(headers, rows), args.output)
+
+
+def bench_batch(args) -> None:
+    """
+    작업 간 배치 추론의 최대 배치 크기별 처리량, 작업당 지연 시간 측정
+
+    --jobs개 작업을 동시에 시작해 stem 분리(파일 저장 제외)까지의 시간을 잰다.
+    처리량은 전체 곡 길이 / 전체 처리 시간, 지연 시간은 작업별 시작~종료 시간이다.
+    """
+    sr = 44100
+    inputs = [synthetic_audio(args.duration, sr, seed=seed) for seed in range(args.jobs)]
+    total_audio = args.duration * args.jobs
+
+    rows = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for max_batch in [int(value) for value in args.max_batch.split(',')]:
+            separator = AudioSeparator(
+                model_name=args.model,
+                output_dir=output_dir,
+                use_gpu=Config.USE_GPU,
+                max_batch=max_batch
+            )
+            separator.batcher.max_wait = args.wait / 1000
+            logger.info(f"배치 추론 벤치마크: 최대 {max_batch}개, 동시 작업 {args.jobs}개")
+
+            latencies = [None] * args.jobs
+            ready = threading.Barrier(args.jobs)
+
+            def run(index):
+                ready.wait()
+                job_start = time.perf_counter()
+                separator.separate_stems(inputs[index].clone(), sr, preset=args.preset)
+                latencies[index] = time.perf_counter() - job_start
+
+            threads = [threading.Thread(target=run, args=(index,)) for index in range(args.jobs)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+
+            stats = separator.batcher.stats()
+            p50, p95 = np.percentile(latencies, [50, 95])
+            rows.append([
+                max_batch, args.jobs, f"{stats['items'] / stats['batches']:.2f}" if stats['batches'] else '-',
+                f"{elapsed:.1f}", f"{total_audio / elapsed:.2f}", f"{p50:.1f}", f"{p95:.1f}"
+            ])
+            del separator
+
+    headers = ['최대 배치', '동시 작업', '평균 배치 크기', '전체 처리(초)',
+               '처리량(곡 초/초)', '지연 p50(초)', '지연 p95(초)']
+    write_report(format_table(headers, rows), args.output)
+
+
+def bench_live(args) -> None:
+    """
+    실시간 분리(/live)의 창 길이별 처리 시간, RTF, 지연 시간 측정
+
+    입력을 --chunk초 조각으로 나눠 넣고, 창 하나의 평균 처리 시간을 hop(창 - 겹침) 길이로 나눈 값을 RTF로,
+    창 길이 + 창 처리 시간을 첫 출력까지의 지연 시간으로 본다. RTF가 1 이상이면 실시간을 따라가지 못한다.
+    """
+    wav, sr = load_benchmark_input(args)
+    with tempfile.TemporaryDirectory() as output_dir:
+        separator = AudioSeparator(
+            model_name=args.model,
+            output_dir=output_dir,
+            use_gpu=Config.USE_GPU
+        )
+        if sr != separator.model.samplerate:
+            raise ValueError(f"입력 샘플레이트는 {separator.model.samplerate} Hz여야 합니다: {sr}")
+        pcm = wav.T.numpy()
+        chunk = int(args.chunk * sr)
+
+        rows = []
+        for window in [float(value) for value in args.window.split(',')]:
+            logger.info(f"실시간 분리 벤치마크: 창 {window}초, 겹침 {args.overlap}초")
+            stream = SlidingWindowSeparator(separator, args.stem, window, args.overlap)
+            first_output = None
+            start = time.perf_counter()
+            for offset in range(0, len(pcm), chunk):
+                out = stream.push(pcm[offset:offset + chunk])
+                if first_output is None and len(out):
+                    # 첫 출력까지 받은 입력 길이 + 그 시점까지의 처리 시간
+                    first_output = (offset + chunk) / sr + stream.model_seconds
+            stream.flush()
+            elapsed = time.perf_counter() - start
+            stats = stream.stats()
+            rows.append([
+                stats['window_seconds'], stats['overlap_seconds'], stats['windows'],
+                f"{stats['window_compute_seconds']:.2f}", f"{stats['rtf']:.2f}",
+                f"{stats['latency_seconds']:.2f}",
+                f"{first_output:.2f}" if first_output is not None else '-',
+                f"{elapsed / (len(pcm) / sr):.2f}"
+            ])
+
+    headers = ['창(초)', '겹침(초)', '창 수', '창당 처리(초)', 'RTF', '지연 시간(초)',
+               '첫 출력까지(초)', '전체 처리/길이']
+    write_report(format_table(headers, rows), args.output)
+
+
+def bench_stream(args) -> None:
+    """
+    WAV 직접 재생과 HLS(AAC) 스트리밍의 전송량, 첫 재생까지 시간(TTFA) 비교
+
+    전송 시간은 지정한 회선 속도와 RTT로 계산하고, 세그먼트 변환 시간은 실제로 측정한다.
+    WAV는 --buffer초 분량을 받으면 재생을 시작하고, HLS는 플레이리스트와 첫 세그먼트를 받아야 시작한다고 본다.
+    """
+    wav, sr = load_benchmark_input(args)
+    duration = wav.shape[-1] / sr
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        stem_path = Path(work_dir) / "bench_vocals.wav"
+        save_audio_wav(wav, sr, stem_path)
+        wav_bytes = stem_path.stat().st_size
+        wav_first_bytes = 44 + int(args.buffer * sr) * wav.shape[0] * 2
+
+        streamer = SegmentStreamer(Path(work_dir) / "streams")
+        paths, gains = {'vocals': stem_path}, {'vocals': 1.0}
+
+        # 첫 세그먼트: 캐시 없음 (변환 포함) → 캐시 있음
+        start = time.perf_counter()
+        playlist = streamer.playlist(paths, gains)
+        first_segment = streamer.segment('bench', paths, gains, 0)
+        cold_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        streamer.playlist(paths, gains)
+        streamer.segment('bench', paths, gains, 0)
+        warm_seconds = time.perf_counter() - start
+
+        hls_first_bytes = len(playlist.encode('utf-8')) + first_segment.stat().st_size
+
+        # 나머지 세그먼트까지 모두 변환해 전체 전송량 측정
+        count = playlist.count('.ts')
+        start = time.perf_counter()
+        hls_bytes = sum(streamer.segment('bench', paths, gains, i).stat().st_size for i in range(count))
+        encode_seconds = time.perf_counter() - start
+
+    size_rows = [
+        ['WAV (16-bit PCM)', f"{wav_bytes / 1024 / 1024:.1f}", f"{wav_bytes / duration * 60 / 1024 / 1024:.1f}", '-'],
+        [f"HLS AAC {streamer.bitrate} ({streamer.segment_seconds:g}초 세그먼트)",
+         f"{hls_bytes / 1024 / 1024:.1f}", f"{hls_bytes / duration * 60 / 1024 / 1024:.1f}",
+         f"{encode_seconds / count * 1000:.0f}"],
+    ]
+    size_table = format_table(['형식', '전체 전송량(MB)', '분당 전송량(MB)', '세그먼트당 변환(ms)'], size_rows)
+
+    rtt = args.rtt / 1000
+    ttfa_rows = []
+    for mbps in (float(value) for value in args.bandwidth.split(',')):
+        bytes_per_second = mbps * 1000 * 1000 / 8
+        wav_ttfa = rtt + wav_first_bytes / bytes_per_second
+        cold_ttfa = 2 * rtt + cold_seconds + hls_first_bytes / bytes_per_second
+        warm_ttfa = 2 * rtt + warm_seconds + hls_first_bytes / bytes_per_second
+        ttfa_rows.append([f"{mbps:g}", f"{wav_ttfa:.2f}", f"{cold_ttfa:.2f}", f"{warm_ttfa:.2f}"])
+    ttfa_table = format_table(['회선(Mbps)', 'WAV TTFA(초)', 'HLS 첫 변환 TTFA(초)', 'HLS 캐시 TTFA(초)'], ttfa_rows)
+
+    write_report(f"{size_table}\n\n{ttfa_table}", args.output)
+
+
+def make_trace(args) -> list:
+    """
+    짧은 곡과 긴 곡(공연 등)이 섞인 작업 도착 기록 생성
+
+    도착 간격은 지수 분포이며, 평균 부하가 --load가 되도록 도착률을 정한다.
+
+    Returns:
+        list: [{'arrival': 도착 시각(초), 'duration': 곡 길이(초), 'kind': 'short'/'long'}, ...]
+    """
+    rng = np.random.default_rng(args.seed)
+    kinds = np.where(rng.random(args.jobs) < args.long_ratio, 'long', 'short')
+    durations = np.where(
+        kinds == 'long',
+        rng.uniform(args.long_min, args.long_max, args.jobs),
+        rng.uniform(args.short_min, args.short_max, args.jobs),
+    )
+    mean_service = durations.mean() * args.rtf
+    arrival_rate = args.load * args.workers / mean_service
+    arrivals = np.cumsum(rng.exponential(1 / arrival_rate, args.jobs))
+    return [
+        {'arrival': round(float(arrival), 3), 'duration': round(float(duration), 1), 'kind': str(kind)}
+        for arrival, duration, kind in zip(arrivals, durations, kinds)
+    ]
+
+
+def simulate_schedule(trace: list, policy: str, workers: int, rtf: float, aging: float, noise: float,
+                      seed: int) -> list:
+    """
+    작업 도착 기록을 스케줄러 우선순위(job_priority)로 재생하는 이산 사건 시뮬레이션
+
+    예상 처리 시간은 곡 길이 × rtf, 실제 처리 시간은 여기에 로그 정규 오차(noise)를 곱한 값이다.
+
+    Returns:
+        list: 작업별 (종류, 도착부터 완료까지 시간)
+    """
+    rng = np.random.default_rng(seed)
+    jobs = sorted(trace, key=lambda job: job['arrival'])
+    estimated = [job['duration'] * rtf for job in jobs]
+    actual = [est * float(rng.lognormal(0, noise)) if noise else est for est in estimated]
+
+    latencies = []
+    waiting = []
+    running = []
+    next_arrival = 0
+    now = 0.0
+    while next_arrival < len(jobs) or waiting or running:
+        arrival_time = jobs[next_arrival]['arrival'] if next_arrival < len(jobs) else math.inf
+        finish_time = running[0][0] if running else math.inf
+        if finish_time <= arrival_time:
+            now, index = heapq.heappop(running)
+            latencies.append((jobs[index]['kind'], now - jobs[index]['arrival']))
+        else:
+            now = arrival_time
+            waiting.append(next_arrival)
+            next_arrival += 1
+
+        while waiting and len(running) < workers:
+            index = min(waiting, key=lambda i: (
+                job_priority(estimated[i], now - jobs[i]['arrival'], policy, aging), i
+            ))
+            waiting.remove(index)
+            heapq.heappush(running, (now + actual[index], index))
+    return latencies
+
+
+def bench_schedule(args) -> None:
+    """FIFO와 SJF(aging) 스케줄링의 종류별 지연 시간 백분위 비교"""
+    if args.trace and Path(args.trace).exists():
+        trace = json.loads(Path(args.trace).read_text(encoding='utf-8'))
+        logger.info(f"작업 기록 재생: {args.trace} ({len(trace)}개)")
+    else:
+        trace = make_trace(args)
+        if args.trace:
+            Path(args.trace).write_text(json.dumps(trace), encoding='utf-8')
+            logger.info(f"작업 기록 저장: {args.trace}")
+
+    rows = []
+    for policy in ('fifo', 'sjf'):
+        latencies = simulate_schedule(trace, policy, args.workers, args.rtf, args.aging, args.noise, args.seed)
+        for kind in ('short', 'long', 'all'):
+            values = np.array([latency for job_kind, latency in latencies if kind in ('all', job_kind)])
+            if len(values) == 0:
+                continue
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            rows.append([policy, kind, len(values), f"{p50:.0f}", f"{p95:.0f}", f"{p99:.0f}", f"{values.max():.0f}"])
+
+    headers = ['정책', '작업 종류', '작업 수', 'p50(초)', 'p95(초)', 'p99(초)', '최대(초)']
+    write_report(format_table(headers, rows), args.output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='음원 분리 성능 벤치마크')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    presets = subparsers.add_parser('presets', help='프리셋별 속도/품질 비교표 생성')
+    presets.add_argument('--input', help='입력 WAV 파일 (없으면 합성 오디오 사용)')
+    presets.add_argument('--duration', type=float, default=60, help='합성 오디오 길이 (초)')
+    presets.add_argument('--model', default=Config.DEMUCS_MODEL, help='Demucs 모델 이름')
+    presets.add_argument('--output', help='결과 표를 저장할 Markdown 파일')
+    presets.set_defaults(func=bench_presets)
+
+    precision = subparsers.add_parser('precision', help='float32와 bfloat16 autocast의 속도/메모리/품질 비교 (CPU)')
+    precision.add_argument('--input', help='입력 WAV 파일 (없으면 합성 오디오 사용)')
+    precision.add_argument('--duration', type=float, default=60, help='합성 오디오 길이 (초)')
+    precision.add_argument('--model', default=Config.DEMUCS_MODEL, help='Demucs 모델 이름')
+    precision.add_argument('--preset', default='fast', help='분리 프리셋')
+    precision.add_argument('--repeat', type=int, default=1, help='반복 횟수 (가장 빠른 시간 사용)')
+    precision.add_argument('--output', help='결과 표를 저장할 Markdown 파일')
+    precision.set_defaults(func=bench_precision)
+
+    batch = subparsers.add_parser('batch', help='작업 간 배치 추론의 배치 크기별 처리량/지연 시간 비교')
+    batch.add_argument('--duration', type=float, default=30, help='작업 하나의 합성 오디오 길이 (초)')
+    batch.add_argument('--jobs', type=int, default=4, help='동시에 실행할 작업 수')
+    batch.add_argument('--max-batch', default=f'1,{max(Config.INFERENCE_BATCH_MAX, 4)}',
+                       help='비교할 최대 배치 크기 목록 (쉼표 구분, 1 = 배치 없음)')
+    batch.add_argument('--wait', type=float, default=Config.INFERENCE_BATCH_WAIT * 1000, help='배치 대기 시간 (ms)')
+    batch.add_argument('--model', default=Config.DEMUCS_MODEL, help='Demucs 모델 이름')
+    batch.add_argument('--preset', default='fast', help='분리 프리셋')
+    batch.add_argument('--output', help='결과 표를 저장할 Markdown 파일')
+    batch.set_defaults(func=bench_batch)
+
+    live = subparsers.add_parser('live', help='실시간 분리의 창 길이별 RTF/지연 시간 측정')
+    live.add_argument('--input', help='입력 WAV 파일 (없으면 합성 오디오 사용, 모델 샘플레이트여야 함)')
+    live.add_argument('--duration', type=float, default=60, help='합성 오디오 길이 (초)')
+    live.add_argument('--model', default=Config.DEMUCS_MODEL, help='Demucs 모델 이름')
+    live.add_argument('--stem', default='accompaniment', help='돌려받을 stem')
+    live.add_argument('--window', default=f'{Config.LIVE_WINDOW_SECONDS}', help='비교할 창 길이 목록 (초, 쉼표 구분)')
+    live.add_argument('--overlap', type=float, default=Config.LIVE_OVERLAP_SECONDS, help='겹침 길이 (초)')
+    live.add_argument('--chunk', type=float, default=0.5, help='한 번에 보내는 PCM 길이 (초)')
+    live.add_argument('--output', help='결과 표를 저장할 Markdown 파일')
+    live.set_defaults(func=bench_live)
+
+    stream = subparsers.add_parser('stream', help='WAV와 HLS 스트리밍의 전송량/첫 재생 시간 비교')
+    stream.add_argument('--input', help='입력 WAV 파일 (없으면 합성 오디오 사용)')
+    stream.add_argument('--duration', type=float, default=180, help='합성 오디오 길이 (초)')
+    stream.add_argument('--bandwidth', default='1,5,20', help='비교할 회선 속도 목록 (Mbps, 쉼표 구분)')
+    stream.add_argument('--rtt', type=float, default=100, help='요청당 왕복 지연 (ms)')
+    stream.add_argument('--buffer', type=float, default=2.0, help='WAV 재생 시작에 필요한 버퍼 (초)')
+    stream.add_argument('--output', help='결과 표를 저장할 Markdown 파일')
+    stream.set_defaults(func=bench_stream)
+
+    schedule = subparsers.add_parser('schedule', help='FIFO와 SJF 스케줄링의 지연 시간 백분위 비교 (시뮬레이션)')
+    schedule.add_argument('--trace', help='작업 도착 기록 JSON (있으면 재생, 없으면 생성해 저장)')
+    schedule.add_argument('--jobs', type=int, default=500, help='생성할 작업 수')
+    schedule.add_argument('--load', type=float, default=0.8, help='평균 부하 (1.0 = 처리 능력과 같은 도착률)')
+    schedule.add_argument('--long-ratio', type=float, default=0.05, help='긴 곡 비율')
+    schedule.add_argument('--short-min', type=float, default=150, help='짧은 곡 최소 길이 (초)')
+    schedule.add_argument('--short-max', type=float, default=360, help='짧은 곡 최대 길이 (초)')
+    schedule.add_argument('--long-min', type=float, default=3600, help='긴 곡 최소 길이 (초)')
+    schedule.add_argument('--long-max', type=float, default=5400, help='긴 곡 최대 길이 (초)')
+    schedule.add_argument('--workers', type=int, default=Config.MAX_RUNNING_JOBS, help='동시 실행 작업 수')
+    schedule.add_argument('--rtf', type=float, default=Config.ADMISSION_INITIAL_RTF, help='곡 길이 1초당 처리 시간')
+    schedule.add_argument('--aging', type=float, default=Config.SCHEDULER_AGING, help='SJF aging 계수')
+    schedule.add_argument('--noise', type=float, default=0.2, help='실제 처리 시간의 예상 대비 오차 (로그 표준편차)')
+    schedule.add_argument('--seed', type=int, default=0, help='난수 시드')
+    schedule.add_argument('--output', help='결과 표를 저장할 Markdown 파일')
+    schedule.set_defaults(func=bench_schedule)
+
+    args = parser.parse_args()
+    Config.init_directories()
+    setup_logger('youtube-separator', Config.LOG_DIR)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
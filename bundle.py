@@ -0,0 +1,433 @@
+"""
+stem 묶음 다운로드 모듈
+
+선택한 stem들을 ZIP(무압축) 또는 stem마다 채널을 나눠 담은 다채널 WAV 하나로 묶어
+요청이 올 때 바로 만들어 보낸다. 묶음 파일을 디스크에 만들지 않고 한 번에
+Config.BUNDLE_CHUNK_BYTES 정도만 읽으므로, 곡 길이와 stem 수에 관계없이 메모리 사용량이 일정하다.
+
+묶음의 바이트 배치(헤더와 각 stem의 위치, 전체 길이)는 stem 파일만으로 미리 정해지므로
+Range 요청으로 끊긴 위치부터 이어받을 수 있다. ZIP은 stem의 CRC32를 데이터 뒤(data descriptor)에
+쓰므로 처음 받을 때는 보내면서 계산하고, 이어받을 때 이미 지나간 stem의 CRC32는 캐시에서 가져온다
+(캐시에 없으면 그 stem만 다시 읽어 계산).
+"""
+import hashlib
+import json
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote
+
+import numpy as np
+from flask import Response, request
+from werkzeug.datastructures import ContentRange
+from werkzeug.http import http_date
+
+from config import Config
+from mixer import mix_array, open_mix_sources
+from utils import wav_header
+from logger import get_logger
+
+logger = get_logger('bundle')
+
+# 이 크기(또는 위치) 이상이면 ZIP64 필드 사용
+ZIP64_LIMIT = 0xFFFFFFFF
+
+# WAVE_FORMAT_EXTENSIBLE의 PCM 서브포맷 GUID
+PCM_SUBFORMAT = bytes.fromhex('0100000000001000800000aa00389b71')
+
+_crc_cache = OrderedDict()
+_crc_lock = threading.Lock()
+
+
+def _cached_crc(key: str):
+    with _crc_lock:
+        if key in _crc_cache:
+            _crc_cache.move_to_end(key)
+            return _crc_cache[key]
+    return None
+
+
+def _remember_crc(key: str, crc: int) -> None:
+    with _crc_lock:
+        _crc_cache[key] = crc
+        _crc_cache.move_to_end(key)
+        while len(_crc_cache) > Config.BUNDLE_CRC_CACHE_SIZE:
+            _crc_cache.popitem(last=False)
+
+
+def pcm_range(read, block_align: int, start: int, end: int):
+    """
+    프레임 단위로 읽는 PCM의 바이트 구간을 청크로 나눠 생성
+
+    Args:
+        read: (시작 프레임, 끝 프레임) → np.ndarray int16 (frames, channels)
+        block_align: 프레임당 바이트 수
+        start: 시작 바이트 (PCM 영역 기준)
+        end: 끝 바이트 (포함하지 않음)
+
+    Yields:
+        bytes
+    """
+    chunk_frames = max(Config.BUNDLE_CHUNK_BYTES // block_align, 1)
+    frame = start // block_align
+    last_frame = -(-end // block_align)
+    while frame < last_frame:
+        stop = min(frame + chunk_frames, last_frame)
+        data = read(frame, stop).tobytes()
+        offset = frame * block_align
+        yield data[max(start - offset, 0):min(end, stop * block_align) - offset]
+        frame = stop
+
+
+class StemSource:
+    """묶음에 넣을 stem 하나 (stem WAV 파일 또는 여러 stem을 섞은 반주)"""
+
+    def __init__(self, name: str, paths: dict, gains: dict):
+        """
+        Args:
+            name: stem 이름
+            paths: {섞을 stem 이름: 경로} (stem 파일이면 하나)
+            gains: {섞을 stem 이름: 게인}
+        """
+        self.name = name
+        self.active, self.frames, self.channels, self.sr = open_mix_sources(paths, gains)
+        stats = {stem: Path(path).stat() for stem, path in paths.items()}
+        self.mtime = max(stat.st_mtime for stat in stats.values())
+        self.key = json.dumps({
+            'files': {stem: [str(paths[stem]), stats[stem].st_mtime_ns, stats[stem].st_size] for stem in sorted(paths)},
+            'gains': {stem: gains[stem] for stem in sorted(gains)},
+        }, sort_keys=True)
+
+        # 게인 1.0인 stem 파일 하나면 파일을 그대로 보내고, 아니면 섞은 WAV를 만든다
+        if len(paths) == 1 and list(gains.values()) == [1.0]:
+            self.path = Path(next(iter(paths.values())))
+            self.size = stats[next(iter(paths))].st_size
+        else:
+            self.path = None
+            self.header = wav_header(self.frames, self.channels, self.sr)
+            self.size = len(self.header) + self.frames * self.channels * 2
+
+    def read_frames(self, start: int, end: int) -> np.ndarray:
+        """프레임 구간 (end - start, channels) int16"""
+        return mix_array(self.active, start, end, self.channels)
+
+    def wav_range(self, start: int, end: int):
+        """WAV 파일 내용의 바이트 구간 생성"""
+        if self.path is not None:
+            with open(self.path, 'rb') as f:
+                f.seek(start)
+                remaining = end - start
+                while remaining > 0:
+                    chunk = f.read(min(Config.BUNDLE_CHUNK_BYTES, remaining))
+                    if not chunk:
+                        raise IOError(f"stem 파일이 예상보다 짧습니다: {self.path}")
+                    remaining -= len(chunk)
+                    yield chunk
+            return
+
+        header_size = len(self.header)
+        if start < header_size:
+            yield self.header[start:min(end, header_size)]
+        if end > header_size:
+            yield from pcm_range(self.read_frames, self.channels * 2,
+                                 max(start - header_size, 0), end - header_size)
+
+    def crc32(self) -> int:
+        """WAV 내용의 CRC32 (캐시에 없으면 전체를 읽어 계산)"""
+        crc = _cached_crc(self.key)
+        if crc is None:
+            logger.info(f"CRC32 계산 (이어받기): {self.name}")
+            crc = 0
+            for chunk in self.wav_range(0, self.size):
+                crc = zlib.crc32(chunk, crc)
+            _remember_crc(self.key, crc)
+        return crc
+
+
+class Bundle:
+    """미리 길이를 정한 조각들을 이어 붙인 가상 파일 (Range 요청 지원)"""
+
+    mimetype = 'application/octet-stream'
+    extension = ''
+
+    def __init__(self, sources: list):
+        """
+        Args:
+            sources: StemSource 목록 (묶음에 들어가는 순서)
+        """
+        self.sources = sources
+        self.parts = []     # [(시작 위치, 길이, (시작, 끝) → bytes generator), ...]
+        self.size = 0
+        self.mtime = max(source.mtime for source in sources)
+        key = json.dumps([type(self).__name__, [[source.name, source.key] for source in sources]])
+        self.etag = hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+    def add_part(self, length: int, produce) -> int:
+        """조각 추가, 조각의 시작 위치 반환"""
+        offset = self.size
+        self.parts.append((offset, length, produce))
+        self.size += length
+        return offset
+
+    def add_bytes(self, data: bytes) -> int:
+        return self.add_part(len(data), lambda start, end: iter([data[start:end]]))
+
+    def iter_range(self, start: int, end: int):
+        """
+        묶음의 바이트 구간 생성
+
+        Args:
+            start: 시작 바이트
+            end: 끝 바이트 (포함하지 않음)
+
+        Yields:
+            bytes
+        """
+        for offset, length, produce in self.parts:
+            lo, hi = max(start, offset), min(end, offset + length)
+            if lo < hi:
+                yield from produce(lo - offset, hi - offset)
+
+    def _if_range_matches(self) -> bool:
+        """If-Range가 없거나 현재 묶음과 같으면 True (다르면 전체를 다시 보냄)"""
+        if_range = request.if_range
+        if if_range.etag is not None:
+            return if_range.etag == self.etag
+        if if_range.date is not None:
+            return if_range.date >= datetime.fromtimestamp(int(self.mtime), timezone.utc)
+        return True
+
+    def response(self, download_name: str) -> Response:
+        """
+        묶음 응답 (Range 요청이면 206, 만족할 수 없는 구간이면 416)
+
+        Args:
+            download_name: 저장할 파일명
+
+        Returns:
+            Response
+        """
+        headers = {
+            'Accept-Ranges': 'bytes',
+            'ETag': f'"{self.etag}"',
+            'Last-Modified': http_date(int(self.mtime)),
+            'Content-Disposition': f"attachment; filename*=UTF-8''{quote(download_name)}",
+            'Cache-Control': 'no-cache',
+        }
+        if request.if_none_match.contains(self.etag):
+            return Response(status=304, headers=headers)
+
+        start, end, status = 0, self.size, 200
+        if request.range is not None and self._if_range_matches():
+            byte_range = request.range.range_for_length(self.size)
+            if byte_range is not None:
+                start, end = byte_range
+                status = 206
+                headers['Content-Range'] = ContentRange('bytes', start, end, self.size).to_header()
+            elif len(request.range.ranges) == 1:
+                headers['Content-Range'] = f"bytes */{self.size}"
+                return Response(status=416, headers=headers)
+            # 여러 구간을 요청하면 전체를 보냄
+
+        headers['Content-Length'] = str(end - start)
+        return Response(self.iter_range(start, end), status=status, mimetype=self.mimetype, headers=headers)
+
+
+def dos_datetime(timestamp: float) -> tuple:
+    """ZIP 헤더의 (DOS 시각, DOS 날짜)"""
+    t = time.localtime(max(timestamp, 315532800))   # 1980-01-01 이전은 표현할 수 없음
+    return ((t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2),
+            ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday)
+
+
+class ZipBundle(Bundle):
+    """
+    stem WAV들을 무압축(store) ZIP으로 묶음
+
+    WAV는 압축해도 거의 줄지 않으므로 압축하지 않는다. 4GB가 넘는 stem이나 묶음은 ZIP64로 기록한다.
+    """
+
+    mimetype = 'application/zip'
+    extension = 'zip'
+
+    def __init__(self, sources: list, folder: str):
+        """
+        Args:
+            sources: StemSource 목록
+            folder: ZIP 안의 폴더 이름 (stem 파일명 접두어로도 사용)
+        """
+        super().__init__(sources)
+        self.entries = []   # [(StemSource, ZIP 안의 파일명, 로컬 헤더 위치)]
+        for source in sources:
+            filename = f"{folder}/{folder}_{source.name}.wav".encode('utf-8')
+            offset = self.add_bytes(self._local_header(source, filename))
+            self.add_part(source.size, lambda start, end, source=source: self._entry_range(source, start, end))
+            zip64 = source.size >= ZIP64_LIMIT
+            self.add_part(24 if zip64 else 16,
+                          lambda start, end, source=source: iter([self._data_descriptor(source)[start:end]]))
+            self.entries.append((source, filename, offset))
+
+        # 중앙 디렉토리는 CRC32가 필요하므로 보낼 때 만든다 (길이는 CRC32와 관계없음)
+        self.directory_offset = self.size
+        self.directory_size = len(self._central_directory(lambda source: 0))
+        self.add_part(self.directory_size,
+                      lambda start, end: iter([self._central_directory(StemSource.crc32)[start:end]]))
+        self.add_bytes(self._end_records())
+
+    @staticmethod
+    def _local_header(source: StemSource, filename: bytes) -> bytes:
+        # 플래그: bit 3 (CRC32/크기는 data descriptor에), bit 11 (UTF-8 파일명)
+        zip64 = source.size >= ZIP64_LIMIT
+        extra = struct.pack('<HHQQ', 0x0001, 16, 0, 0) if zip64 else b''
+        dos_time, dos_date = dos_datetime(source.mtime)
+        size_field = 0xFFFFFFFF if zip64 else 0
+        return struct.pack(
+            '<IHHHHHIIIHH', 0x04034b50, 45 if zip64 else 20, 0x0808, 0, dos_time, dos_date,
+            0, size_field, size_field, len(filename), len(extra)
+        ) + filename + extra
+
+    def _entry_range(self, source: StemSource, start: int, end: int):
+        """stem 내용 (처음부터 끝까지 보내면 CRC32를 계산해 캐시)"""
+        if start != 0 or end != source.size or _cached_crc(source.key) is not None:
+            yield from source.wav_range(start, end)
+            return
+        crc = 0
+        for chunk in source.wav_range(start, end):
+            crc = zlib.crc32(chunk, crc)
+            yield chunk
+        _remember_crc(source.key, crc)
+
+    @staticmethod
+    def _data_descriptor(source: StemSource) -> bytes:
+        if source.size >= ZIP64_LIMIT:
+            return struct.pack('<IIQQ', 0x08074b50, source.crc32(), source.size, source.size)
+        return struct.pack('<IIII', 0x08074b50, source.crc32(), source.size, source.size)
+
+    def _central_directory(self, crc32) -> bytes:
+        records = []
+        for source, filename, offset in self.entries:
+            # 4GB를 넘는 값은 ZIP64 extra 필드에 (크기, 크기, 위치 순서)
+            zip64_fields = []
+            if source.size >= ZIP64_LIMIT:
+                zip64_fields += [source.size, source.size]
+            if offset >= ZIP64_LIMIT:
+                zip64_fields.append(offset)
+            extra = (struct.pack(f'<HH{len(zip64_fields)}Q', 0x0001, 8 * len(zip64_fields), *zip64_fields)
+                     if zip64_fields else b'')
+            size_field = 0xFFFFFFFF if source.size >= ZIP64_LIMIT else source.size
+            version = 45 if source.size >= ZIP64_LIMIT else 20
+            dos_time, dos_date = dos_datetime(source.mtime)
+            records.append(struct.pack(
+                '<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | 45, version, 0x0808, 0, dos_time, dos_date,
+                crc32(source), size_field, size_field, len(filename), len(extra), 0, 0, 0,
+                0o100644 << 16, 0xFFFFFFFF if offset >= ZIP64_LIMIT else offset
+            ) + filename + extra)
+        return b''.join(records)
+
+    def _end_records(self) -> bytes:
+        count = len(self.entries)
+        directory_size = 0xFFFFFFFF if self.directory_size >= ZIP64_LIMIT else self.directory_size
+        directory_offset = 0xFFFFFFFF if self.directory_offset >= ZIP64_LIMIT else self.directory_offset
+        end = b''
+        if count >= 0xFFFF or directory_size == 0xFFFFFFFF or directory_offset == 0xFFFFFFFF:
+            zip64_end_offset = self.directory_offset + self.directory_size
+            end += struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, 45, 45, 0, 0, count, count,
+                               self.directory_size, self.directory_offset)
+            end += struct.pack('<IIQI', 0x07064b50, 0, zip64_end_offset, 1)
+        return end + struct.pack(
+            '<IHHHHIIH', 0x06054b50, 0, 0, min(count, 0xFFFF), min(count, 0xFFFF),
+            directory_size, directory_offset, 0
+        )
+
+
+class MultitrackWav(Bundle):
+    """
+    stem들을 채널로 나란히 담은 16-bit PCM WAV 하나 (stem마다 채널 2개, 스테레오 기준)
+
+    채널 배치(예: vocals=1-2, drums=3-4)는 LIST/INFO의 ICMT 항목과 응답 헤더에 기록한다.
+    DAW에서 다채널 파일 하나로 불러와 트랙별로 나눠 쓰는 용도다.
+    """
+
+    mimetype = 'audio/wav'
+    extension = 'wav'
+
+    def __init__(self, sources: list):
+        """
+        Args:
+            sources: StemSource 목록 (같은 샘플레이트)
+
+        Raises:
+            ValueError: 샘플레이트가 다르거나 WAV로 담을 수 있는 크기(4GB)를 넘을 때
+        """
+        super().__init__(sources)
+        if len({source.sr for source in sources}) != 1:
+            raise ValueError("stem의 샘플레이트가 달라 하나의 WAV로 묶을 수 없습니다.")
+        self.sr = sources[0].sr
+        self.frames = min(source.frames for source in sources)
+        self.channels = sum(source.channels for source in sources)
+
+        layout, channel = [], 1
+        for source in sources:
+            layout.append(f"{source.name}={channel}-{channel + source.channels - 1}")
+            channel += source.channels
+        self.channel_map = ', '.join(layout)
+
+        header = self._header()
+        data_size = self.frames * self.channels * 2
+        if len(header) - 8 + data_size > 0xFFFFFFFF:
+            raise ValueError("다채널 WAV의 최대 크기(4GB)를 넘습니다. format=zip을 사용하세요.")
+        self.add_bytes(header)
+        self.add_part(data_size, lambda start, end: pcm_range(self.read_frames, self.channels * 2, start, end))
+
+    def _header(self) -> bytes:
+        block_align = self.channels * 2
+        data_size = self.frames * block_align
+        comment = self.channel_map.encode('ascii', 'replace') + b'\0'
+        comment += b'\0' * (len(comment) & 1)
+        info = b'INFO' + struct.pack('<4sI', b'ICMT', len(comment)) + comment
+        fmt = struct.pack('<HHIIHHHHI', 0xFFFE, self.channels, self.sr, self.sr * block_align,
+                          block_align, 16, 22, 16, 0) + PCM_SUBFORMAT
+        body = (b'WAVE'
+                + struct.pack('<4sI', b'fmt ', len(fmt)) + fmt
+                + struct.pack('<4sI', b'LIST', len(info)) + info
+                + struct.pack('<4sI', b'data', data_size))
+        return struct.pack('<4sI', b'RIFF', len(body) + data_size) + body
+
+    def read_frames(self, start: int, end: int) -> np.ndarray:
+        """모든 stem의 프레임 구간을 채널 방향으로 이어 붙임"""
+        return np.concatenate([source.read_frames(start, end) for source in self.sources], axis=1)
+
+    def response(self, download_name: str) -> Response:
+        response = super().response(download_name)
+        response.headers['X-Stem-Channels'] = self.channel_map
+        return response
+
+
+BUNDLE_FORMATS = {'zip': ZipBundle, 'wav': MultitrackWav}
+
+
+def open_bundle(bundle_format: str, track: str, stems: dict) -> Bundle:
+    """
+    stem 묶음 준비 (내용은 응답을 보낼 때 만든다)
+
+    Args:
+        bundle_format: 'zip' 또는 'wav'
+        track: 트랙 이름
+        stems: {stem 이름: ({섞을 stem 이름: 경로}, {섞을 stem 이름: 게인})}
+
+    Returns:
+        Bundle
+
+    Raises:
+        ValueError: 알 수 없는 형식이거나 묶을 수 없을 때
+    """
+    if bundle_format not in BUNDLE_FORMATS:
+        raise ValueError(f"지원하는 형식: {', '.join(BUNDLE_FORMATS)}")
+    sources = [StemSource(name, paths, gains) for name, (paths, gains) in stems.items()]
+    if bundle_format == 'zip':
+        return ZipBundle(sources, track)
+    return MultitrackWav(sources)
@@ -0,0 +1,166 @@
+"""
+재개 가능한 분리 모듈 (구간별 체크포인트)
+
+긴 곡은 Config.CHECKPOINT_BLOCK_SECONDS 단위 블록으로 나눠 분리하고, 블록이 끝날 때마다 결과를
+작업 디렉토리의 checkpoint/에 저장한다. 프로세스가 중간에 죽어도 같은 입력을 다시 요청하면
+(같은 작업 디렉토리) 다운로드한 원본과 저장된 블록을 그대로 쓰고 남은 블록만 분리한다.
+
+블록은 곡 전체를 분리할 때와 같은 segment 위치에서 시작하고 앞뒤로 segment 하나씩 더 넣어 분리한 뒤
+블록 부분만 남기므로, shifts=0(fast)이면 곡 전체를 한 번에 분리한 결과와 같다.
+shifts가 있는 프리셋(기본값 balanced 포함)은 apply_model이 무작위 shift를 블록마다 따로 고르므로
+한 번에 분리한 결과와 같지 않다 (한 번에 분리해도 실행할 때마다 달라지는 정도의 차이).
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from config import Config
+from logger import get_logger
+
+logger = get_logger('checkpoint')
+
+SOURCE_FILE = 'source.json'
+
+
+def save_source(workspace: Path, audio_file: str, title: str) -> None:
+    """
+    다운로드가 끝난 원본 파일을 작업 디렉토리에 기록 (재개 시 다운로드를 건너뛰기 위해)
+
+    Args:
+        workspace: 작업 디렉토리
+        audio_file: 작업 디렉토리 안의 원본 파일 경로
+        title: 곡 제목
+    """
+    marker = Path(workspace) / SOURCE_FILE
+    tmp = marker.with_suffix('.tmp')
+    tmp.write_text(json.dumps({'file': Path(audio_file).name, 'title': title}, ensure_ascii=False),
+                   encoding='utf-8')
+    os.replace(tmp, marker)
+
+
+def load_source(workspace: Path) -> tuple:
+    """
+    이전 실행에서 다운로드한 원본 파일 조회
+
+    Args:
+        workspace: 작업 디렉토리
+
+    Returns:
+        tuple: (원본 파일 경로, 곡 제목), 없으면 (None, None)
+    """
+    marker = Path(workspace) / SOURCE_FILE
+    try:
+        source = json.loads(marker.read_text(encoding='utf-8'))
+        audio_file = Path(workspace) / source['file']
+        if audio_file.is_file():
+            return str(audio_file), source['title']
+    except (OSError, ValueError, KeyError):
+        pass
+    return None, None
+
+
+def prune_workspaces(base_dir: Path, max_age: float = None) -> int:
+    """
+    오래된 작업 디렉토리 정리 (재개하지 않고 남은 작업)
+
+    Args:
+        base_dir: 작업 디렉토리들의 상위 디렉토리
+        max_age: 마지막 수정 후 이 시간이 지나면 삭제 (초, None이면 Config.CHECKPOINT_MAX_AGE)
+
+    Returns:
+        int: 삭제한 디렉토리 수
+    """
+    max_age = Config.CHECKPOINT_MAX_AGE if max_age is None else max_age
+    now = time.time()
+    removed = 0
+    for workspace in Path(base_dir).iterdir():
+        if not workspace.is_dir():
+            continue
+        try:
+            modified = max(path.stat().st_mtime for path in [workspace, *workspace.iterdir()])
+        except OSError:
+            continue
+        if now - modified > max_age:
+            shutil.rmtree(workspace, ignore_errors=True)
+            removed += 1
+    if removed:
+        logger.info(f"오래된 작업 디렉토리 정리: {removed}개")
+    return removed
+
+
+def audio_digest(wav: torch.Tensor) -> str:
+    """입력 오디오의 해시 (체크포인트가 같은 입력의 것인지 확인)"""
+    return hashlib.blake2b(np.ascontiguousarray(wav.numpy()), digest_size=16).hexdigest()
+
+
+class SeparationCheckpoint:
+    """작업 디렉토리의 블록별 분리 결과 저장/복원"""
+
+    def __init__(self, workspace: Path):
+        """
+        Args:
+            workspace: 작업 디렉토리 (checkpoint/ 하위에 저장)
+        """
+        self.directory = Path(workspace) / 'checkpoint'
+        self.manifest_path = self.directory / 'manifest.json'
+
+    def open(self, key: dict, preset: str, params: dict) -> tuple:
+        """
+        체크포인트 열기 (key가 다르면 이전 블록을 지우고 새로 시작)
+
+        프리셋이 'auto'면 실행할 때마다 결과 프리셋이 달라질 수 있으므로,
+        이어서 분리할 때는 처음 실행에서 고른 프리셋/파라미터를 그대로 쓴다.
+
+        Args:
+            key: 입력/모델/요청 프리셋/정밀도 등 결과를 결정하는 값
+            preset: 이번 실행에서 고른 프리셋
+            params: 이번 실행에서 고른 apply_model 파라미터
+
+        Returns:
+            tuple: (사용할 프리셋, 사용할 파라미터)
+        """
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+            if manifest['key'] == key:
+                return manifest['preset'], manifest['params']
+            logger.info("입력 또는 설정이 달라 이전 체크포인트 삭제")
+        except (OSError, ValueError, KeyError):
+            pass
+
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.directory.mkdir(parents=True)
+        tmp = self.manifest_path.with_suffix('.tmp')
+        tmp.write_text(json.dumps({'key': key, 'preset': preset, 'params': params}), encoding='utf-8')
+        os.replace(tmp, self.manifest_path)
+        return preset, params
+
+    def _block_path(self, start: int, end: int) -> Path:
+        return self.directory / f"{start}-{end}.pt"
+
+    def load(self, start: int, end: int) -> torch.Tensor:
+        """저장된 블록 결과 (stems, channels, end - start), 없으면 None"""
+        path = self._block_path(start, end)
+        if not path.exists():
+            return None
+        try:
+            # 텐서만 읽음 (작업 디렉토리의 파일에 들어 있는 임의의 객체를 unpickle하지 않음)
+            sources = torch.load(path, weights_only=True)
+            if not isinstance(sources, torch.Tensor):
+                raise ValueError(f"텐서가 아닙니다: {type(sources).__name__}")
+            return sources
+        except Exception as e:
+            logger.warning(f"체크포인트 블록을 읽을 수 없어 다시 분리: {path.name} ({e})")
+            return None
+
+    def save(self, start: int, end: int, sources: torch.Tensor) -> None:
+        """블록 결과 저장 (임시 파일에 쓴 뒤 이름을 바꾸므로 중간에 죽어도 깨진 블록이 남지 않음)"""
+        path = self._block_path(start, end)
+        tmp = path.with_suffix('.tmp')
+        torch.save(sources.clone(), tmp)
+        os.replace(tmp, path)
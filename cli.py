@@ -0,0 +1,295 @@
+"""
+명령줄 일괄 분리 (웹 서버 없이 여러 곡을 한 번에 처리)
+
+모델은 한 번만 로드해 모든 작업이 공유하고, 결과는 웹앱과 같은 출력 디렉토리와
+결과 인덱스에 기록되므로 웹 화면에서도 바로 재생할 수 있다.
+이미 같은 모델/프리셋으로 분리한 입력은 건너뛴다.
+
+사용법:
+    python cli.py https://youtu.be/XXXXXXXXXXX https://youtu.be/YYYYYYYYYYY
+    python cli.py --list urls.txt --jobs 4 --summary summary.json
+    python cli.py ./songs --preset fast --separate-jobs 2
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from config import Config
+from downloader import YouTubeDownloader, VideoRejectedError, source_key, validate_video_info
+from separator import AudioSeparator
+from fingerprint import compute_fingerprint
+from result_index import ResultIndex
+from jobs import Job, JobStore
+from presets import available_presets
+from thread_tuner import tune_threads
+from checkpoint import load_source, save_source, prune_workspaces
+from utils import (
+    convert_to_wav, decode_audio, audio_to_tensor, cleanup_temp_files, create_job_workspace, cleanup_workspace
+)
+from logger import setup_logger, get_logger
+
+logger = get_logger('cli')
+
+
+def collect_inputs(items: list, list_file: str = None) -> list:
+    """
+    명령줄 인자와 목록 파일에서 처리할 입력 모으기
+
+    URL은 그대로, 디렉토리는 하위의 오디오 파일(Config.BATCH_AUDIO_EXTENSIONS)을 이름순으로 펼친다.
+    목록 파일은 한 줄에 하나씩 URL 또는 경로를 적고, '#'으로 시작하는 줄은 무시한다.
+
+    Args:
+        items: URL, 파일, 디렉토리 목록
+        list_file: 목록 파일 경로
+
+    Returns:
+        list: [(source, source_type('youtube'/'file')), ...] (중복 제거, 순서 유지)
+    """
+    items = list(items)
+    if list_file:
+        for line in Path(list_file).read_text(encoding='utf-8').splitlines():
+            line = line.strip()
+            if line and not line.startswith('#'):
+                items.append(line)
+
+    inputs = []
+    for item in items:
+        if item.startswith(('http://', 'https://')):
+            inputs.append((item, 'youtube'))
+            continue
+        path = Path(item).expanduser().resolve()
+        if path.is_dir():
+            files = sorted(p for p in path.rglob('*')
+                           if p.is_file() and p.suffix.lower() in Config.BATCH_AUDIO_EXTENSIONS)
+            logger.info(f"디렉토리 {path}: 오디오 파일 {len(files)}개")
+            inputs += [(str(p), 'file') for p in files]
+        elif path.is_file():
+            inputs.append((str(path), 'file'))
+        else:
+            logger.warning(f"입력을 찾을 수 없어 건너뜀: {item}")
+    return list(dict.fromkeys(inputs))
+
+
+class BatchRunner:
+    """입력 하나를 다운로드/디코딩/분리하고 요약을 반환 (여러 스레드에서 호출)"""
+
+    def __init__(self, downloader: YouTubeDownloader, separator: AudioSeparator, jobs: JobStore,
+                 index: ResultIndex, preset: str, separate_jobs: int = 1, force: bool = False):
+        """
+        Args:
+            downloader: YouTube 다운로더
+            separator: 음원 분리기 (모든 작업이 공유)
+            jobs: 작업 저장소
+            index: 결과 인덱스
+            preset: 분리 프리셋
+            separate_jobs: 동시에 모델을 실행할 작업 수 (다운로드/디코딩은 --jobs만큼 동시에 진행)
+            force: True면 이미 처리한 입력도 다시 분리
+        """
+        self.downloader = downloader
+        self.separator = separator
+        self.jobs = jobs
+        self.index = index
+        self.preset = preset
+        self.force = force
+        self._model_slots = threading.Semaphore(separate_jobs)
+
+    def run(self, source: str, source_type: str) -> dict:
+        """
+        입력 하나 처리
+
+        Args:
+            source: YouTube URL 또는 파일 경로
+            source_type: 'youtube' 또는 'file'
+
+        Returns:
+            dict: {'source', 'status'(completed/skipped/deduplicated/coalesced/rejected/failed),
+                   'job_id', 'title', 'track', 'stems', 'timings', 'elapsed', 'error', ...}
+        """
+        start = time.perf_counter()
+        entry = {'source': source, 'source_type': source_type}
+        key = source_key(source, source_type)
+
+        # 1. 이미 처리한 입력이면 다운로드/디코딩 없이 건너뜀
+        if not self.force:
+            _, existing = self.index.find_by_source(source, source_type, self.separator.model_name, self.preset)
+            if existing:
+                logger.info(f"이미 처리됨, 건너뜀: {source}")
+                return {**entry, 'status': 'skipped', 'title': existing['title'], 'track': existing['track'],
+                        'stems': existing['stems'], 'elapsed': round(time.perf_counter() - start, 3)}
+
+        job, created = self.jobs.create_or_attach((key, self.separator.model_name, self.preset),
+                                                  source=source, source_type=source_type)
+        if created:
+            try:
+                status = self._process(job, source, source_type)
+            except VideoRejectedError as e:
+                job.fail(str(e))
+                status = 'rejected'
+                entry['code'] = e.code
+            except Exception as e:
+                logger.error(f"처리 실패: {source} ({e})", exc_info=True)
+                job.fail(str(e))
+                status = 'failed'
+        else:
+            status = 'coalesced'
+
+        # stem 파일이 모두 저장될 때까지 대기 (시간 기록과 인덱스 추가가 끝나도록
+        # _process가 등록한 인덱스 콜백 뒤에 등록)
+        finished = threading.Event()
+        job.add_done_callback(lambda _: finished.set())
+        finished.wait()
+        response = job.to_dict()
+        if status != 'rejected' and response['status'] == 'failed':
+            status = 'failed'
+        return {
+            **entry,
+            'status': status,
+            'job_id': job.id,
+            'title': response['title'],
+            'track': response.get('track'),
+            'stems': response.get('stems'),
+            'timings': response['timings'],
+            'elapsed': round(time.perf_counter() - start, 3),
+            'error': response['error'],
+        }
+
+    def _process(self, job: Job, source: str, source_type: str) -> str:
+        """
+        다운로드(YouTube) → 변환 → 로드 → 지문 확인 → 분리
+
+        Returns:
+            'completed' 또는 'deduplicated'
+
+        Raises:
+            VideoRejectedError: 다운로드 전 검증 실패
+        """
+        # 같은 입력/모델/프리셋은 같은 작업 디렉토리 (중단된 실행의 원본과 체크포인트를 재사용)
+        workspace = create_job_workspace(Config.TEMP_DIR, (source_key(source, source_type),
+                                                           self.separator.model_name, self.preset))
+        if source_type == 'youtube':
+            audio_file, title = load_source(workspace)
+            if audio_file:
+                logger.info(f"이전 실행에서 받은 원본 사용: {source}")
+            else:
+                video_info = None
+                try:
+                    video_info = self.downloader.fetch_info(source)
+                    validate_video_info(video_info)
+                except VideoRejectedError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"메타데이터 없이 진행: {e}")
+                with job.stage('download'):
+                    audio_file, title = self.downloader.download_audio(source, output_path=workspace,
+                                                                       info=video_info)
+                save_source(workspace, audio_file, title)
+        else:
+            audio_file, title = source, Path(source).stem
+
+        with job.stage('convert'):
+            wav_file = convert_to_wav(audio_file, str(workspace / "audio.wav"), keep_input=True)
+        # pydub 디코딩과 float32 변환의 메모리 최대값을 따로 기록
+        with job.stage('decode'):
+            audio = decode_audio(wav_file)
+        with job.stage('to_tensor'):
+            wav, sr = audio_to_tensor(audio)
+        del audio
+        cleanup_temp_files(wav_file)
+
+        duration = wav.shape[-1] / sr
+        fingerprint = None
+        if Config.FINGERPRINT_DEDUP:
+            with job.stage('fingerprint'):
+                fingerprint = compute_fingerprint(wav, sr)
+                result_id, existing = self.index.find_duplicate(
+                    fingerprint, duration, self.separator.model_name, self.preset
+                )
+            if existing and not self.force:
+                logger.info(f"기존 분리 결과 재사용: {existing['title']}")
+                self.index.link_job(job.id, result_id)
+                ready = list(existing['stems']) + (['accompaniment'] if existing.get('accompaniment') else [])
+                job.complete({**existing, 'title': title, 'deduplicated_from': existing['title']}, ready=ready)
+                cleanup_workspace(workspace)
+                return 'deduplicated'
+
+        with self._model_slots:
+            with job.stage('separate'):
+                result = self.separator.separate(wav, sr, title, preset=self.preset, job=job,
+                                                 workspace=workspace)
+        del wav
+
+        def index_result(finished_job):
+            if finished_job.status == 'completed':
+                self.index.add_result(finished_job.id, result, self.separator.model_name,
+                                      duration, fingerprint)
+        job.add_done_callback(index_result)
+        job.complete(result)
+
+        # 실패한 입력의 작업 디렉토리는 남겨 다음 실행에서 이어서 분리 (오래되면 prune_workspaces가 정리)
+        cleanup_workspace(workspace)
+        return 'completed'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='YouTube URL/오디오 파일 일괄 음원 분리 (웹 서버 없이)')
+    parser.add_argument('inputs', nargs='*', help='YouTube URL, 오디오 파일 또는 디렉토리')
+    parser.add_argument('--list', dest='list_file', help='한 줄에 하나씩 URL/경로를 적은 목록 파일')
+    parser.add_argument('--preset', default=Config.DEFAULT_PRESET, help='분리 프리셋')
+    parser.add_argument('--model', default=Config.DEMUCS_MODEL, help='Demucs 모델 이름')
+    parser.add_argument('--jobs', type=int, default=2, help='동시에 처리할 입력 수 (다운로드/디코딩)')
+    parser.add_argument('--separate-jobs', type=int, default=1, help='동시에 모델을 실행할 작업 수')
+    parser.add_argument('--force', action='store_true', help='이미 처리한 입력도 다시 분리')
+    parser.add_argument('--summary', help='처리 결과 요약을 저장할 JSON 파일 (없으면 표준 출력)')
+    args = parser.parse_args()
+
+    Config.init_directories()
+    setup_logger('youtube-separator', Config.LOG_DIR)
+    prune_workspaces(Config.TEMP_DIR)
+
+    inputs = collect_inputs(args.inputs, args.list_file)
+    if not inputs:
+        parser.error('처리할 입력이 없습니다.')
+    if args.preset not in available_presets():
+        parser.error(f'알 수 없는 프리셋입니다: {args.preset}')
+    logger.info(f"일괄 처리 시작: {len(inputs)}개 (동시 {args.jobs}개, 모델 동시 실행 {args.separate_jobs}개)")
+
+    tune_threads(args.model)
+    separator = AudioSeparator(model_name=args.model, output_dir=Config.OUTPUT_DIR, use_gpu=Config.USE_GPU)
+    index = ResultIndex(Config.RESULT_INDEX)
+    jobs = JobStore(max(Config.JOB_HISTORY_LIMIT, len(inputs)), index)
+    runner = BatchRunner(YouTubeDownloader(Config.TEMP_DIR), separator, jobs, index,
+                         args.preset, separate_jobs=args.separate_jobs, force=args.force)
+
+    started_at = time.time()
+    with ThreadPoolExecutor(max_workers=max(args.jobs, 1), thread_name_prefix='batch') as pool:
+        items = list(pool.map(lambda item: runner.run(*item), inputs))
+    index.prune()
+
+    counts = {}
+    for item in items:
+        counts[item['status']] = counts.get(item['status'], 0) + 1
+    summary = {
+        'model': args.model,
+        'preset': args.preset,
+        'started_at': started_at,
+        'elapsed': round(time.time() - started_at, 3),
+        'counts': counts,
+        'items': items,
+    }
+    text = json.dumps(summary, ensure_ascii=False, indent=2)
+    if args.summary:
+        Path(args.summary).write_text(text + '\n', encoding='utf-8')
+        logger.info(f"요약 저장: {args.summary}")
+    else:
+        print(text)
+
+    logger.info(f"일괄 처리 완료: {counts} ({summary['elapsed']:.1f}초)")
+    return 1 if counts.get('failed') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -10,13 +10,141 @@ class Config:
     OUTPUT_DIR = Path("./output")
     TEMP_DIR = Path("./temp")
     LOG_DIR = Path("./logs")
+    CACHE_DIR = Path("./cache")
 
     # Demucs 모델 설정
     DEMUCS_MODEL = 'htdemucs'  # htdemucs, htdemucs_ft, htdemucs_6s
 
+    # 분리 프리셋 (apply_model 파라미터)
+    # segment=None이면 모델 기본값 사용 (htdemucs는 7.8초를 넘길 수 없음)
+    # htdemucs 계열은 긴 곡을 한 번에 처리할 수 없으므로 split은 항상 True
+    SEPARATION_PRESETS = {
+        'fast': {'shifts': 0, 'overlap': 0.1, 'segment': None, 'split': True},
+        'balanced': {'shifts': 1, 'overlap': 0.25, 'segment': None, 'split': True},
+        'quality': {'shifts': 3, 'overlap': 0.5, 'segment': None, 'split': True},
+    }
+    DEFAULT_PRESET = 'balanced'  # fast, balanced, quality, auto
+
+    # auto 프리셋 기준
+    AUTO_LONG_TRACK_SECONDS = 600     # 이보다 긴 곡은 fast
+    AUTO_SHORT_TRACK_SECONDS = 360    # 이보다 짧고 한가하면 quality
+    AUTO_BUSY_JOBS_PER_CORE = 0.25    # 코어당 다른 작업 수가 이 이상이면 fast
+    AUTO_QUALITY_MIN_CPUS = 8         # quality를 고르기 위한 최소 코어 수
+
     # GPU 설정
     USE_GPU = True  # M1 Mac의 경우 MPS 사용
 
+    # 추론 정밀도 (CPU 전용)
+    # bfloat16: bf16을 지원하는 CPU(AVX512-BF16, AMX)에서 autocast로 실행하고 stem을 2바이트로 보관
+    # 지원하지 않거나 실행 중 오류가 나면 float32로 전환
+    INFERENCE_PRECISION = 'float32'   # float32, bfloat16
+    REDUCED_BUFFER_DTYPE = 'float16'  # bfloat16 모드의 stem 보관 형식 (float16이 bfloat16보다 가수부가 3비트 더 김)
+
+    # 작업 간 배치 추론 (동시에 분리 중인 작업의 같은 길이 segment를 한 번의 forward로 실행)
+    # 동시에 분리하는 작업이 있어야 효과가 있으므로 MAX_RUNNING_JOBS와 함께 올린다
+    INFERENCE_BATCH_MAX = 1           # 한 번에 묶을 최대 segment 수 (1이면 끔)
+    INFERENCE_BATCH_WAIT = 0.02       # 다른 작업의 segment를 기다리는 최대 시간 (초)
+
+    # 재개 가능한 분리 (긴 곡은 블록마다 작업 디렉토리에 결과를 저장, 프로세스가 죽은 뒤 같은 요청이 오면 이어서 분리)
+    CHECKPOINTING = True
+    CHECKPOINT_MIN_SECONDS = 10 * 60    # 이보다 긴 곡만 체크포인트 사용
+    CHECKPOINT_BLOCK_SECONDS = 300      # 체크포인트 블록 길이 (초, 블록마다 앞뒤 segment 하나씩 더 분리)
+    CHECKPOINT_MAX_AGE = 24 * 3600      # 재개되지 않은 작업 디렉토리를 시작 시 삭제하는 기준 (초)
+
+    # 무음 구간 건너뛰기 (인트로/아웃트로/중간 공백은 모델을 실행하지 않음)
+    SILENCE_SKIP = True
+    SILENCE_THRESHOLD_DB = -50.0    # 이보다 조용한 프레임은 무음 (dBFS)
+    SILENCE_MIN_DURATION = 2.0      # 이보다 긴 무음만 건너뜀 (초)
+    SILENCE_PADDING = 0.5           # 유효 구간 앞뒤 여유 (초)
+
+    # 오디오 지문 중복 제거 (같은 곡의 다른 업로드는 기존 결과 재사용)
+    FINGERPRINT_DEDUP = True
+    FINGERPRINT_MAX_BER = 0.3               # 일치로 볼 최대 비트 오류율 (다른 곡은 약 0.5)
+    FINGERPRINT_DURATION_TOLERANCE = 5.0    # 허용 길이 차이 (초)
+    FINGERPRINT_MAX_OFFSET = 100            # 탐색할 시작 위치 차이 (프레임, 0.05초 단위)
+    FINGERPRINT_MIN_FRAMES = 200            # 비교에 필요한 최소 프레임 수 (약 10초)
+
+    # torch 스레드 자동 튜닝 (시작 시 1회 측정 후 캐시)
+    THREAD_AUTOTUNE = True
+    THREAD_TUNE_CACHE = CACHE_DIR / "threads.json"
+    THREAD_TUNE_SECONDS = 8.0       # 측정용 합성 입력 길이 (초)
+    THREAD_TUNE_REPEATS = 2         # 조합당 측정 횟수 (워밍업 제외)
+    THREAD_TUNE_CONCURRENCY = 1     # 측정 시 동시에 실행할 추론 수 (예상 동시 요청 수)
+    THREAD_TUNE_TIMEOUT = 300       # 조합당 최대 측정 시간 (초)
+
+    # 작업/결과 인덱스 (SQLite)
+    RESULT_INDEX = CACHE_DIR / "results.db"
+    RESULT_RETENTION_DAYS = 30      # 마지막 접근 후 이 기간이 지난 결과 삭제 (None이면 보관)
+    RESULT_MAX_BYTES = None         # stem 파일 총 용량 상한, 넘으면 오래 안 들은 결과부터 삭제 (None이면 무제한)
+    RETENTION_INTERVAL = 3600       # 보관 정책 검사 간격 (초)
+
+    # 다운로드 전 검증 (메타데이터로 판단, 한도를 넘으면 422 + 오류 코드)
+    MAX_MEDIA_DURATION = 30 * 60            # 최대 곡 길이 (초, 업로드에도 적용, None이면 무제한)
+    MAX_DOWNLOAD_BYTES = 200 * 1024 * 1024  # 다운로드할 오디오의 최대 예상 크기 (None이면 무제한)
+
+    # 작업 수락 제어 (한도를 넘으면 429 + Retry-After)
+    MAX_RUNNING_JOBS = 1            # 동시에 실행할 작업 수 (다운로드~분리)
+    MAX_QUEUED_JOBS = 8             # 실행을 기다릴 수 있는 작업 수 (전체)
+    MAX_JOBS_PER_CLIENT = 2         # 클라이언트당 대기 + 실행 작업 수
+    MAX_RETRY_AFTER = 3600          # Retry-After 상한 (초)
+    ADMISSION_DEFAULT_DURATION = 240        # 길이를 모를 때 가정하는 곡 길이 (초)
+    ADMISSION_INITIAL_RTF = 0.5             # 곡 길이 1초당 예상 처리 시간 (초, 실제 분리 시간으로 갱신됨)
+    ADMISSION_RTF_SMOOTHING = 0.2           # 처리 속도 추정의 지수 이동 평균 가중치
+    SCHEDULER_POLICY = 'sjf'        # sjf: 예상 처리 시간이 짧은 작업 먼저 (aging 적용), fifo: 도착 순서
+    SCHEDULER_AGING = 0.5           # 기다린 1초당 줄어드는 예상 처리 시간 (초, 클수록 FIFO에 가까움)
+    TRUST_FORWARDED_FOR = False     # 프록시(ngrok 등) 뒤에서는 True: X-Forwarded-For로 클라이언트 구분
+
+    # 메모리 측정 (단계별 최대 RSS, tracemalloc/NumPy, CUDA 텐서를 작업 기록과 /metrics에 표시)
+    MEMORY_PROFILING = False        # tracemalloc 오버헤드가 있으므로 필요할 때만 켬
+    MEMORY_SAMPLE_INTERVAL = 0.05   # RSS 측정 간격 (초)
+
+    # 결과 저장 설정 (응답 후 백그라운드로 stem 파일 저장)
+    OUTPUT_WRITER_THREADS = 2
+    WAV_WRITE_CHUNK_FRAMES = 65536  # stem을 int16으로 변환해 쓰는 단위 (프레임)
+    JOB_HISTORY_LIMIT = 500         # 메모리에 유지할 최근 작업 수
+    COALESCE_WAIT_TIMEOUT = 1800    # 같은 곡 작업에 합류한 요청이 결과를 기다리는 최대 시간 (초)
+
+    # 리믹스 설정 (/mix)
+    EAGER_ACCOMPANIMENT = False     # True면 분리 직후 반주 파일도 저장 (False면 /mix로 요청 시 생성)
+    MIX_CACHE_DIR = OUTPUT_DIR / "mixes"
+    MIX_CHUNK_FRAMES = 65536        # 한 번에 섞는 프레임 수
+    MIX_MAX_GAIN = 2.0              # stem별 최대 게인
+
+    # 모바일 스트리밍 설정 (/stream, HLS + AAC)
+    STREAM_CACHE_DIR = OUTPUT_DIR / "streams"
+    STREAM_SEGMENT_SECONDS = 4.0    # 세그먼트 길이 (짧을수록 첫 재생이 빠름)
+    STREAM_BITRATE = '128k'         # AAC 비트레이트 (스테레오)
+
+    # 묶음 다운로드 설정 (/bundle, 선택한 stem을 ZIP 또는 다채널 WAV 하나로 바로 스트리밍)
+    BUNDLE_CHUNK_BYTES = 1024 * 1024    # 한 번에 읽어 보내는 크기 (메모리 사용량은 이 크기 정도로 일정)
+    BUNDLE_CRC_CACHE_SIZE = 256         # 이어받기 요청을 위해 기억하는 stem CRC32 수
+
+    # 파형 peak 설정 (stem 저장 시 확대 단계별 min/max 요약 생성)
+    PEAKS_DIR = OUTPUT_DIR / "peaks"
+    PEAK_LEVELS = [256, 1024, 4096, 16384, 65536]   # 픽셀당 샘플 수 (각 값은 이전 값의 배수)
+    PEAK_CHUNK_FRAMES = 256 * 4096                  # 한 번에 계산하는 프레임 수 (PEAK_LEVELS[0]의 배수)
+
+    # 실시간 분리 설정 (/live, PCM 조각을 받아 stem PCM을 돌려줌)
+    LIVE_WINDOW_SECONDS = 6.0       # 분리 창 길이 (초, 모델 최대 segment 이하, 지연 시간 = 창 길이 + 처리 시간)
+    LIVE_OVERLAP_SECONDS = 1.0      # 창끼리 겹쳐 crossfade하는 길이 (초)
+    LIVE_MAX_SESSIONS = 1           # 동시에 열 수 있는 세션 수
+    LIVE_IDLE_TIMEOUT = 60          # 요청이 없으면 세션을 닫는 시간 (초)
+    LIVE_MAX_CHUNK_BYTES = 4 * 1024 * 1024  # 요청 하나의 최대 PCM 크기
+
+    # 프론트엔드 정적 파일 (시작 시 해시 이름 + gzip/brotli 압축본 생성)
+    STATIC_DIR = Path(__file__).resolve().parent / "static"
+    ASSET_MAX_AGE = 365 * 24 * 3600     # 해시 이름 파일의 캐시 기간 (초)
+    FAVICON_MAX_AGE = 24 * 3600         # /favicon.ico 캐시 기간 (초)
+    ASSET_HASH_LENGTH = 12              # 파일명에 넣는 내용 해시 길이
+    ASSET_COMPRESS_MIN_BYTES = 512      # 이보다 작은 파일은 압축하지 않음
+
+    # 파일 업로드 설정
+    MAX_UPLOAD_BYTES = 1024 * 1024 * 1024   # 최대 업로드 크기 (1GB)
+    UPLOAD_CHUNK_SIZE = 1024 * 1024         # 디스크에 쓰는 단위 (1MB)
+
+    # 명령줄 일괄 처리 (cli.py, 디렉토리에서 찾을 오디오 파일 확장자)
+    BATCH_AUDIO_EXTENSIONS = ['.mp3', '.wav', '.flac', '.m4a', '.aac', '.ogg', '.opus', '.webm', '.mp4']
+
     # Flask 서버 설정
     HOST = '0.0.0.0'
     PORT = 8888
@@ -27,4 +155,5 @@ class Config:
         """필요한 디렉토리 생성"""
         cls.OUTPUT_DIR.mkdir(exist_ok=True)
         cls.TEMP_DIR.mkdir(exist_ok=True)
-        cls.LOG_DIR.mkdir(exist_ok=True)
\ No newline at end of file
+        cls.LOG_DIR.mkdir(exist_ok=True)
+        cls.CACHE_DIR.mkdir(exist_ok=True)
\ No newline at end of file
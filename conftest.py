@@ -0,0 +1,88 @@
+"""
+pytest 공용 설정
+
+모든 테스트는 임시 디렉토리의 output/temp/cache를 쓰고, 사전 학습 모델 대신
+loadtest.tiny_model()의 작은 HTDemucs로 실행한다 (모델 다운로드 없음).
+"""
+import shutil
+
+import pytest
+
+from config import Config
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which('ffmpeg') is None, reason='ffmpeg 필요')
+
+
+class SyntheticDownloader:
+    """합성 오디오 WAV를 내려받은 것처럼 만드는 가짜 다운로더 (다운로드 횟수 기록)"""
+
+    def __init__(self, sr: int = 44100, duration: float = 4.0):
+        self.sr = sr
+        self.duration = duration
+        self.downloads = 0
+
+    def fetch_info(self, url: str) -> dict:
+        return {'video_id': url, 'title': self.title(url), 'duration': self.duration,
+                'is_live': False, 'audio_streams': 1, 'filesize': None}
+
+    @staticmethod
+    def title(url: str) -> str:
+        return 'Song ' + url.rsplit('/', 1)[-1]
+
+    def download_audio(self, url: str, output_path: str = None, info: dict = None) -> tuple:
+        from benchmark import synthetic_audio
+        from utils import save_audio_wav
+
+        self.downloads += 1
+        path = f"{output_path or Config.TEMP_DIR}/source.wav"
+        save_audio_wav(synthetic_audio(self.duration, self.sr), self.sr, path)
+        return path, self.title(url)
+
+
+@pytest.fixture(autouse=True)
+def isolated_config(tmp_path, monkeypatch):
+    """Config의 디렉토리를 테스트마다 임시 디렉토리로 바꾸고 시간이 걸리는 기능은 끔"""
+    output_dir = tmp_path / "output"
+    cache_dir = tmp_path / "cache"
+    for name, value in {
+        'OUTPUT_DIR': output_dir,
+        'TEMP_DIR': tmp_path / "temp",
+        'LOG_DIR': tmp_path / "logs",
+        'CACHE_DIR': cache_dir,
+        'MIX_CACHE_DIR': output_dir / "mixes",
+        'STREAM_CACHE_DIR': output_dir / "streams",
+        'PEAKS_DIR': output_dir / "peaks",
+        'RESULT_INDEX': cache_dir / "results.db",
+        'THREAD_TUNE_CACHE': cache_dir / "threads.json",
+        'THREAD_AUTOTUNE': False,
+        'USE_GPU': False,
+    }.items():
+        monkeypatch.setattr(Config, name, value)
+    Config.init_directories()
+    return tmp_path
+
+
+@pytest.fixture(scope='session')
+def tiny_model():
+    """가중치 없는 작은 HTDemucs (세션 동안 공유)"""
+    from loadtest import tiny_model as build
+    return build()
+
+
+@pytest.fixture
+def separator(tiny_model):
+    """작은 모델을 쓰는 CPU 분리기"""
+    from separator import AudioSeparator
+    return AudioSeparator(model_name='tiny', output_dir=Config.OUTPUT_DIR, use_gpu=False, model=tiny_model)
+
+
+@pytest.fixture
+def downloader(separator):
+    return SyntheticDownloader(separator.model.samplerate)
+
+
+@pytest.fixture
+def client(downloader, separator):
+    """가짜 다운로더와 작은 모델로 만든 앱의 테스트 클라이언트"""
+    from app import create_app
+    return create_app(downloader=downloader, separator=separator).test_client()
@@ -1,12 +1,128 @@
 """
 YouTube 다운로드 모듈
 """
+import re
 from pathlib import Path
+from urllib.parse import urlparse, parse_qs
 from pytubefix import YouTube
+from pytubefix import exceptions as yt_exceptions
+from config import Config
 from logger import get_logger
 
 logger = get_logger('downloader')
 
+VIDEO_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{11}$')
+
+# 재생할 수 없는 영상의 pytubefix 예외 → 오류 코드 (위에서부터 확인)
+UNAVAILABLE_CODES = [
+    ((yt_exceptions.AgeRestrictedError, yt_exceptions.AgeCheckRequiredError,
+      yt_exceptions.AgeCheckRequiredAccountError), 'age_restricted'),
+    ((yt_exceptions.LiveStreamError, yt_exceptions.LiveStreamOffline), 'live_stream'),
+    ((yt_exceptions.MembersOnly,), 'members_only'),
+    ((yt_exceptions.VideoPrivate,), 'private'),
+    ((yt_exceptions.VideoRegionBlocked,), 'region_blocked'),
+    ((yt_exceptions.LoginRequired,), 'login_required'),
+    ((yt_exceptions.VideoUnavailable,), 'unavailable'),
+]
+
+
+class VideoRejectedError(Exception):
+    """처리할 수 없는 영상 (다운로드 전에 메타데이터로 판단)"""
+
+    def __init__(self, code: str, message: str):
+        """
+        Args:
+            code: 오류 코드 (예: 'too_long', 'live_stream', 'age_restricted')
+            message: 사용자에게 보여줄 메시지
+        """
+        super().__init__(message)
+        self.code = code
+
+
+def extract_video_id(url: str) -> str:
+    """
+    YouTube URL에서 영상 ID 추출 (같은 영상의 다른 URL 형태를 같은 키로 묶기 위해 사용)
+
+    watch?v=, youtu.be/, shorts/, embed/, live/ 형태를 지원한다.
+
+    Args:
+        url: YouTube URL
+
+    Returns:
+        11자리 영상 ID (알 수 없는 형태면 앞뒤 공백을 제거한 URL)
+    """
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or '').lower()
+    candidates = parse_qs(parsed.query).get('v', [])
+    parts = [part for part in parsed.path.split('/') if part]
+    if host.endswith('youtu.be') and parts:
+        candidates.append(parts[0])
+    elif len(parts) >= 2 and parts[0] in ('shorts', 'embed', 'live', 'v'):
+        candidates.append(parts[1])
+
+    for candidate in candidates:
+        if VIDEO_ID_PATTERN.match(candidate):
+            return candidate
+    return url.strip()
+
+
+def source_key(source: str, source_type: str) -> str:
+    """
+    같은 입력을 묶는 키 (이미 처리한 입력인지 인덱스에서 찾을 때 사용)
+
+    Args:
+        source: YouTube URL 또는 파일 경로
+        source_type: 'youtube', 'file' 또는 'upload'
+
+    Returns:
+        YouTube는 영상 ID, 파일은 경로 (업로드는 파일명만으로 같은 입력인지 알 수 없으므로 None)
+    """
+    if not source or source_type == 'upload':
+        return None
+    return extract_video_id(source) if source_type == 'youtube' else source
+
+
+def validate_video_info(info: dict) -> None:
+    """
+    메타데이터가 처리 한도 안에 있는지 확인 (fetch_info 결과 사용)
+
+    Args:
+        info: fetch_info 결과
+
+    Raises:
+        VideoRejectedError: 생방송, 오디오 스트림 없음, 길이/예상 크기 초과
+    """
+    if info.get('is_live'):
+        raise VideoRejectedError('live_stream', '생방송은 처리할 수 없습니다.')
+    if info.get('audio_streams') == 0:
+        raise VideoRejectedError('no_audio_stream', '오디오 스트림이 없는 영상입니다.')
+    validate_duration(info.get('duration'))
+
+    filesize = info.get('filesize')
+    if Config.MAX_DOWNLOAD_BYTES and filesize and filesize > Config.MAX_DOWNLOAD_BYTES:
+        raise VideoRejectedError(
+            'too_large',
+            f"오디오가 너무 큽니다 (예상 {filesize / 1024 / 1024:.0f}MB, "
+            f"최대 {Config.MAX_DOWNLOAD_BYTES / 1024 / 1024:.0f}MB)."
+        )
+
+
+def validate_duration(duration: float) -> None:
+    """
+    곡 길이가 처리 한도 안에 있는지 확인 (길이를 모르면 통과)
+
+    Args:
+        duration: 곡 길이 (초)
+
+    Raises:
+        VideoRejectedError: Config.MAX_MEDIA_DURATION 초과
+    """
+    if Config.MAX_MEDIA_DURATION and duration and duration > Config.MAX_MEDIA_DURATION:
+        raise VideoRejectedError(
+            'too_long',
+            f"곡이 너무 깁니다 ({duration / 60:.0f}분, 최대 {Config.MAX_MEDIA_DURATION / 60:.0f}분)."
+        )
+
 
 class YouTubeDownloader:
     """YouTube 비디오 다운로드 클래스"""
@@ -19,12 +135,68 @@ class YouTubeDownloader:
         self.output_path = Path(output_path)
         logger.info(f"다운로더 초기화: {self.output_path}")
 
-    def download_audio(self, url: str) -> tuple:
+    def fetch_info(self, url: str) -> dict:
+        """
+        다운로드 없이 영상 메타데이터 조회 (사전 검증과 작업 예상 시간 계산용)
+
+        플레이어 응답만 받으며 미디어는 한 바이트도 받지 않는다.
+        오디오 크기는 스트림 정보의 contentLength, 없으면 길이 × 비트레이트로 추정한다.
+
+        Args:
+            url: YouTube URL
+
+        Returns:
+            dict: {'video_id', 'title', 'duration'(초), 'is_live', 'audio_streams'(개수),
+                   'filesize'(다운로드할 오디오의 예상 bytes, 모르면 None),
+                   'stream'(다운로드할 오디오 스트림, download_audio에 넘기면 다시 조회하지 않음)}
+
+        Raises:
+            VideoRejectedError: 재생할 수 없는 영상 (연령 제한, 비공개, 지역 제한 등)
+            Exception: 조회 실패 시
+        """
+        try:
+            logger.info(f"YouTube 메타데이터 조회: {url}")
+            yt = YouTube(url)
+            duration = float(yt.length or 0)
+            details = yt.vid_info.get('videoDetails', {})
+            audio_streams = yt.streams.filter(only_audio=True)
+            audio_stream = audio_streams.first()
+
+            filesize = None
+            if audio_stream is not None:
+                try:
+                    filesize = audio_stream.filesize or None
+                except Exception as e:
+                    logger.debug(f"오디오 크기 조회 실패, 비트레이트로 추정: {e}")
+                if filesize is None and duration and audio_stream.bitrate:
+                    filesize = int(duration * audio_stream.bitrate / 8)
+
+            info = {
+                'video_id': yt.video_id,
+                'title': yt.title,
+                'duration': duration,
+                'is_live': bool(details.get('isLive')) or any(stream.is_live for stream in audio_streams),
+                'audio_streams': len(audio_streams),
+                'filesize': filesize,
+            }
+            logger.debug(f"메타데이터: {info}")
+            return {**info, 'stream': audio_stream}
+        except yt_exceptions.VideoUnavailable as e:
+            code = next(code for types, code in UNAVAILABLE_CODES if isinstance(e, types))
+            logger.warning(f"재생할 수 없는 영상 ({code}): {str(e)}")
+            raise VideoRejectedError(code, f"재생할 수 없는 영상입니다 ({code}): {str(e)}")
+        except Exception as e:
+            logger.error(f"메타데이터 조회 실패: {str(e)}", exc_info=True)
+            raise Exception(f"메타데이터 조회 실패: {str(e)}")
+
+    def download_audio(self, url: str, output_path: str = None, info: dict = None) -> tuple:
         """
         YouTube URL에서 오디오만 다운로드
 
         Args:
             url: YouTube URL
+            output_path: 저장 경로 (None이면 초기화 시 지정한 경로)
+            info: fetch_info 결과 (있으면 그 스트림을 받고 영상 정보를 다시 조회하지 않음)
 
         Returns:
             tuple: (다운로드된 파일 경로, 비디오 제목)
@@ -35,10 +207,12 @@ class YouTubeDownloader:
         """
         try:
             logger.info(f"YouTube에서 다운로드 중: {url}")
-            yt = YouTube(url)
-
-            # 오디오 스트림만 필터링
-            audio_stream = yt.streams.filter(only_audio=True).first()
+            if info is not None and info.get('stream') is not None:
+                audio_stream, title = info['stream'], info['title']
+            else:
+                yt = YouTube(url)
+                # 오디오 스트림만 필터링
+                audio_stream, title = yt.streams.filter(only_audio=True).first(), yt.title
 
             if not audio_stream:
                 logger.error("오디오 스트림을 찾을 수 없습니다")
@@ -47,13 +221,13 @@ class YouTubeDownloader:
             # 다운로드
             logger.debug(f"스트림 정보: {audio_stream}")
             temp_file = audio_stream.download(
-                output_path=str(self.output_path),
+                output_path=str(output_path or self.output_path),
                 filename="temp_audio.mp4"
             )
 
-            logger.info(f"다운로드 완료: {yt.title}")
+            logger.info(f"다운로드 완료: {title}")
             logger.debug(f"파일 경로: {temp_file}")
-            return temp_file, yt.title
+            return temp_file, title
 
         except Exception as e:
             logger.error(f"다운로드 실패: {str(e)}", exc_info=True)
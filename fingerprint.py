@@ -0,0 +1,95 @@
+"""
+오디오 지문 기반 중복 제거 모듈
+
+디코딩된 오디오에서 NumPy로 간단한 음향 지문(프레임당 32비트)을 계산하고,
+같은 곡의 다른 업로드(공식 영상, 가사 영상, 재업로드)에 대해 기존 분리 결과를 재사용한다.
+"""
+import numpy as np
+import torch
+
+from config import Config
+from logger import get_logger
+
+logger = get_logger('fingerprint')
+
+# 지문 계산 파라미터 (바꾸면 기존 인덱스와 호환되지 않음)
+FRAME_SECONDS = 0.37
+HOP_SECONDS = 0.05
+N_BANDS = 33                   # 32비트를 만들기 위한 대역 수
+MIN_FREQ, MAX_FREQ = 300, 2000
+BLOCK_FRAMES = 256             # 메모리 사용을 제한하기 위한 프레임 블록 크기
+
+
+def _band_edges(frame_size: int, sr: int) -> np.ndarray:
+    """로그 간격 주파수 대역 경계 (FFT bin 인덱스)"""
+    freqs = np.geomspace(MIN_FREQ, MAX_FREQ, N_BANDS + 1)
+    return np.round(freqs * frame_size / sr).astype(np.int64)
+
+
+def compute_fingerprint(wav: torch.Tensor, sr: int) -> np.ndarray:
+    """
+    오디오 지문 계산 (Haitsma-Kalker 방식의 대역 에너지 차분 비트)
+
+    프레임 길이를 초 단위로 정해 샘플레이트와 무관하게 같은 대역을 본다.
+
+    Args:
+        wav: 오디오 텐서 (channels, samples)
+        sr: 샘플레이트
+
+    Returns:
+        프레임당 uint32 하나로 이루어진 지문 배열
+    """
+    mono = wav.mean(dim=0).numpy()
+    frame_size = int(FRAME_SECONDS * sr)
+    hop_size = int(HOP_SECONDS * sr)
+
+    if len(mono) < frame_size + hop_size:
+        return np.zeros(0, dtype=np.uint32)
+
+    frames = np.lib.stride_tricks.sliding_window_view(mono, frame_size)[::hop_size]
+    window = np.hanning(frame_size).astype(np.float32)
+    edges = _band_edges(frame_size, sr)
+
+    # 프레임 블록 단위로 대역 에너지 계산
+    energies = np.empty((len(frames), N_BANDS), dtype=np.float32)
+    for start in range(0, len(frames), BLOCK_FRAMES):
+        block = frames[start:start + BLOCK_FRAMES] * window
+        power = np.abs(np.fft.rfft(block, axis=1)) ** 2
+        cumulative = np.concatenate(
+            (np.zeros((len(block), 1), dtype=power.dtype), np.cumsum(power, axis=1)), axis=1
+        )
+        energies[start:start + len(block)] = cumulative[:, edges[1:]] - cumulative[:, edges[:-1]]
+
+    # 인접 대역 차이의 시간 방향 차분 부호 → 비트
+    band_diff = energies[:, :-1] - energies[:, 1:]
+    bits = (band_diff[1:] - band_diff[:-1]) > 0
+    weights = (1 << np.arange(31, -1, -1, dtype=np.uint64))
+    return (bits.astype(np.uint64) * weights).sum(axis=1).astype(np.uint32)
+
+
+def bit_error_rate(a: np.ndarray, b: np.ndarray, max_offset: int) -> float:
+    """
+    두 지문의 최소 비트 오류율 (앞부분 길이 차이를 고려해 프레임 오프셋 탐색)
+
+    Args:
+        a: 지문 배열
+        b: 지문 배열
+        max_offset: 탐색할 최대 프레임 오프셋
+
+    Returns:
+        0~1 사이의 비트 오류율 (비교할 수 없으면 1.0)
+    """
+    best = 1.0
+    for offset in range(-max_offset, max_offset + 1):
+        if offset >= 0:
+            x, y = a[offset:], b
+        else:
+            x, y = a, b[-offset:]
+        n = min(len(x), len(y))
+        if n < Config.FINGERPRINT_MIN_FRAMES:
+            continue
+        diff = np.bitwise_xor(x[:n], y[:n])
+        errors = np.unpackbits(diff.view(np.uint8)).sum()
+        best = min(best, errors / (n * 32))
+    return best
+
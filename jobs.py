@@ -0,0 +1,298 @@
+"""
+작업(Job) 상태 관리 모듈
+
+분리 결과 파일은 응답 이후에도 백그라운드에서 저장되므로,
+각 stem이 디스크에 완전히 기록되었는지를 작업 단위로 추적한다.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+
+from config import Config
+from memprofile import profiler
+from logger import get_logger
+
+logger = get_logger('jobs')
+
+
+class Job:
+    """분리 작업 하나의 상태"""
+
+    def __init__(self, job_id: str, title: str = None):
+        """
+        Args:
+            job_id: 작업 ID
+            title: 곡 제목
+        """
+        self.id = job_id
+        self.title = title
+        self.status = 'processing'   # processing → writing → completed / failed
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.result = {}
+        self.timings = {}            # 단계별 소요 시간 (초)
+        self.memory = {}             # 단계별 메모리 최대값 (Config.MEMORY_PROFILING일 때)
+        self._pending = set()
+        self._ready = []
+        self._failed = {}
+        self._callbacks = []
+        self._result_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def add_done_callback(self, callback) -> None:
+        """
+        작업이 끝나면 (모든 stem 저장 완료 또는 실패) 호출할 함수 등록
+
+        Args:
+            callback: job을 인자로 받는 함수
+        """
+        with self._lock:
+            done = self.finished_at is not None
+            if not done:
+                self._callbacks.append(callback)
+        if done:
+            callback(self)
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        처리 단계 소요 시간 (Config.MEMORY_PROFILING이면 메모리 최대값도) 기록
+
+        사용법:
+            with job.stage('download'):
+                ...
+        """
+        start = time.perf_counter()
+        memory = None
+        try:
+            with (profiler.stage(name) if Config.MEMORY_PROFILING else nullcontext()) as memory:
+                yield
+        finally:
+            elapsed = round(time.perf_counter() - start, 3)
+            with self._lock:
+                self.timings[name] = elapsed
+                if memory is not None:
+                    self.memory[name] = memory
+
+    def expect_stems(self, names: list) -> None:
+        """
+        백그라운드로 저장될 stem 목록 등록
+
+        Args:
+            names: stem 이름 목록
+        """
+        with self._lock:
+            self._pending.update(names)
+            self.status = 'writing'
+
+    def mark_stem_ready(self, name: str) -> None:
+        """stem 파일이 디스크에 완전히 기록됨"""
+        with self._lock:
+            self._pending.discard(name)
+            self._ready.append(name)
+            callbacks = self._update_status()
+        self._run_callbacks(callbacks)
+        logger.debug(f"[{self.id}] stem 저장 완료: {name}")
+
+    def mark_stem_failed(self, name: str, error: str) -> None:
+        """stem 파일 저장 실패"""
+        with self._lock:
+            self._pending.discard(name)
+            self._failed[name] = error
+            callbacks = self._update_status()
+        self._run_callbacks(callbacks)
+        logger.error(f"[{self.id}] stem 저장 실패: {name} ({error})")
+
+    def complete(self, result: dict, ready: list = None) -> None:
+        """
+        분리 결과 등록
+
+        Args:
+            result: 분리 결과
+            ready: 이미 디스크에 있는 stem 이름 목록 (재사용 결과 등)
+        """
+        with self._lock:
+            self.result = result
+            self.title = result.get('title', self.title)
+            for name in ready or []:
+                if name not in self._ready:
+                    self._ready.append(name)
+            callbacks = self._update_status()
+        self._result_event.set()
+        self._run_callbacks(callbacks)
+
+    def fail(self, error: str) -> None:
+        """작업 실패"""
+        with self._lock:
+            self.status = 'failed'
+            self.error = error
+            self.finished_at = time.time()
+            callbacks, self._callbacks = self._callbacks, []
+        self._result_event.set()
+        self._run_callbacks(callbacks)
+
+    def wait_result(self, timeout: float = None) -> bool:
+        """
+        분리 결과가 나오거나 실패할 때까지 대기 (stem 저장 완료까지는 기다리지 않음)
+
+        Args:
+            timeout: 최대 대기 시간 (초, None이면 무제한)
+
+        Returns:
+            bool: 시간 안에 결과가 나왔으면 True
+        """
+        return self._result_event.wait(timeout)
+
+    def _update_status(self) -> list:
+        """
+        남은 저장 작업이 없으면 완료 처리 (lock 안에서 호출)
+
+        Returns:
+            list: 완료 시 호출할 콜백 목록 (lock 밖에서 호출해야 함)
+        """
+        if self._pending or not self.result or self.finished_at is not None:
+            return []
+        self.status = 'failed' if self._failed else 'completed'
+        if self._failed:
+            self.error = f"stem 저장 실패: {', '.join(self._failed)}"
+        self.finished_at = time.time()
+        callbacks, self._callbacks = self._callbacks, []
+        return callbacks
+
+    def _run_callbacks(self, callbacks: list) -> None:
+        """완료 콜백 실행 (콜백 오류는 작업 상태에 영향 없음)"""
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error(f"[{self.id}] 완료 콜백 오류: {e}", exc_info=True)
+
+    @property
+    def ready(self) -> list:
+        """디스크에 완전히 기록된 stem 이름 목록 (기록된 순서)"""
+        with self._lock:
+            return list(self._ready)
+
+    def to_dict(self) -> dict:
+        """API 응답용 dict"""
+        with self._lock:
+            return {
+                **self.result,
+                'job_id': self.id,
+                'title': self.title,
+                'status': self.status,
+                'ready': list(self._ready),
+                'pending': sorted(self._pending),
+                'error': self.error,
+                'timings': dict(self.timings),
+                'memory': dict(self.memory),
+            }
+
+
+class JobStore:
+    """
+    메모리 내 작업 저장소 (최근 작업만 유지)
+
+    결과 인덱스가 주어지면 작업 시작/종료를 기록하므로, 메모리에서 밀려났거나
+    서버가 재시작된 뒤에도 describe()로 조회할 수 있다.
+    """
+
+    def __init__(self, max_jobs: int = 500, index=None):
+        """
+        Args:
+            max_jobs: 유지할 최대 작업 수
+            index: 작업을 기록할 result_index.ResultIndex (None이면 메모리에만 유지)
+        """
+        self.max_jobs = max_jobs
+        self.index = index
+        self._jobs = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def create(self, title: str = None, source: str = None, source_type: str = None) -> Job:
+        """
+        새 작업 생성
+
+        Args:
+            title: 곡 제목 (다운로드 전에는 None)
+            source: YouTube URL 또는 업로드 파일명
+            source_type: 'youtube' 또는 'upload'
+        """
+        job = Job(uuid.uuid4().hex, title)
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+        self._register(job, title, source, source_type)
+        return job
+
+    def create_or_attach(self, key: tuple, title: str = None, source: str = None,
+                         source_type: str = None) -> tuple:
+        """
+        같은 키의 작업이 진행 중이면 그 작업을, 없으면 새 작업을 반환 (single-flight)
+
+        키는 작업이 끝나면 (모든 stem 저장 완료 또는 실패) 해제된다.
+
+        Args:
+            key: 작업 키 (예: (영상 ID, 모델, 프리셋))
+            title: 곡 제목
+            source: YouTube URL 또는 업로드 파일명
+            source_type: 'youtube' 또는 'upload'
+
+        Returns:
+            tuple: (작업, 새로 만들었으면 True)
+        """
+        with self._lock:
+            job = self._inflight.get(key)
+            if job is not None:
+                logger.info(f"진행 중인 작업에 합류: {job.id} {key}")
+                return job, False
+            job = Job(uuid.uuid4().hex, title)
+            self._inflight[key] = job
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+        def release(finished_job):
+            with self._lock:
+                if self._inflight.get(key) is finished_job:
+                    del self._inflight[key]
+
+        job.add_done_callback(release)
+        self._register(job, title, source, source_type)
+        return job, True
+
+    def inflight(self, key: tuple) -> Job:
+        """키에 해당하는 진행 중인 작업 (없으면 None)"""
+        with self._lock:
+            return self._inflight.get(key)
+
+    def _register(self, job: Job, title: str, source: str, source_type: str) -> None:
+        """새 작업을 인덱스에 기록"""
+        if self.index is not None:
+            self.index.add_job(job.id, title, source, source_type)
+            job.add_done_callback(self.index.finish_job)
+        logger.debug(f"작업 생성: {job.id}")
+
+    def get(self, job_id: str) -> Job:
+        """작업 조회 (없으면 None)"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def describe(self, job_id: str) -> dict:
+        """
+        작업 상태 dict (메모리에 없으면 인덱스에서 조회)
+
+        Returns:
+            dict: API 응답용 작업 상태 (없으면 None)
+        """
+        job = self.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        if self.index is not None:
+            return self.index.get_job(job_id)
+        return None
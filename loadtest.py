@@ -0,0 +1,612 @@
+"""
+부하 테스트 (실제 YouTube와 Demucs 가중치 없이 서비스 전체를 실행)
+
+로컬 HTTP 서버가 합성 오디오를 가짜 YouTube 영상으로 제공하고, 다운로더는 지연 시간/대역폭을 흉내 내며
+이 서버에서 받는다. Flask 앱은 실제 라우트/수락 제어/분리/저장 과정을 그대로 실행한다.
+--tiny-model이면 가중치를 받지 않는 작은 HTDemucs를 사용하므로 노트북에서도 몇 분 안에 끝난다.
+
+요청 종류 (--mix로 비율 지정):
+    new: 처음 보는 영상 /separate
+    repeat: 몇 개의 인기 영상(--hot)을 반복 요청 (진행 중 작업 합류, 지문 중복 제거)
+    upload: 합성 WAV /upload
+    invalid: 길이 초과 또는 비공개 영상 (422)
+
+사용법:
+    python loadtest.py --tiny-model --requests 40 --concurrency 4 --mix new=6,repeat=3,upload=1
+    python loadtest.py --rate 0.2 --durations 180,240 --download-latency 2 --bandwidth 2 --output load.md
+    python loadtest.py --tiny-model --set MAX_RUNNING_JOBS=2 --set INFERENCE_BATCH_MAX=2 --summary load.json
+"""
+import argparse
+import ast
+import io
+import json
+import logging
+import random
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+import numpy as np
+import torch
+from scipy.io import wavfile
+from werkzeug.serving import make_server
+
+from config import Config
+from downloader import YouTubeDownloader, VideoRejectedError, extract_video_id
+from separator import AudioSeparator
+from memprofile import MB, current_rss
+from thread_tuner import tune_threads
+from benchmark import format_table, write_report
+from logger import get_logger
+
+logger = get_logger('loadtest')
+
+REQUEST_KINDS = ('new', 'repeat', 'upload', 'invalid')
+
+
+def source_audio(duration: float, seed: int, sr: int = 44100) -> np.ndarray:
+    """
+    곡마다 다른 합성 오디오 (무작위 화음을 0.2~0.6초마다 바꿈, 지문이 서로 겹치지 않도록)
+
+    Args:
+        duration: 길이 (초)
+        seed: 난수 시드 (같은 시드는 같은 오디오)
+        sr: 샘플레이트
+
+    Returns:
+        (frames, 2) int16
+    """
+    rng = np.random.default_rng(seed)
+    frames = int(duration * sr)
+    bounds = np.cumsum(rng.uniform(0.2, 0.6, int(duration / 0.2) + 1) * sr).astype(np.int64)
+    note = np.searchsorted(bounds, np.arange(frames), side='right')
+    freqs = rng.uniform(80, 1500, (len(bounds) + 1, 3))[note]
+    phases = np.cumsum(2 * np.pi * freqs / sr, axis=0)
+    mono = np.sin(phases).mean(axis=1) * rng.uniform(0.3, 1.0, len(bounds) + 1)[note]
+    stereo = np.stack([mono, np.roll(mono, 200)], axis=1)
+    return (stereo * 0.5 * 32767).astype(np.int16)
+
+
+def tiny_model():
+    """가중치 없이 만드는 작은 HTDemucs (학습되지 않았으므로 분리 품질은 의미 없음, 처리 과정 부하용)"""
+    from demucs.apply import BagOfModels
+    from demucs.htdemucs import HTDemucs
+
+    torch.manual_seed(0)
+    model = HTDemucs(sources=['drums', 'bass', 'other', 'vocals'], channels=8, t_layers=1, segment=4)
+    return BagOfModels([model.eval()])
+
+
+class SyntheticCatalog:
+    """가짜 영상 목록 (영상 ID → 제목, 길이, 시드, 재생 불가 코드)"""
+
+    def __init__(self, durations: list, seed: int = 0):
+        """
+        Args:
+            durations: 곡 길이 후보 (초, 새 영상마다 무작위로 고름)
+            seed: 난수 시드
+        """
+        self.durations = durations
+        self._rng = random.Random(seed)
+        self._videos = {}
+        self._lock = threading.Lock()
+
+    def add(self, duration: float = None, unavailable: str = None) -> str:
+        """
+        영상 추가
+
+        Args:
+            duration: 곡 길이 (None이면 durations 중 무작위)
+            unavailable: 재생 불가 오류 코드 (예: 'private')
+
+        Returns:
+            11자리 영상 ID
+        """
+        with self._lock:
+            video_id = f"lt{len(self._videos):09d}"
+            self._videos[video_id] = {
+                'title': f"Load test {len(self._videos)}",
+                'duration': float(duration or self._rng.choice(self.durations)),
+                'seed': len(self._videos),
+                'unavailable': unavailable,
+            }
+            return video_id
+
+    def get(self, video_id: str) -> dict:
+        """영상 정보 (없으면 None)"""
+        with self._lock:
+            return self._videos.get(video_id)
+
+
+class _SourceHandler(BaseHTTPRequestHandler):
+    """GET /info/<id> (JSON 메타데이터), GET /audio/<id> (WAV)"""
+
+    def do_GET(self):
+        source = self.server.source
+        parts = [part for part in self.path.split('/') if part]
+        video = source.catalog.get(parts[1]) if len(parts) == 2 else None
+        if video is None or parts[0] not in ('info', 'audio'):
+            self.send_error(404)
+            return
+
+        if parts[0] == 'info':
+            body = json.dumps(video).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        path = source.audio_file(parts[1], video)
+        self.send_response(200)
+        self.send_header('Content-Type', 'audio/wav')
+        self.send_header('Content-Length', str(path.stat().st_size))
+        self.end_headers()
+        with open(path, 'rb') as f:
+            shutil.copyfileobj(f, self.wfile, Config.UPLOAD_CHUNK_SIZE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeSourceServer:
+    """합성 오디오를 영상처럼 제공하는 로컬 HTTP 서버 (WAV는 처음 요청될 때 디스크에 생성)"""
+
+    def __init__(self, catalog: SyntheticCatalog, cache_dir: Path, sr: int = 44100):
+        """
+        Args:
+            catalog: 가짜 영상 목록
+            cache_dir: 생성한 WAV를 보관할 디렉토리
+            sr: 샘플레이트
+        """
+        self.catalog = catalog
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.sr = sr
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def audio_file(self, video_id: str, video: dict) -> Path:
+        """영상의 WAV 파일 (없으면 생성)"""
+        with self._lock:
+            lock = self._locks.setdefault(video_id, threading.Lock())
+        path = self.cache_dir / f"{video_id}.wav"
+        with lock:
+            if not path.exists():
+                tmp = path.with_suffix('.tmp')
+                wavfile.write(tmp, self.sr, source_audio(video['duration'], video['seed'], self.sr))
+                tmp.replace(path)
+        return path
+
+    def start(self) -> str:
+        """서버 시작 후 기본 URL 반환"""
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _SourceHandler)
+        self._server.daemon_threads = True
+        self._server.source = self
+        threading.Thread(target=self._server.serve_forever, name='fake-source', daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+class FakeDownloader(YouTubeDownloader):
+    """가짜 소스 서버에서 받는 다운로더 (지연 시간, 대역폭 제한, 오류 주입)"""
+
+    def __init__(self, output_path: str, source_url: str, latency: float = 0.5, bandwidth: float = None,
+                 failure_rate: float = 0.0, seed: int = 0):
+        """
+        Args:
+            output_path: 다운로드 저장 경로
+            source_url: 가짜 소스 서버 URL
+            latency: 메타데이터 조회/다운로드 시작 전 지연 (초, 평균, 지수 분포)
+            bandwidth: 다운로드 속도 (MB/s, None이면 제한 없음)
+            failure_rate: 다운로드가 실패할 확률
+            seed: 난수 시드
+        """
+        super().__init__(output_path)
+        self.source_url = source_url
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _delay(self) -> float:
+        with self._lock:
+            return self._rng.expovariate(1 / self.latency) if self.latency > 0 else 0.0
+
+    def _fails(self) -> bool:
+        with self._lock:
+            return self._rng.random() < self.failure_rate
+
+    def _video(self, video_id: str) -> dict:
+        """소스 서버의 영상 정보"""
+        try:
+            with urlopen(f"{self.source_url}/info/{video_id}", timeout=30) as response:
+                return json.load(response)
+        except HTTPError as e:
+            raise Exception(f"영상 정보 조회 실패: {video_id} ({e.code})")
+
+    def fetch_info(self, url: str) -> dict:
+        time.sleep(self._delay())
+        video_id = extract_video_id(url)
+        video = self._video(video_id)
+        if video['unavailable']:
+            raise VideoRejectedError(video['unavailable'], f"재생할 수 없는 영상입니다 ({video['unavailable']})")
+        return {
+            'video_id': video_id,
+            'title': video['title'],
+            'duration': video['duration'],
+            'is_live': False,
+            'audio_streams': 1,
+            'filesize': int(video['duration'] * 128000 / 8),
+        }
+
+    def download_audio(self, url: str, output_path: str = None, info: dict = None) -> tuple:
+        time.sleep(self._delay())
+        video_id = extract_video_id(url)
+        if self._fails():
+            raise Exception(f"다운로드 실패: {video_id} (주입된 오류)")
+        # fetch_info 결과가 있으면 영상 정보를 다시 조회하지 않음 (YouTubeDownloader와 같은 흐름)
+        video = info if info is not None else self._video(video_id)
+
+        path = Path(output_path or self.output_path) / f"{video_id}.wav"
+        chunk_size = 256 * 1024
+        start = time.perf_counter()
+        received = 0
+        with urlopen(f"{self.source_url}/audio/{video_id}", timeout=60) as response, open(path, 'wb') as f:
+            while True:
+                chunk = response.read(chunk_size)
+                if not chunk:
+                    break
+                f.write(chunk)
+                received += len(chunk)
+                if self.bandwidth:
+                    ahead = received / (self.bandwidth * MB) - (time.perf_counter() - start)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        return str(path), video['title']
+
+
+class ResourceSampler:
+    """부하 테스트 동안의 RSS, CPU 사용량, 스레드 수 측정"""
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self.rss = []
+        self.threads = 0
+
+    def __enter__(self):
+        self._cpu_start = time.process_time()
+        self._wall_start = time.perf_counter()
+        self._thread = threading.Thread(target=self._loop, name='load-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.cpu_seconds = time.process_time() - self._cpu_start
+        self.wall_seconds = time.perf_counter() - self._wall_start
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.rss.append(current_rss())
+            self.threads = max(self.threads, threading.active_count())
+
+    def stats(self) -> dict:
+        rss = np.array(self.rss or [current_rss()]) / MB
+        return {
+            'rss_mean_mb': round(float(rss.mean()), 1),
+            'rss_peak_mb': round(float(rss.max()), 1),
+            'cpu_seconds': round(self.cpu_seconds, 1),
+            'cpu_cores_used': round(self.cpu_seconds / self.wall_seconds, 2),
+            'threads_peak': self.threads,
+        }
+
+
+class LoadClient:
+    """요청 종류별 HTTP 요청을 만들어 보내고 결과를 기록"""
+
+    def __init__(self, base_url: str, catalog: SyntheticCatalog, preset: str, hot: int, timeout: float,
+                 clients: int):
+        """
+        Args:
+            base_url: 테스트할 앱 URL
+            catalog: 가짜 영상 목록
+            preset: 분리 프리셋
+            hot: repeat 요청이 고르는 인기 영상 수
+            timeout: 요청당 최대 대기 시간 (초)
+            clients: 흉내 낼 사용자 수 (요청마다 X-Forwarded-For로 번갈아 보냄, 클라이언트별 한도에 적용됨)
+        """
+        self.base_url = base_url
+        self.catalog = catalog
+        self.preset = preset
+        self.timeout = timeout
+        self.clients = max(clients, 1)
+        self.hot = [catalog.add() for _ in range(max(hot, 1))]
+        self._rng = random.Random(1)
+        self._lock = threading.Lock()
+        self._invalid = 0
+
+    def _request(self, kind: str, index: int) -> tuple:
+        """(Request, 곡 길이)"""
+        if kind in ('new', 'repeat', 'invalid'):
+            if kind == 'new':
+                video_id = self.catalog.add()
+            elif kind == 'repeat':
+                with self._lock:
+                    video_id = self._rng.choice(self.hot)
+            else:
+                with self._lock:
+                    self._invalid += 1
+                    too_long = self._invalid % 2
+                if too_long and Config.MAX_MEDIA_DURATION:
+                    video_id = self.catalog.add(duration=Config.MAX_MEDIA_DURATION + 60)
+                else:
+                    video_id = self.catalog.add(unavailable='private')
+            body = json.dumps({'url': f"https://www.youtube.com/watch?v={video_id}", 'preset': self.preset})
+            request = Request(f"{self.base_url}/separate", data=body.encode('utf-8'), method='POST',
+                              headers={'Content-Type': 'application/json'})
+            return request, self.catalog.get(video_id)['duration']
+
+        # upload: 요청마다 새 곡 (영상 목록에는 추가만 하고 소스 서버를 거치지 않음)
+        video_id = self.catalog.add()
+        video = self.catalog.get(video_id)
+        buffer = io.BytesIO()
+        wavfile.write(buffer, 44100, source_audio(video['duration'], video['seed']))
+        request = Request(f"{self.base_url}/upload?filename={video_id}.wav&preset={self.preset}",
+                          data=buffer.getvalue(), method='POST',
+                          headers={'Content-Type': 'application/octet-stream'})
+        return request, video['duration']
+
+    def send(self, kind: str, index: int) -> dict:
+        """
+        요청 하나 보내기
+
+        Returns:
+            dict: {'kind', 'status'(HTTP 상태, 연결 실패는 0), 'outcome', 'latency', 'duration'}
+        """
+        request, duration = self._request(kind, index)
+        request.add_header('X-Forwarded-For', f"10.0.{index % self.clients // 256}.{index % self.clients % 256}")
+        start = time.perf_counter()
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                status, body = response.status, json.load(response)
+        except HTTPError as e:
+            status, body = e.code, {}
+        except (URLError, OSError) as e:
+            logger.warning(f"요청 실패: {kind} ({e})")
+            status, body = 0, {}
+        latency = time.perf_counter() - start
+
+        if status == 200:
+            outcome = ('deduplicated' if body.get('deduplicated_from')
+                       else 'coalesced' if body.get('coalesced') else 'completed')
+        else:
+            outcome = {202: 'pending', 422: 'rejected', 429: 'throttled'}.get(status, 'error')
+        return {'kind': kind, 'status': status, 'outcome': outcome, 'latency': latency, 'duration': duration}
+
+
+def parse_mix(text: str) -> dict:
+    """'new=6,repeat=3' → {'new': 6.0, 'repeat': 3.0}"""
+    mix = {}
+    for item in text.split(','):
+        kind, _, weight = item.partition('=')
+        kind = kind.strip()
+        if kind not in REQUEST_KINDS:
+            raise ValueError(f"알 수 없는 요청 종류입니다: {kind} ({', '.join(REQUEST_KINDS)})")
+        mix[kind] = float(weight or 1)
+    return mix
+
+
+def apply_overrides(items: list) -> dict:
+    """--set KEY=VALUE 목록을 Config에 적용"""
+    overrides = {}
+    for item in items:
+        key, _, value = item.partition('=')
+        if not hasattr(Config, key):
+            raise ValueError(f"알 수 없는 설정입니다: {key}")
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            pass
+        setattr(Config, key, value)
+        overrides[key] = value
+    return overrides
+
+
+def use_workdir(root: Path) -> None:
+    """출력/임시/캐시/로그 디렉토리를 부하 테스트 전용 디렉토리로 변경"""
+    Config.OUTPUT_DIR = root / 'output'
+    Config.TEMP_DIR = root / 'temp'
+    Config.LOG_DIR = root / 'logs'
+    Config.CACHE_DIR = root / 'cache'
+    Config.MIX_CACHE_DIR = Config.OUTPUT_DIR / 'mixes'
+    Config.STREAM_CACHE_DIR = Config.OUTPUT_DIR / 'streams'
+    Config.PEAKS_DIR = Config.OUTPUT_DIR / 'peaks'
+    Config.RESULT_INDEX = Config.CACHE_DIR / 'results.db'
+
+
+def percentiles(values: list) -> list:
+    """[p50, p95, p99, 최대] 문자열"""
+    if not values:
+        return ['-'] * 4
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return [f"{p50:.2f}", f"{p95:.2f}", f"{p99:.2f}", f"{max(values):.2f}"]
+
+
+def run_load(args, client: LoadClient) -> list:
+    """요청 계획을 만들어 닫힌 루프(--concurrency) 또는 열린 루프(--rate)로 실행"""
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    plan = rng.choices(list(mix), weights=list(mix.values()), k=args.requests)
+
+    if not args.rate:
+        with ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix='load') as pool:
+            return list(pool.map(client.send, plan, range(len(plan))))
+
+    # 열린 루프: 푸아송 도착, 응답을 기다리지 않고 다음 요청을 보냄
+    futures = []
+    with ThreadPoolExecutor(max_workers=len(plan), thread_name_prefix='load') as pool:
+        start = time.perf_counter()
+        arrival = 0.0
+        for index, kind in enumerate(plan):
+            arrival += rng.expovariate(args.rate)
+            time.sleep(max(0.0, start + arrival - time.perf_counter()))
+            futures.append(pool.submit(client.send, kind, index))
+    return [future.result() for future in futures]
+
+
+def report(args, records: list, resources: dict, metrics: dict, overrides: dict) -> dict:
+    """결과 표 출력/저장 후 요약 dict 반환"""
+    elapsed = resources['wall_seconds']
+    ok = [record for record in records if record['status'] == 200]
+    errors = [record for record in records if record['outcome'] == 'error']
+    throttled = [record for record in records if record['outcome'] == 'throttled']
+
+    overall = format_table(
+        ['요청 수', '전체 시간(초)', '처리량(요청/초)', '처리한 곡 길이(초/초)', '오류율', '429 비율'],
+        [[len(records), f"{elapsed:.1f}", f"{len(ok) / elapsed:.3f}",
+          f"{sum(record['duration'] for record in ok) / elapsed:.2f}",
+          f"{len(errors) / len(records):.1%}", f"{len(throttled) / len(records):.1%}"]]
+    )
+
+    rows = []
+    kinds = {}
+    for kind in REQUEST_KINDS + ('all',):
+        selected = [record for record in records if kind in ('all', record['kind'])]
+        if not selected:
+            continue
+        outcomes = {}
+        for record in selected:
+            outcomes[record['outcome']] = outcomes.get(record['outcome'], 0) + 1
+        latencies = [record['latency'] for record in selected if record['status'] == 200]
+        rows.append([kind, len(selected), ', '.join(f"{name} {count}" for name, count in sorted(outcomes.items())),
+                     *percentiles(latencies)])
+        kinds[kind] = {'requests': len(selected), 'outcomes': outcomes,
+                       'latency': dict(zip(['p50', 'p95', 'p99', 'max'], percentiles(latencies)))}
+    by_kind = format_table(['종류', '요청 수', '결과', 'p50(초)', 'p95(초)', 'p99(초)', '최대(초)'], rows)
+
+    usage = format_table(
+        ['평균 RSS(MB)', '최대 RSS(MB)', 'CPU 시간(초)', '평균 사용 코어', '최대 스레드 수'],
+        [[resources['rss_mean_mb'], resources['rss_peak_mb'], resources['cpu_seconds'],
+          resources['cpu_cores_used'], resources['threads_peak']]]
+    )
+    write_report('\n\n'.join([overall, by_kind, usage]), args.output)
+
+    return {
+        'args': {key: value for key, value in vars(args).items() if key != 'set'},
+        'overrides': overrides,
+        'elapsed': round(elapsed, 3),
+        'requests': len(records),
+        'throughput_rps': round(len(ok) / elapsed, 4),
+        'error_rate': round(len(errors) / len(records), 4),
+        'throttled_rate': round(len(throttled) / len(records), 4),
+        'kinds': kinds,
+        'resources': resources,
+        'server_metrics': metrics,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='가짜 YouTube 소스로 서비스 전체 부하 테스트')
+    parser.add_argument('--requests', type=int, default=20, help='보낼 요청 수')
+    parser.add_argument('--concurrency', type=int, default=4, help='동시 클라이언트 수 (닫힌 루프)')
+    parser.add_argument('--clients', type=int, help='흉내 낼 사용자(IP) 수 (없으면 --concurrency, 1이면 한 사용자)')
+    parser.add_argument('--rate', type=float, help='초당 도착 요청 수 (주면 열린 루프, 푸아송 도착)')
+    parser.add_argument('--mix', default='new=6,repeat=3,upload=1',
+                        help=f"요청 종류별 비율 ({', '.join(REQUEST_KINDS)})")
+    parser.add_argument('--hot', type=int, default=3, help='repeat 요청이 고르는 인기 영상 수')
+    parser.add_argument('--durations', default='30,60,120', help='곡 길이 후보 (초, 쉼표 구분)')
+    parser.add_argument('--preset', default='fast', help='분리 프리셋')
+    parser.add_argument('--download-latency', type=float, default=0.5, help='메타데이터/다운로드 지연 (초, 평균)')
+    parser.add_argument('--bandwidth', type=float, help='다운로드 속도 (MB/s, 없으면 제한 없음)')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='다운로드 실패 확률')
+    parser.add_argument('--tiny-model', action='store_true', help='가중치 없는 작은 모델 사용')
+    parser.add_argument('--model', default=Config.DEMUCS_MODEL, help='Demucs 모델 이름 (--tiny-model이 없을 때)')
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                        help='Config 값 변경 (예: MAX_RUNNING_JOBS=2, 여러 번 지정 가능)')
+    parser.add_argument('--timeout', type=float, default=1800, help='요청당 최대 대기 시간 (초)')
+    parser.add_argument('--workdir', help='출력/임시/캐시 디렉토리 (없으면 임시 디렉토리를 만들고 끝나면 삭제)')
+    parser.add_argument('--log-level', default='WARNING', help='앱 로그 콘솔 출력 수준')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드 (같은 시드는 같은 요청 순서)')
+    parser.add_argument('--output', help='결과 표를 저장할 Markdown 파일')
+    parser.add_argument('--summary', help='결과 요약을 저장할 JSON 파일')
+    args = parser.parse_args()
+
+    # 요청마다 다른 사용자처럼 보내므로 X-Forwarded-For를 믿음 (--set으로 바꿀 수 있음)
+    Config.DEBUG = False
+    Config.TRUST_FORWARDED_FOR = True
+    try:
+        parse_mix(args.mix)
+        overrides = apply_overrides(args.set)
+    except ValueError as e:
+        parser.error(str(e))
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix='loadtest-'))
+    use_workdir(workdir)
+
+    from app import create_app
+
+    catalog = SyntheticCatalog([float(value) for value in args.durations.split(',')], args.seed)
+    source = FakeSourceServer(catalog, workdir / 'source')
+    server = None
+    try:
+        source_url = source.start()
+        Config.init_directories()
+        downloader = FakeDownloader(Config.TEMP_DIR, source_url, args.download_latency, args.bandwidth,
+                                    args.failure_rate, args.seed)
+        if args.tiny_model:
+            separator = AudioSeparator(model_name='tiny', output_dir=Config.OUTPUT_DIR, use_gpu=Config.USE_GPU,
+                                       model=tiny_model())
+        else:
+            tune_threads(args.model)
+            separator = AudioSeparator(model_name=args.model, output_dir=Config.OUTPUT_DIR, use_gpu=Config.USE_GPU)
+        app = create_app(downloader=downloader, separator=separator)
+
+        # 앱 로그는 파일에 남기고 콘솔에는 --log-level 이상만
+        for handler in logging.getLogger('youtube-separator').handlers:
+            if type(handler) is logging.StreamHandler:
+                handler.setLevel(args.log_level.upper())
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, name='load-app', daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+        print(f"부하 테스트 시작: {base_url}, 요청 {args.requests}개 ({args.mix}), 작업 디렉토리 {workdir}")
+
+        client = LoadClient(base_url, catalog, args.preset, args.hot, args.timeout, args.clients or args.concurrency)
+        with ResourceSampler() as sampler:
+            records = run_load(args, client)
+        resources = {**sampler.stats(), 'wall_seconds': sampler.wall_seconds}
+
+        with urlopen(f"{base_url}/metrics?format=json", timeout=30) as response:
+            metrics = json.load(response)
+        summary = report(args, records, resources, metrics, overrides)
+        if args.summary:
+            Path(args.summary).write_text(json.dumps(summary, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+            print(f"요약 저장: {args.summary}")
+    finally:
+        if server is not None:
+            server.shutdown()
+        source.stop()
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
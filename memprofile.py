@@ -0,0 +1,181 @@
+"""
+처리 단계별 메모리 측정 모듈
+
+Config.MEMORY_PROFILING이 켜져 있으면 job.stage()로 감싼 단계마다 다음 값을 기록한다.
+    - rss_peak_mb: 단계 동안의 최대 RSS (백그라운드 스레드로 주기적으로 측정)
+    - traced_peak_mb: tracemalloc으로 추적한 Python/NumPy 할당의 최대값
+    - tensor_peak_mb: CUDA/MPS 텐서 할당의 최대값 (CPU 텐서는 추적되지 않으므로 RSS로만 보임)
+
+측정값은 프로세스 전체 기준이므로 동시에 실행 중인 다른 작업의 할당도 포함된다.
+단계가 겹치면 (예: 'separate' 안의 'model') 바깥 단계의 최대값은 안쪽 단계의 최대값을 포함한다.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import torch
+
+from config import Config
+from logger import get_logger
+
+logger = get_logger('memprofile')
+
+MB = 1024 * 1024
+
+
+def current_rss() -> int:
+    """
+    현재 프로세스 RSS (bytes)
+
+    Linux는 /proc/self/statm, 그 외에는 ru_maxrss (프로세스 시작 이후 최대값)를 사용한다.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+def _tensor_peak(reset: bool = False) -> int:
+    """디바이스 텐서 할당의 최대값 (bytes, 측정할 수 없으면 None)"""
+    if torch.cuda.is_available():
+        peak = torch.cuda.max_memory_allocated()
+        if reset:
+            torch.cuda.reset_peak_memory_stats()
+        return peak
+    if torch.backends.mps.is_available():
+        return torch.mps.current_allocated_memory()
+    return None
+
+
+class _StageSample:
+    """진행 중인 단계 하나의 최대값"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rss_start = current_rss()
+        self.rss_peak = self.rss_start
+        self.traced_peak = 0
+        self.tensor_peak = None
+
+    def fold(self, rss: int, traced: int, tensor: int) -> None:
+        """측정값을 최대값에 반영"""
+        self.rss_peak = max(self.rss_peak, rss)
+        self.traced_peak = max(self.traced_peak, traced)
+        if tensor is not None:
+            self.tensor_peak = max(self.tensor_peak or 0, tensor)
+
+    def to_dict(self) -> dict:
+        return {
+            'rss_start_mb': round(self.rss_start / MB, 1),
+            'rss_peak_mb': round(self.rss_peak / MB, 1),
+            'traced_peak_mb': round(self.traced_peak / MB, 1),
+            'tensor_peak_mb': round(self.tensor_peak / MB, 1) if self.tensor_peak is not None else None,
+        }
+
+
+class MemoryProfiler:
+    """
+    단계별 메모리 최대값 측정과 단계별 누적 최대값 (/metrics용) 관리
+
+    tracemalloc과 CUDA의 최대값은 프로세스에 하나뿐이므로, 단계가 시작/종료될 때마다
+    진행 중인 모든 단계에 지금까지의 최대값을 반영한 뒤 초기화한다.
+    """
+
+    def __init__(self, interval: float = None):
+        """
+        Args:
+            interval: RSS 측정 간격 (초, None이면 Config.MEMORY_SAMPLE_INTERVAL)
+        """
+        self.interval = interval or Config.MEMORY_SAMPLE_INTERVAL
+        self._lock = threading.Lock()
+        self._active = []
+        self._sampler = None
+        self._peaks = {}       # {단계 이름: 지금까지 관측한 최대값 dict}
+        self._last = {}        # {단계 이름: 마지막 측정값 dict}
+
+    def _fold_all(self, reset: bool) -> None:
+        """진행 중인 단계에 현재 최대값 반영 (lock 안에서 호출)"""
+        rss = current_rss()
+        traced = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+        tensor = _tensor_peak(reset)
+        for sample in self._active:
+            sample.fold(rss, traced, tensor)
+        if reset and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    def _sample_loop(self) -> None:
+        """진행 중인 단계가 있는 동안 RSS 측정"""
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._sampler = None
+                    return
+                rss = current_rss()
+                for sample in self._active:
+                    sample.rss_peak = max(sample.rss_peak, rss)
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        단계 하나의 메모리 측정
+
+        사용법:
+            with profiler.stage('load') as memory:
+                ...
+            memory  # {'rss_peak_mb', 'traced_peak_mb', ...} (블록이 끝난 뒤 채워짐)
+        """
+        result = {}
+        sample = _StageSample(name)
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._fold_all(reset=True)
+            self._active.append(sample)
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_loop, name='mem-sampler', daemon=True)
+                self._sampler.start()
+        try:
+            yield result
+        finally:
+            with self._lock:
+                self._fold_all(reset=True)
+                self._active.remove(sample)
+                result.update(sample.to_dict())
+                self._record(name, result)
+                if not self._active:
+                    tracemalloc.stop()
+            logger.debug(f"메모리 [{name}]: {result}")
+
+    def _record(self, name: str, result: dict) -> None:
+        """단계별 마지막 값과 누적 최대값 갱신 (lock 안에서 호출)"""
+        self._last[name] = dict(result)
+        peaks = self._peaks.setdefault(name, {})
+        for key, value in result.items():
+            if value is not None:
+                peaks[key] = max(peaks.get(key, value), value)
+
+    def stats(self) -> dict:
+        """
+        모니터링용 단계별 메모리 값
+
+        Returns:
+            dict: {'rss_mb': 현재 RSS, 'stages': {단계 이름: {'last': ..., 'peak': ...}}}
+        """
+        with self._lock:
+            return {
+                'rss_mb': round(current_rss() / MB, 1),
+                'stages': {
+                    name: {'last': dict(self._last[name]), 'peak': dict(self._peaks[name])}
+                    for name in sorted(self._last)
+                },
+            }
+
+
+profiler = MemoryProfiler()
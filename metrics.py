@@ -0,0 +1,27 @@
+"""
+모니터링 지표 출력 모듈 (Prometheus 텍스트 형식)
+"""
+
+
+def render_metrics(samples: list) -> str:
+    """
+    지표 목록을 Prometheus 텍스트 형식으로 변환
+
+    Args:
+        samples: [(이름, 종류('gauge'/'counter'), 설명, 값 또는 {라벨 dict를 만드는 튜플: 값}), ...]
+                 예: ('jobs_rejected_total', 'counter', '거절된 요청 수', {(('reason', 'global'),): 3})
+
+    Returns:
+        Prometheus 텍스트
+    """
+    lines = []
+    for name, kind, description, value in samples:
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        if isinstance(value, dict):
+            for labels, labeled_value in value.items():
+                label_text = ','.join(f'{key}="{val}"' for key, val in labels)
+                lines.append(f"{name}{{{label_text}}} {labeled_value}")
+        else:
+            lines.append(f"{name} {value}")
+    return '\n'.join(lines) + '\n'
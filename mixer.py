@@ -0,0 +1,214 @@
+"""
+서버 측 리믹스 모듈
+
+저장된 stem WAV 파일을 memory-map으로 열어 stem별 게인을 적용한 믹스를
+청크 단위로 생성한다. 생성한 믹스는 게인 벡터별로 캐시된다.
+"""
+import hashlib
+import json
+import os
+import struct
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+from config import Config
+from utils import wav_header
+from logger import get_logger
+
+logger = get_logger('mixer')
+
+
+def read_wav_info(path: str) -> dict:
+    """
+    WAV 헤더에서 포맷과 data 청크 위치 읽기
+
+    Args:
+        path: WAV 파일 경로
+
+    Returns:
+        dict: {'sr', 'channels', 'bits', 'data_offset', 'frames'}
+
+    Raises:
+        ValueError: 16-bit PCM WAV가 아닐 때
+    """
+    with open(path, 'rb') as f:
+        riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave != b'WAVE':
+            raise ValueError(f"WAV 파일이 아닙니다: {path}")
+
+        fmt = None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"data 청크가 없습니다: {path}")
+            chunk_id, chunk_size = struct.unpack('<4sI', header)
+            if chunk_id == b'fmt ':
+                fmt = struct.unpack('<HHIIHH', f.read(16))
+                f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    raise ValueError(f"fmt 청크가 없습니다: {path}")
+                audio_format, channels, sr, _, block_align, bits = fmt
+                if audio_format != 1 or bits != 16:
+                    raise ValueError(f"16-bit PCM WAV만 지원합니다: {path}")
+                return {
+                    'sr': sr,
+                    'channels': channels,
+                    'bits': bits,
+                    'data_offset': f.tell(),
+                    'frames': chunk_size // block_align,
+                }
+            else:
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+
+def open_wav_memmap(path: str) -> tuple:
+    """
+    16-bit PCM WAV의 샘플 영역을 memory-map으로 열기
+
+    Args:
+        path: WAV 파일 경로
+
+    Returns:
+        tuple: (np.memmap (frames, channels) int16, WAV 정보 dict)
+    """
+    info = read_wav_info(path)
+    samples = np.memmap(path, dtype='<i2', mode='r', offset=info['data_offset'],
+                        shape=(info['frames'], info['channels']))
+    return samples, info
+
+
+def mix_array(active: list, start: int, end: int, channels: int) -> np.ndarray:
+    """
+    memory-map된 stem들의 한 구간을 게인 적용해 섞기
+
+    Args:
+        active: [(np.memmap (frames, channels), 게인), ...]
+        start: 시작 프레임
+        end: 끝 프레임 (포함하지 않음)
+        channels: 채널 수
+
+    Returns:
+        np.ndarray (end - start, channels) int16
+    """
+    # 게인 1.0인 stem 하나는 변환 없이 그대로 읽음 (결과는 같음)
+    if len(active) == 1 and active[0][1] == 1.0:
+        return np.asarray(active[0][0][start:end], dtype='<i2')
+    mixed = np.zeros((end - start, channels), dtype=np.float32)
+    for samples, gain in active:
+        mixed += samples[start:end] * np.float32(gain)
+    np.clip(mixed, -32768, 32767, out=mixed)
+    return mixed.astype('<i2')
+
+
+def mix_frames(active: list, start: int, end: int, channels: int) -> bytes:
+    """
+    memory-map된 stem들의 한 구간을 게인 적용해 섞기
+
+    Returns:
+        16-bit PCM (little-endian, 인터리브) bytes
+    """
+    return mix_array(active, start, end, channels).tobytes()
+
+
+def open_mix_sources(paths: dict, gains: dict) -> tuple:
+    """
+    섞을 stem들을 memory-map으로 열기 (게인이 0인 stem은 제외)
+
+    Args:
+        paths: {stem 이름: 경로}
+        gains: {stem 이름: 게인}
+
+    Returns:
+        tuple: ([(np.memmap, 게인), ...], 프레임 수, 채널 수, 샘플레이트)
+    """
+    stems = {name: open_wav_memmap(path) for name, path in paths.items()}
+    infos = [info for _, info in stems.values()]
+    frames = min(info['frames'] for info in infos)
+    channels, sr = infos[0]['channels'], infos[0]['sr']
+    active = [(samples, gains[name]) for name, (samples, _) in stems.items() if gains[name] != 0]
+    return active, frames, channels, sr
+
+
+class StemMixer:
+    """stem 파일들을 게인 벡터로 섞어 WAV 스트림 생성"""
+
+    def __init__(self, output_dir: str, cache_dir: str):
+        """
+        Args:
+            output_dir: stem 파일이 있는 디렉토리
+            cache_dir: 생성한 믹스를 저장할 디렉토리
+        """
+        self.output_dir = Path(output_dir)
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def stem_paths(self, track: str, stem_names: list) -> dict:
+        """
+        트랙의 stem 파일 경로 (존재하는 것만)
+
+        Args:
+            track: 트랙 이름 (파일명 접두어)
+            stem_names: 모델의 stem 이름 목록
+
+        Returns:
+            dict: {stem 이름: 경로}
+        """
+        paths = {name: self.output_dir / f"{track}_{name}.wav" for name in stem_names}
+        return {name: path for name, path in paths.items() if path.exists()}
+
+    def cache_path(self, track: str, paths: dict, gains: dict) -> Path:
+        """
+        게인 벡터와 stem 파일 버전으로 믹스 캐시 경로 결정
+
+        같은 제목으로 다시 분리해 stem이 바뀌면 캐시 키도 바뀐다.
+        """
+        key = json.dumps({
+            'gains': {name: round(gains[name], 3) for name in sorted(gains)},
+            'mtimes': {name: paths[name].stat().st_mtime_ns for name in sorted(paths)},
+        }, sort_keys=True)
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return self.cache_dir / f"{track}_mix_{digest}.wav"
+
+    def stream_mix(self, paths: dict, gains: dict, cache_path: Path):
+        """
+        믹스를 청크 단위로 생성하며 동시에 캐시 파일로 저장
+
+        Args:
+            paths: {stem 이름: 경로}
+            gains: {stem 이름: 게인}
+            cache_path: 완성된 믹스를 저장할 경로
+
+        Returns:
+            tuple: (전체 바이트 수, bytes를 yield하는 generator)
+        """
+        # 게인이 0인 stem은 읽지 않음
+        active, frames, channels, sr = open_mix_sources(paths, gains)
+        header = wav_header(frames, channels, sr)
+        total_bytes = len(header) + frames * channels * 2
+
+        def generate():
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{uuid.uuid4().hex}.partial")
+            completed = False
+            try:
+                with open(tmp_path, 'wb') as cache_file:
+                    cache_file.write(header)
+                    yield header
+
+                    for start in range(0, frames, Config.MIX_CHUNK_FRAMES):
+                        end = min(start + Config.MIX_CHUNK_FRAMES, frames)
+                        chunk = mix_frames(active, start, end, channels)
+                        cache_file.write(chunk)
+                        yield chunk
+
+                os.replace(tmp_path, cache_path)
+                completed = True
+                logger.info(f"믹스 캐시 저장: {cache_path.name}")
+            finally:
+                # 클라이언트가 중간에 끊으면 미완성 캐시 삭제
+                if not completed and tmp_path.exists():
+                    tmp_path.unlink()
+
+        return total_bytes, generate()
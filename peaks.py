@@ -0,0 +1,194 @@
+"""
+파형(waveform) peak 요약 모듈
+
+stem마다 여러 확대 단계(픽셀당 샘플 수)의 min/max 요약을 만들어 작은 바이너리 파일로 저장한다.
+파일 형식은 audiowaveform .dat (version 1, 8-bit)과 같다:
+    헤더 (little-endian): version=1, flags=1(8-bit), sample_rate, samples_per_pixel, length
+    본문: 픽셀마다 (min, max) int8 쌍
+"""
+import os
+import struct
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+from config import Config
+from mixer import open_mix_sources, mix_frames
+from logger import get_logger
+
+logger = get_logger('peaks')
+
+DAT_HEADER = struct.Struct('<iIiiI')
+DAT_FLAG_8BIT = 1
+
+
+def _reduce(lows: np.ndarray, highs: np.ndarray, factor: int) -> tuple:
+    """min/max 배열을 factor개씩 묶어 한 단계 축소 (남는 끝부분도 한 픽셀로)"""
+    pad = -len(lows) % factor
+    lows = np.concatenate((lows, np.full(pad, lows[-1], dtype=lows.dtype)))
+    highs = np.concatenate((highs, np.full(pad, highs[-1], dtype=highs.dtype)))
+    return lows.reshape(-1, factor).min(axis=1), highs.reshape(-1, factor).max(axis=1)
+
+
+def compute_peaks(chunks, levels: list = None) -> dict:
+    """
+    오디오에서 확대 단계별 min/max peak 계산
+
+    가장 세밀한 단계는 샘플에서 직접 계산하고, 나머지 단계는 이전 단계를 축소해서 만든다.
+    채널은 합치지 않고 모든 채널의 min/max를 사용한다.
+
+    Args:
+        chunks: (frames, channels) float 배열(-1~1)을 yield하는 iterable.
+                마지막을 제외한 각 청크의 프레임 수는 levels[0]의 배수여야 한다.
+        levels: 픽셀당 샘플 수 목록 (오름차순, 각 값은 이전 값의 배수)
+
+    Returns:
+        dict: {픽셀당 샘플 수: (pixels, 2) int8 배열}
+    """
+    levels = sorted(levels or Config.PEAK_LEVELS)
+    base = levels[0]
+
+    lows, highs = [], []
+    for chunk in chunks:
+        frames = chunk.shape[0]
+        if frames == 0:
+            continue
+        # 픽셀 경계에 맞춰 마지막 샘플 반복
+        pad = -frames % base
+        if pad:
+            chunk = np.concatenate((chunk, np.repeat(chunk[-1:], pad, axis=0)))
+        blocks = chunk.reshape(-1, base, chunk.shape[1])
+        lows.append(blocks.min(axis=(1, 2)))
+        highs.append(blocks.max(axis=(1, 2)))
+
+    if lows:
+        low, high = np.concatenate(lows), np.concatenate(highs)
+    else:
+        low, high = np.zeros(1, dtype=np.float32), np.zeros(1, dtype=np.float32)
+
+    peaks = {}
+    previous = base
+    for spp in levels:
+        if spp % previous:
+            raise ValueError(f"확대 단계는 이전 단계의 배수여야 합니다: {previous} -> {spp}")
+        if spp != previous:
+            low, high = _reduce(low, high, spp // previous)
+        previous = spp
+        pair = np.stack((low, high), axis=1)
+        peaks[spp] = np.clip(np.round(pair * 127), -128, 127).astype(np.int8)
+    return peaks
+
+
+def encode_dat(pairs: np.ndarray, sr: int, samples_per_pixel: int) -> bytes:
+    """
+    peak 배열을 .dat 바이트로 변환
+
+    Args:
+        pairs: (pixels, 2) int8 배열
+        sr: 샘플레이트
+        samples_per_pixel: 픽셀당 샘플 수
+
+    Returns:
+        .dat 파일 내용
+    """
+    header = DAT_HEADER.pack(1, DAT_FLAG_8BIT, sr, samples_per_pixel, len(pairs))
+    return header + pairs.astype(np.int8).tobytes()
+
+
+def peaks_path(peaks_dir: str, prefix: str, samples_per_pixel: int) -> Path:
+    """
+    peak 파일 경로
+
+    Args:
+        peaks_dir: peak 파일 디렉토리
+        prefix: 파일명 접두어 ({곡명}_{stem})
+        samples_per_pixel: 픽셀당 샘플 수
+    """
+    return Path(peaks_dir) / f"{prefix}_{samples_per_pixel}.dat"
+
+
+def write_peaks(chunks, sr: int, peaks_dir: str, prefix: str, levels: list = None) -> list:
+    """
+    확대 단계별 peak 파일 저장 (.partial에 쓴 뒤 교체)
+
+    Args:
+        chunks: compute_peaks와 같은 형식의 오디오 청크
+        sr: 샘플레이트
+        peaks_dir: 저장할 디렉토리
+        prefix: 파일명 접두어 ({곡명}_{stem})
+        levels: 픽셀당 샘플 수 목록
+
+    Returns:
+        list: 저장한 파일 경로 목록
+    """
+    Path(peaks_dir).mkdir(parents=True, exist_ok=True)
+    paths = []
+    for spp, pairs in compute_peaks(chunks, levels).items():
+        path = peaks_path(peaks_dir, prefix, spp)
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.partial")
+        tmp_path.write_bytes(encode_dat(pairs, sr, spp))
+        os.replace(tmp_path, path)
+        paths.append(path)
+    logger.debug(f"peak 저장 완료: {prefix} ({len(paths)}단계)")
+    return paths
+
+
+def tensor_chunks(tensor, chunk_frames: int = None):
+    """
+    (channels, samples) 텐서를 compute_peaks용 청크로 나누기
+    (float32는 복사 없이 전치 view 사용, float16/bfloat16은 청크 단위로 float32 변환)
+
+    Args:
+        tensor: 오디오 텐서 (channels, samples)
+        chunk_frames: 청크 프레임 수 (None이면 Config.PEAK_CHUNK_FRAMES)
+    """
+    chunk_frames = chunk_frames or Config.PEAK_CHUNK_FRAMES
+    tensor = tensor.cpu()
+    for start in range(0, tensor.shape[-1], chunk_frames):
+        yield tensor[:, start:start + chunk_frames].float().numpy().T
+
+
+def choose_level(levels: list, frames: int, width: int) -> int:
+    """
+    화면 너비에 맞는 확대 단계 선택
+
+    픽셀 수가 너비 이상인 단계 중 가장 거친 단계를 고른다 (없으면 가장 세밀한 단계).
+
+    Args:
+        levels: 픽셀당 샘플 수 목록
+        frames: 오디오 프레임 수
+        width: 화면 너비 (픽셀)
+
+    Returns:
+        픽셀당 샘플 수
+    """
+    levels = sorted(levels)
+    fitting = [spp for spp in levels if frames / spp >= width]
+    return fitting[-1] if fitting else levels[0]
+
+
+def mix_chunks(paths: dict, gains: dict, chunk_frames: int = None):
+    """
+    저장된 stem 파일(들)을 memory-map으로 읽어 compute_peaks용 청크로 나누기
+
+    peak 파일이 없는 stem(이전 결과, 반주 믹스 등)을 요청 시 계산할 때 사용한다.
+
+    Args:
+        paths: {stem 이름: 경로}
+        gains: {stem 이름: 게인}
+        chunk_frames: 청크 프레임 수 (None이면 Config.PEAK_CHUNK_FRAMES)
+
+    Returns:
+        tuple: (샘플레이트, 청크 generator)
+    """
+    chunk_frames = chunk_frames or Config.PEAK_CHUNK_FRAMES
+    active, frames, channels, sr = open_mix_sources(paths, gains)
+
+    def generate():
+        for start in range(0, frames, chunk_frames):
+            end = min(start + chunk_frames, frames)
+            pcm = np.frombuffer(mix_frames(active, start, end, channels), dtype='<i2')
+            yield pcm.reshape(-1, channels).astype(np.float32) / 32768
+
+    return sr, generate()
@@ -0,0 +1,77 @@
+"""
+분리 품질/속도 프리셋 모듈
+
+apply_model 파라미터(shifts, overlap, segment, split)를 이름 있는 프리셋으로 관리하고,
+'auto' 모드에서는 곡 길이, 대기 중인 작업 수, 사용 가능한 코어 수로 프리셋을 고른다.
+"""
+from config import Config
+from logger import get_logger
+
+logger = get_logger('presets')
+
+AUTO_PRESET = 'auto'
+
+
+def available_presets() -> list:
+    """
+    선택 가능한 프리셋 이름 목록
+
+    Returns:
+        프리셋 이름 리스트 ('auto' 포함)
+    """
+    return list(Config.SEPARATION_PRESETS) + [AUTO_PRESET]
+
+
+def choose_auto_preset(duration: float, queue_depth: int, cpu_count: int) -> str:
+    """
+    곡 길이와 현재 부하로 프리셋 선택
+
+    코어당 대기 작업이 많거나 곡이 길면 속도를, 여유가 있고 곡이 짧으면 품질을 우선한다.
+
+    Args:
+        duration: 곡 길이 (초)
+        queue_depth: 현재 처리 중이거나 대기 중인 다른 작업 수
+        cpu_count: 사용 가능한 CPU 코어 수
+
+    Returns:
+        프리셋 이름
+    """
+    # 코어를 나눠 쓰는 다른 작업 수 (이 작업은 세지 않으므로 코어가 적어도 한가하면 0)
+    jobs_per_core = queue_depth / max(cpu_count, 1)
+
+    if duration >= Config.AUTO_LONG_TRACK_SECONDS or jobs_per_core >= Config.AUTO_BUSY_JOBS_PER_CORE:
+        return 'fast'
+    if (duration <= Config.AUTO_SHORT_TRACK_SECONDS and queue_depth == 0
+            and cpu_count >= Config.AUTO_QUALITY_MIN_CPUS):
+        return 'quality'
+    return 'balanced'
+
+
+def resolve_preset(preset: str, duration: float, queue_depth: int, cpu_count: int) -> tuple:
+    """
+    프리셋 이름을 apply_model 파라미터로 변환
+
+    Args:
+        preset: 프리셋 이름 (None이면 Config.DEFAULT_PRESET)
+        duration: 곡 길이 (초)
+        queue_depth: 현재 처리 중이거나 대기 중인 다른 작업 수
+        cpu_count: 사용 가능한 CPU 코어 수
+
+    Returns:
+        tuple: (실제 적용된 프리셋 이름, apply_model 파라미터 dict)
+
+    Raises:
+        ValueError: 알 수 없는 프리셋일 때
+    """
+    preset = preset or Config.DEFAULT_PRESET
+
+    if preset == AUTO_PRESET:
+        chosen = choose_auto_preset(duration, queue_depth, cpu_count)
+        logger.info(f"자동 프리셋 선택: {chosen} "
+                    f"(길이 {duration:.0f}초, 대기 {queue_depth}개, 코어 {cpu_count}개)")
+        preset = chosen
+
+    if preset not in Config.SEPARATION_PRESETS:
+        raise ValueError(f"알 수 없는 프리셋: {preset} (사용 가능: {', '.join(available_presets())})")
+
+    return preset, dict(Config.SEPARATION_PRESETS[preset])
@@ -0,0 +1,251 @@
+"""
+실시간(스트리밍) 분리 모듈
+
+클라이언트가 보내는 PCM 조각을 고정 길이 창(window)에 모아 분리하고,
+창끼리 겹치는 구간은 선형 crossfade로 이어 붙여 stem PCM을 조금씩 돌려준다.
+지연 시간은 창 길이 + 창 하나의 처리 시간이며, 실시간으로 따라가려면
+창 하나의 처리 시간이 hop(창 길이 - 겹침)보다 짧아야 한다 (RTF < 1).
+"""
+import threading
+import time
+import uuid
+
+import numpy as np
+import torch
+
+from config import Config
+from logger import get_logger
+
+logger = get_logger('realtime')
+
+
+class SlidingWindowSeparator:
+    """
+    PCM을 조금씩 받아 겹치는 창 단위로 분리하는 상태 객체 (세션 하나당 하나)
+
+    창 k는 [k * hop, k * hop + window) 구간을 분리하고, 앞 창의 마지막 overlap 구간과
+    crossfade한 뒤 [k * hop, k * hop + hop) 구간을 내보낸다. 마지막 overlap 구간은 다음 창을 위해 보관한다.
+    """
+
+    def __init__(self, separator, stem: str, window_seconds: float = None, overlap_seconds: float = None):
+        """
+        Args:
+            separator: AudioSeparator (모델 공유)
+            stem: 돌려줄 stem 이름 또는 'accompaniment' (보컬을 뺀 합)
+            window_seconds: 창 길이 (초, None이면 Config.LIVE_WINDOW_SECONDS, 모델 최대 segment로 제한)
+            overlap_seconds: 창끼리 겹치는 길이 (초, None이면 Config.LIVE_OVERLAP_SECONDS)
+        """
+        self.separator = separator
+        self.stem = stem
+        self.sr = separator.model.samplerate
+
+        window_seconds = window_seconds or Config.LIVE_WINDOW_SECONDS
+        max_segment = float(getattr(separator.model, 'max_allowed_segment', window_seconds))
+        window_seconds = min(window_seconds, max_segment)
+        overlap_seconds = Config.LIVE_OVERLAP_SECONDS if overlap_seconds is None else overlap_seconds
+        self.window = int(window_seconds * self.sr)
+        self.overlap = min(int(overlap_seconds * self.sr), self.window // 2)
+        self.hop = self.window - self.overlap
+        self._fade_in = torch.linspace(0, 1, self.overlap + 2)[1:-1]
+
+        self._pending = torch.zeros(2, 0)    # 아직 분리하지 않은 입력
+        self._tail = None                     # 앞 창 출력의 마지막 overlap 구간
+        self.frames_in = 0
+        self.frames_out = 0
+        self.model_seconds = 0.0
+        self.windows = 0
+
+    def _separate(self, chunk: torch.Tensor) -> torch.Tensor:
+        """창 하나 분리 후 요청한 stem만 반환 (channels, samples)"""
+        start = time.perf_counter()
+        sources = self.separator.separate_window(chunk)
+        names = self.separator.model.sources
+        if self.stem == 'accompaniment':
+            output = sources.sum(dim=0, dtype=torch.float32)
+            if 'vocals' in names:
+                output -= sources[names.index('vocals')]
+        else:
+            output = sources[names.index(self.stem)].float()
+        self.model_seconds += time.perf_counter() - start
+        self.windows += 1
+        return output
+
+    def _emit(self, output: torch.Tensor, length: int) -> torch.Tensor:
+        """앞 창과 crossfade하고 내보낼 구간을 잘라냄 (length: 이번 창에서 내보낼 프레임 수)"""
+        if self._tail is not None and self.overlap:
+            output[:, :self.overlap] = (self._tail * (1 - self._fade_in)
+                                        + output[:, :self.overlap] * self._fade_in)
+        self._tail = output[:, length:length + self.overlap].clone() if self.overlap else None
+        return output[:, :length]
+
+    def push(self, pcm: np.ndarray) -> np.ndarray:
+        """
+        입력 PCM 추가 후 분리가 끝난 구간 반환
+
+        Args:
+            pcm: (frames, channels) float32, 모델 샘플레이트, 1 또는 2채널
+
+        Returns:
+            (frames, 2) float32 (아직 창이 차지 않았으면 0 프레임)
+        """
+        chunk = torch.from_numpy(np.ascontiguousarray(pcm.T, dtype=np.float32))
+        if chunk.shape[0] == 1:
+            chunk = chunk.repeat(2, 1)
+        self._pending = torch.cat([self._pending, chunk], dim=1)
+        self.frames_in += chunk.shape[1]
+
+        outputs = []
+        while self._pending.shape[1] >= self.window:
+            output = self._separate(self._pending[:, :self.window])
+            outputs.append(self._emit(output, self.hop))
+            self._pending = self._pending[:, self.hop:]
+        return self._collect(outputs)
+
+    def flush(self) -> np.ndarray:
+        """
+        남은 입력을 모두 분리해 반환 (스트림 끝)
+
+        Returns:
+            (frames, 2) float32
+        """
+        outputs = []
+        remaining = self._pending.shape[1]
+        if remaining > 0 and (self._tail is None or remaining > self.overlap):
+            padded = torch.nn.functional.pad(self._pending, (0, self.window - remaining))
+            output = self._separate(padded)
+            emit = self._emit(output, remaining)
+            outputs.append(emit)
+            self._tail = None
+        elif self._tail is not None:
+            outputs.append(self._tail[:, :remaining])
+        self._pending = torch.zeros(2, 0)
+        self._tail = None
+        return self._collect(outputs)
+
+    def _collect(self, outputs: list) -> np.ndarray:
+        """출력 구간을 이어 (frames, 2) 배열로"""
+        if not outputs:
+            return np.zeros((0, 2), dtype=np.float32)
+        audio = torch.cat(outputs, dim=1)
+        self.frames_out += audio.shape[1]
+        return audio.T.numpy()
+
+    def stats(self) -> dict:
+        """
+        지연 시간/처리 속도 통계
+
+        Returns:
+            dict: 입출력 프레임 수, 창 길이/겹침, 창당 평균 처리 시간, RTF (hop 1초당 처리 시간),
+                  예상 지연 시간 (창 길이 + 창 처리 시간)
+        """
+        per_window = self.model_seconds / self.windows if self.windows else None
+        return {
+            'sr': self.sr,
+            'stem': self.stem,
+            'frames_in': self.frames_in,
+            'frames_out': self.frames_out,
+            'window_seconds': round(self.window / self.sr, 3),
+            'overlap_seconds': round(self.overlap / self.sr, 3),
+            'windows': self.windows,
+            'window_compute_seconds': round(per_window, 3) if per_window is not None else None,
+            'rtf': round(per_window / (self.hop / self.sr), 3) if per_window is not None else None,
+            'latency_seconds': round(self.window / self.sr + per_window, 3) if per_window is not None else None,
+        }
+
+
+class LiveSessions:
+    """실시간 분리 세션 관리 (동시 세션 수 제한, 오래 쓰지 않은 세션 정리)"""
+
+    def __init__(self, separator, max_sessions: int = None, idle_timeout: float = None):
+        """
+        Args:
+            separator: AudioSeparator
+            max_sessions: 동시에 열 수 있는 세션 수 (None이면 Config.LIVE_MAX_SESSIONS)
+            idle_timeout: 이 시간 동안 요청이 없으면 세션 정리 (초, None이면 Config.LIVE_IDLE_TIMEOUT)
+        """
+        self.separator = separator
+        self.max_sessions = max_sessions or Config.LIVE_MAX_SESSIONS
+        self.idle_timeout = idle_timeout or Config.LIVE_IDLE_TIMEOUT
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._opened_total = 0
+        self._rejected_total = 0
+
+    def _expire(self) -> None:
+        """오래 쓰지 않은 세션 정리 (lock 안에서 호출)"""
+        now = time.time()
+        for session_id, session in list(self._sessions.items()):
+            if now - session['last_active'] > self.idle_timeout:
+                logger.info(f"실시간 세션 만료: {session_id}")
+                del self._sessions[session_id]
+
+    def open(self, stem: str, channels: int = 2, window_seconds: float = None,
+             overlap_seconds: float = None) -> tuple:
+        """
+        새 세션 열기
+
+        Args:
+            stem: 돌려줄 stem 이름 또는 'accompaniment'
+            channels: 입력 PCM 채널 수
+            window_seconds: 창 길이 (초)
+            overlap_seconds: 겹침 길이 (초)
+
+        Returns:
+            tuple: (세션 ID, SlidingWindowSeparator), 세션이 가득 차면 (None, None)
+        """
+        with self._lock:
+            self._expire()
+            if len(self._sessions) >= self.max_sessions:
+                self._rejected_total += 1
+                return None, None
+            self._opened_total += 1
+            session_id = uuid.uuid4().hex
+            stream = SlidingWindowSeparator(self.separator, stem, window_seconds, overlap_seconds)
+            self._sessions[session_id] = {
+                'stream': stream,
+                'channels': channels,
+                'lock': threading.Lock(),
+                'last_active': time.time(),
+            }
+        logger.info(f"실시간 세션 시작: {session_id} ({stem}, 창 {stream.window / stream.sr:.1f}초)")
+        return session_id, stream
+
+    def get(self, session_id: str) -> dict:
+        """세션 조회 (없으면 None, 조회하면 마지막 사용 시각 갱신)"""
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session['last_active'] = time.time()
+            return session
+
+    def close(self, session_id: str) -> None:
+        """세션 닫기"""
+        with self._lock:
+            if self._sessions.pop(session_id, None) is not None:
+                logger.info(f"실시간 세션 종료: {session_id}")
+
+    def count(self) -> int:
+        """열려 있는 세션 수 (세션마다 창을 분리하므로 분리 작업 하나로 셈)"""
+        with self._lock:
+            self._expire()
+            return len(self._sessions)
+
+    def stats(self) -> dict:
+        """
+        모니터링용 세션 상태
+
+        Returns:
+            dict: 열린 세션 수, 한도, 누적 세션/거절 수, 분리한 창 수와 처리 시간
+        """
+        with self._lock:
+            self._expire()
+            streams = [session['stream'] for session in self._sessions.values()]
+            return {
+                'sessions': len(streams),
+                'max_sessions': self.max_sessions,
+                'opened_total': self._opened_total,
+                'rejected_total': self._rejected_total,
+                'windows': sum(stream.windows for stream in streams),
+                'model_seconds': round(sum(stream.model_seconds for stream in streams), 3),
+            }
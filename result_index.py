@@ -0,0 +1,433 @@
+"""
+작업/결과 인덱스 모듈 (SQLite)
+
+작업 이력, 입력, 모델/파라미터, stem 파일 경로와 크기, 단계별 시간, 접근 시각을
+내장 SQLite(WAL 모드)에 기록한다. 중복 제거(지문), 보관 정책, 작업 이력 조회는
+디렉토리를 훑지 않고 이 인덱스를 사용하며, 서버를 재시작해도 유지된다.
+"""
+import json
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from config import Config
+from downloader import source_key
+from fingerprint import bit_error_rate
+from peaks import peaks_path
+from logger import get_logger
+
+logger = get_logger('result_index')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    track TEXT NOT NULL,
+    title TEXT,
+    model TEXT NOT NULL,
+    preset TEXT,
+    params TEXT,
+    duration REAL,
+    fingerprint BLOB,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    access_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS results_track ON results(track);
+CREATE INDEX IF NOT EXISTS results_lookup ON results(model, duration);
+CREATE INDEX IF NOT EXISTS results_accessed ON results(accessed_at);
+
+CREATE TABLE IF NOT EXISTS files (
+    result_id INTEGER NOT NULL REFERENCES results(id) ON DELETE CASCADE,
+    stem TEXT NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER,
+    PRIMARY KEY (result_id, stem)
+);
+CREATE INDEX IF NOT EXISTS files_path ON files(path);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    source TEXT,
+    source_type TEXT,
+    source_key TEXT,
+    status TEXT NOT NULL,
+    error TEXT,
+    model TEXT,
+    preset TEXT,
+    result_id INTEGER REFERENCES results(id) ON DELETE SET NULL,
+    response TEXT,
+    timings TEXT,
+    created_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_created ON jobs(created_at);
+CREATE INDEX IF NOT EXISTS jobs_source ON jobs(source_key, status, created_at);
+"""
+
+
+class ResultIndex:
+    """작업과 분리 결과의 SQLite 인덱스 (스레드별 연결 사용)"""
+
+    def __init__(self, db_path: str):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._prune_lock = threading.Lock()
+        self._last_prune = 0.0
+
+        conn = self._conn()
+        # WAL: 쓰기 중에도 다른 스레드/프로세스가 읽을 수 있음 (설정은 파일에 유지됨)
+        conn.execute('PRAGMA journal_mode=WAL')
+        with conn:
+            conn.executescript(SCHEMA)
+        logger.info(f"결과 인덱스 열기: {self.db_path}")
+
+    def _conn(self) -> sqlite3.Connection:
+        """현재 스레드의 연결 (없으면 생성)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA foreign_keys=ON')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # 작업
+    # ------------------------------------------------------------------
+
+    def add_job(self, job_id: str, title: str = None, source: str = None, source_type: str = None) -> None:
+        """
+        작업 시작 기록
+
+        Args:
+            job_id: 작업 ID
+            title: 곡 제목 (다운로드 전에는 None)
+            source: YouTube URL, 파일 경로 또는 업로드 파일명
+            source_type: 'youtube', 'file' 또는 'upload'
+        """
+        with self._conn() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO jobs (id, title, source, source_type, source_key, status, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job_id, title, source, source_type, source_key(source, source_type), 'processing', time.time())
+            )
+
+    def finish_job(self, job) -> None:
+        """
+        끝난 작업의 상태, 응답, 단계별 시간 기록 (재시작 후 /jobs 조회용)
+
+        Args:
+            job: jobs.Job
+        """
+        response = job.to_dict()
+        with self._conn() as conn:
+            conn.execute(
+                'UPDATE jobs SET title = ?, status = ?, error = ?, model = ?, preset = ?, '
+                'response = ?, timings = ?, finished_at = ? WHERE id = ?',
+                (response['title'], response['status'], response['error'], response.get('model'),
+                 response.get('preset'), json.dumps(response, ensure_ascii=False),
+                 json.dumps(response.get('timings') or {}), job.finished_at or time.time(), job.id)
+            )
+
+    def get_job(self, job_id: str) -> dict:
+        """
+        기록된 작업의 API 응답 (없으면 None)
+
+        끝나기 전에 서버가 재시작된 작업은 'interrupted' 상태로 보인다.
+        """
+        row = self._conn().execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+        if row['response']:
+            return json.loads(row['response'])
+        return {
+            'job_id': row['id'],
+            'title': row['title'],
+            'status': 'interrupted',
+            'ready': [],
+            'pending': [],
+            'error': '서버 재시작으로 중단된 작업입니다.',
+        }
+
+    def recent_jobs(self, limit: int = 50) -> list:
+        """
+        최근 작업 목록 (최신순)
+
+        Args:
+            limit: 최대 개수
+
+        Returns:
+            list: 작업 요약 dict 목록
+        """
+        rows = self._conn().execute(
+            'SELECT j.id, j.title, j.source, j.source_type, j.status, j.error, j.model, j.preset, '
+            'j.timings, j.created_at, j.finished_at, r.track, r.accessed_at '
+            'FROM jobs j LEFT JOIN results r ON r.id = j.result_id '
+            'ORDER BY j.created_at DESC LIMIT ?',
+            (limit,)
+        ).fetchall()
+        history = []
+        for row in rows:
+            entry = dict(row)
+            entry['job_id'] = entry.pop('id')
+            entry['timings'] = json.loads(entry['timings']) if entry['timings'] else {}
+            history.append(entry)
+        return history
+
+    # ------------------------------------------------------------------
+    # 결과
+    # ------------------------------------------------------------------
+
+    def add_result(self, job_id: str, result: dict, model: str, duration: float,
+                   fingerprint: np.ndarray = None) -> int:
+        """
+        저장이 끝난 분리 결과 기록
+
+        같은 트랙 이름의 이전 결과는 파일이 덮어써졌으므로 인덱스에서 제거한다.
+
+        Args:
+            job_id: 결과를 만든 작업 ID (없으면 None)
+            result: AudioSeparator.separate 결과
+            model: Demucs 모델 이름
+            duration: 오디오 길이 (초)
+            fingerprint: 오디오 지문 (없으면 None)
+
+        Returns:
+            결과 ID
+        """
+        files = dict(result['stems'])
+        if result.get('accompaniment'):
+            files['accompaniment'] = result['accompaniment']
+        sizes = {name: Path(path).stat().st_size for name, path in files.items() if Path(path).exists()}
+        fingerprint_blob = fingerprint.astype(np.uint32).tobytes() if fingerprint is not None else None
+        now = time.time()
+
+        with self._conn() as conn:
+            cursor = conn.execute(
+                'INSERT INTO results (track, title, model, preset, params, duration, fingerprint, '
+                'result, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (result['track'], result['title'], model, result['preset'], json.dumps(result['params']),
+                 duration, fingerprint_blob, json.dumps(result, ensure_ascii=False), now, now)
+            )
+            result_id = cursor.lastrowid
+            conn.executemany(
+                'INSERT INTO files (result_id, stem, path, size) VALUES (?, ?, ?, ?)',
+                [(result_id, name, str(path), sizes.get(name)) for name, path in files.items()]
+            )
+            conn.execute('DELETE FROM results WHERE track = ? AND id != ?', (result['track'], result_id))
+            if job_id:
+                conn.execute('UPDATE jobs SET result_id = ? WHERE id = ?', (result_id, job_id))
+        logger.debug(f"결과 인덱스 추가: {result['track']} (id={result_id})")
+        return result_id
+
+    def link_job(self, job_id: str, result_id: int) -> None:
+        """작업을 (재사용한) 기존 결과에 연결"""
+        with self._conn() as conn:
+            conn.execute('UPDATE jobs SET result_id = ? WHERE id = ?', (result_id, job_id))
+
+    def find_duplicate(self, fingerprint: np.ndarray, duration: float, model: str, preset: str) -> tuple:
+        """
+        길이와 지문이 허용 오차 안에서 일치하는 기존 결과 찾기
+
+        Args:
+            fingerprint: 새 오디오의 지문
+            duration: 새 오디오 길이 (초)
+            model: Demucs 모델 이름
+            preset: 요청 프리셋 ('auto'면 프리셋 무관)
+
+        Returns:
+            tuple: (결과 ID, 분리 결과 dict) (없으면 (None, None))
+        """
+        if len(fingerprint) < Config.FINGERPRINT_MIN_FRAMES:
+            return None, None
+
+        query = ('SELECT id, fingerprint, result FROM results WHERE model = ? AND fingerprint IS NOT NULL '
+                 'AND duration BETWEEN ? AND ?')
+        args = [model, duration - Config.FINGERPRINT_DURATION_TOLERANCE,
+                duration + Config.FINGERPRINT_DURATION_TOLERANCE]
+        if preset != 'auto':
+            query += ' AND preset = ?'
+            args.append(preset)
+        rows = self._conn().execute(query, args).fetchall()
+
+        for row in rows:
+            candidate = np.frombuffer(row['fingerprint'], dtype=np.uint32)
+            ber = bit_error_rate(fingerprint, candidate, Config.FINGERPRINT_MAX_OFFSET)
+            if ber > Config.FINGERPRINT_MAX_BER:
+                continue
+
+            result = self._existing_result(row['id'], row['result'])
+            if result is None:
+                continue
+
+            logger.info(f"지문 일치: {result['title']} (비트 오류율 {ber:.3f})")
+            return row['id'], result
+        return None, None
+
+    def find_by_source(self, source: str, source_type: str, model: str, preset: str) -> tuple:
+        """
+        같은 입력으로 완료된 최근 작업의 결과 찾기 (다운로드/디코딩 전에 건너뛸지 판단)
+
+        같은 영상의 다른 URL 형태도 찾도록 정규화한 키(source_key)의 인덱스로 조회한다.
+
+        Args:
+            source: YouTube URL 또는 파일 경로
+            source_type: 'youtube' 또는 'file'
+            model: Demucs 모델 이름
+            preset: 요청 프리셋 ('auto'면 프리셋 무관)
+
+        Returns:
+            tuple: (결과 ID, 분리 결과 dict) (없으면 (None, None))
+        """
+        key = source_key(source, source_type)
+        if key is None:
+            return None, None
+        query = ('SELECT r.id, r.result FROM jobs j JOIN results r ON r.id = j.result_id '
+                 "WHERE j.source_key = ? AND j.status = 'completed' AND r.model = ?")
+        args = [key, model]
+        if preset != 'auto':
+            query += ' AND r.preset = ?'
+            args.append(preset)
+        rows = self._conn().execute(query + ' ORDER BY j.created_at DESC', args).fetchall()
+
+        for row in rows:
+            result = self._existing_result(row['id'], row['result'])
+            if result is not None:
+                return row['id'], result
+        return None, None
+
+    def _existing_result(self, result_id: int, result_json: str) -> dict:
+        """결과 파일이 모두 있으면 분리 결과 dict, 지워졌으면 인덱스에서 제거하고 None"""
+        paths = [file['path'] for file in self.result_files(result_id)]
+        result = json.loads(result_json)
+        if not paths or not all(Path(path).exists() for path in paths):
+            logger.info(f"결과 파일이 없어 인덱스 항목 제거: {result['title']}")
+            self.remove_result(result_id)
+            return None
+        return result
+
+    def result_files(self, result_id: int) -> list:
+        """결과의 파일 목록 ([{'stem', 'path', 'size'}, ...])"""
+        rows = self._conn().execute(
+            'SELECT stem, path, size FROM files WHERE result_id = ?', (result_id,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def remove_result(self, result_id: int) -> None:
+        """결과 항목 삭제 (파일 목록 포함, 파일 자체는 지우지 않음)"""
+        with self._conn() as conn:
+            conn.execute('DELETE FROM results WHERE id = ?', (result_id,))
+
+    def touch_track(self, track: str) -> None:
+        """트랙 접근 시각 갱신 (재생, 믹스, 스트리밍 요청 시)"""
+        with self._conn() as conn:
+            conn.execute(
+                'UPDATE results SET accessed_at = ?, access_count = access_count + 1 WHERE track = ?',
+                (time.time(), track)
+            )
+
+    def touch_file(self, path: str) -> None:
+        """파일이 속한 결과의 접근 시각 갱신 (/audio 요청 시)"""
+        with self._conn() as conn:
+            conn.execute(
+                'UPDATE results SET accessed_at = ?, access_count = access_count + 1 '
+                'WHERE id IN (SELECT result_id FROM files WHERE path = ?)',
+                (time.time(), str(path))
+            )
+
+    def expired_results(self, max_age_days: float = None, max_bytes: int = None) -> list:
+        """
+        보관 정책에 따라 지울 결과 목록
+
+        마지막 접근 후 max_age_days가 지난 결과, 그리고 전체 용량이 max_bytes를 넘으면
+        가장 오래 접근하지 않은 결과부터 선택한다.
+
+        Returns:
+            list: [{'id', 'track', 'size'}, ...]
+        """
+        rows = self._conn().execute(
+            'SELECT r.id, r.track, r.accessed_at, COALESCE(SUM(f.size), 0) AS size '
+            'FROM results r LEFT JOIN files f ON f.result_id = r.id '
+            'GROUP BY r.id ORDER BY r.accessed_at ASC'
+        ).fetchall()
+
+        expired = []
+        total = sum(row['size'] for row in rows)
+        cutoff = time.time() - max_age_days * 86400 if max_age_days else None
+        for row in rows:
+            too_old = cutoff is not None and row['accessed_at'] < cutoff
+            too_big = max_bytes is not None and total > max_bytes
+            if not (too_old or too_big):
+                # 접근 시각 순이므로 이후 결과는 더 최근
+                break
+            expired.append({'id': row['id'], 'track': row['track'], 'size': row['size']})
+            total -= row['size']
+        return expired
+
+    # ------------------------------------------------------------------
+    # 보관 정책
+    # ------------------------------------------------------------------
+
+    def prune(self, force: bool = False) -> int:
+        """
+        보관 정책 적용: 만료된 결과의 stem과 파생 파일(peak, 믹스, 스트림)을 삭제
+
+        RETENTION_INTERVAL마다 한 번만 실행된다 (force=True면 즉시).
+
+        Returns:
+            삭제한 결과 수
+        """
+        if Config.RESULT_RETENTION_DAYS is None and Config.RESULT_MAX_BYTES is None:
+            return 0
+        with self._prune_lock:
+            now = time.time()
+            if not force and now - self._last_prune < Config.RETENTION_INTERVAL:
+                return 0
+            self._last_prune = now
+
+            expired = self.expired_results(Config.RESULT_RETENTION_DAYS, Config.RESULT_MAX_BYTES)
+            for entry in expired:
+                files = self.result_files(entry['id'])
+                self.remove_result(entry['id'])
+                # 같은 트랙 이름으로 다시 분리된 결과가 있으면 파일은 그 결과의 것
+                if self._conn().execute('SELECT 1 FROM results WHERE track = ?', (entry['track'],)).fetchone():
+                    continue
+                remove_track_files(entry['track'], files)
+
+            if expired:
+                freed = sum(entry['size'] for entry in expired)
+                logger.info(f"보관 정책 적용: 결과 {len(expired)}개 삭제 ({freed / 1024 / 1024:.1f} MB)")
+            return len(expired)
+
+
+def remove_track_files(track: str, files: list) -> None:
+    """
+    트랙의 stem 파일과 파생 파일 삭제
+
+    Args:
+        track: 트랙 이름
+        files: [{'stem', 'path', ...}, ...]
+    """
+    for file in files:
+        Path(file['path']).unlink(missing_ok=True)
+        for spp in Config.PEAK_LEVELS:
+            peaks_path(Config.PEAKS_DIR, f"{track}_{file['stem']}", spp).unlink(missing_ok=True)
+    if files and 'accompaniment' not in {file['stem'] for file in files}:
+        for spp in Config.PEAK_LEVELS:
+            peaks_path(Config.PEAKS_DIR, f"{track}_accompaniment", spp).unlink(missing_ok=True)
+    for mix in Path(Config.MIX_CACHE_DIR).glob(f"{track}_mix_*.wav"):
+        mix.unlink(missing_ok=True)
+    shutil.rmtree(Path(Config.STREAM_CACHE_DIR) / track, ignore_errors=True)
+    logger.debug(f"트랙 파일 삭제: {track}")
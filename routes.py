@@ -1,20 +1,124 @@
 """
 Flask 라우트 정의
 """
-from flask import render_template_string, request, jsonify, send_from_directory
+from flask import Response, request, jsonify, send_file, send_from_directory
 import traceback
+from collections import Counter
+from pathlib import Path
+from urllib.parse import quote, urlencode
+
+import numpy as np
 
 from config import Config
-from downloader import YouTubeDownloader
+from downloader import (
+    YouTubeDownloader, VideoRejectedError, extract_video_id, validate_duration, validate_video_info
+)
 from separator import AudioSeparator
-from templates import HTML_TEMPLATE
-from utils import convert_to_wav, load_audio_with_pydub, cleanup_temp_files
+from fingerprint import compute_fingerprint
+from jobs import Job, JobStore
+from admission import AdmissionController, QueueFullError, Ticket
+from metrics import render_metrics
+from memprofile import MB, profiler
+from result_index import ResultIndex
+from mixer import StemMixer, open_mix_sources
+from streaming import SegmentStreamer
+from realtime import LiveSessions
+from checkpoint import load_source, save_source
+from peaks import choose_level, mix_chunks, peaks_path, write_peaks
+from assets import AssetBundle
+from bundle import BUNDLE_FORMATS, open_bundle
+from presets import available_presets
+from utils import (
+    clean_filename, convert_to_wav, decode_audio, audio_to_tensor, cleanup_temp_files,
+    create_job_workspace, cleanup_workspace, probe_media
+)
 from logger import get_logger
 
 logger = get_logger('routes')
 
 
-def init_routes(app, downloader: YouTubeDownloader, separator: AudioSeparator):
+def result_urls(result: dict) -> dict:
+    """
+    분리 결과의 재생/다운로드 URL
+
+    반주 파일을 미리 만들지 않은 경우 반주는 /mix로 요청 시 생성된다.
+
+    Args:
+        result: 분리 결과
+
+    Returns:
+        dict: {stem 이름: URL}
+    """
+    urls = {name: f"/audio/{quote(Path(path).name)}" for name, path in result['stems'].items()}
+    if result.get('accompaniment'):
+        urls['accompaniment'] = f"/audio/{quote(Path(result['accompaniment']).name)}"
+    elif 'vocals' in result['stems']:
+        track = result.get('track') or clean_filename(result['title'])
+        urls['accompaniment'] = '/mix?' + urlencode({'track': track, 'vocals': 0})
+    return urls
+
+
+def playable_stems(result: dict) -> tuple:
+    """
+    분리 결과의 트랙 이름과 재생할 수 있는 stem 목록 (반주 포함)
+
+    Args:
+        result: 분리 결과
+
+    Returns:
+        tuple: (트랙 이름, stem 이름 목록)
+    """
+    track = result.get('track') or clean_filename(result['title'])
+    names = list(result['stems'])
+    if result.get('accompaniment') or 'vocals' in result['stems']:
+        names.append('accompaniment')
+    return track, names
+
+
+def result_stream_urls(result: dict) -> dict:
+    """
+    분리 결과의 모바일 스트리밍(HLS) URL
+
+    Args:
+        result: 분리 결과
+
+    Returns:
+        dict: {stem 이름: 플레이리스트 URL}
+    """
+    track, names = playable_stems(result)
+    return {name: f"/stream/{quote(track)}/{name}/index.m3u8" for name in names}
+
+
+def result_peaks_urls(result: dict) -> dict:
+    """
+    분리 결과의 파형 peak URL (?width=픽셀 수를 붙이면 맞는 확대 단계를 고름)
+
+    Args:
+        result: 분리 결과
+
+    Returns:
+        dict: {stem 이름: peak URL}
+    """
+    track, names = playable_stems(result)
+    return {name: f"/peaks/{quote(track)}/{name}" for name in names}
+
+
+def result_bundle_urls(result: dict) -> dict:
+    """
+    분리 결과의 묶음 다운로드 URL (모든 stem + 반주)
+
+    Args:
+        result: 분리 결과
+
+    Returns:
+        dict: {형식: URL}
+    """
+    track, _ = playable_stems(result)
+    return {fmt: f"/bundle/{quote(track)}" + ('' if fmt == 'zip' else f"?format={fmt}") for fmt in BUNDLE_FORMATS}
+
+
+def init_routes(app, downloader: YouTubeDownloader, separator: AudioSeparator,
+                jobs: JobStore, result_index: ResultIndex = None, admission: AdmissionController = None):
     """
     Flask 라우트 초기화
 
@@ -22,32 +126,475 @@ def init_routes(app, downloader: YouTubeDownloader, separator: AudioSeparator):
         app: Flask 애플리케이션
         downloader: YouTube 다운로더 인스턴스
         separator: 음원 분리기 인스턴스
+        jobs: 작업 저장소
+        result_index: 작업/결과 인덱스 (None이면 중복 제거와 이력 기록 안 함)
+        admission: 작업 수락 제어 (None이면 Config 한도로 생성)
     """
+    admission = admission or AdmissionController()
+    separator.admission = admission
+    mixer = StemMixer(Config.OUTPUT_DIR, Config.MIX_CACHE_DIR)
+    streamer = SegmentStreamer(Config.STREAM_CACHE_DIR)
+    live_sessions = LiveSessions(separator)
+    separator.live_sessions = live_sessions
+    assets = AssetBundle()
+
+    def stream_sources(track: str, stem: str) -> tuple:
+        """
+        스트리밍할 stem 파일과 게인 (반주 파일이 없으면 보컬을 뺀 stem들의 합)
+
+        Returns:
+            tuple: ({stem 이름: 경로}, {stem 이름: 게인}) (없으면 (None, None))
+        """
+        if track != clean_filename(track):
+            return None, None
+        paths = mixer.stem_paths(track, list(separator.model.sources) + ['accompaniment'])
+        if stem in paths:
+            return {stem: paths[stem]}, {stem: 1.0}
+        if stem == 'accompaniment' and 'vocals' in paths:
+            sources = {name: path for name, path in paths.items() if name not in ('vocals', 'accompaniment')}
+            return sources, {name: 1.0 for name in sources}
+        return None, None
 
     @app.route('/')
     def index():
         """메인 페이지"""
         logger.info("메인 페이지 접속")
-        return render_template_string(HTML_TEMPLATE)
+        return assets.page_response()
+
+    @app.route('/assets/<name>')
+    def static_asset(name):
+        """해시 이름의 CSS/JS/아이콘 (1년 캐시, Accept-Encoding에 따라 br/gzip)"""
+        response = assets.asset_response(name)
+        if response is None:
+            return jsonify({'error': '파일을 찾을 수 없습니다.'}), 404
+        return response
 
     @app.route('/favicon.ico')
     def favicon():
         """favicon 제공"""
-        return '''
-        <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">
-            <text y="80" font-size="80">🎵</text>
-        </svg>
-        ''', 200, {'Content-Type': 'image/svg+xml'}
+        return assets.file_response('favicon.ico')
 
     @app.route('/audio/<path:filename>')
     def serve_audio(filename):
         """오디오 파일 서빙"""
         logger.info(f"오디오 파일 요청: {filename}")
+        if result_index is not None:
+            result_index.touch_file(Config.OUTPUT_DIR / filename)
         return send_from_directory(Config.OUTPUT_DIR, filename)
 
+    @app.route('/jobs/<job_id>')
+    def job_status(job_id):
+        """작업 상태 조회 (디스크에 기록된 stem 목록 포함)"""
+        status = jobs.describe(job_id)
+        if status is None:
+            return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+        return jsonify(status)
+
+    @app.route('/metrics')
+    def metrics():
+        """모니터링 지표 (Prometheus 텍스트, ?format=json이면 JSON)"""
+        stats = admission.stats()
+        memory = profiler.stats()
+        batching = separator.batcher.stats()
+        live = live_sessions.stats()
+        if request.args.get('format') == 'json':
+            return jsonify({'admission': stats, 'rejected_validation': dict(rejections), 'memory': memory,
+                            'batching': batching, 'live': live})
+        samples = [
+            ('separator_jobs_running', 'gauge', '실행 중인 작업 수', stats['running']),
+            ('separator_jobs_queued', 'gauge', '실행을 기다리는 작업 수', stats['queued']),
+            ('separator_queue_capacity', 'gauge', '대기열 최대 길이', stats['max_queued']),
+            ('separator_jobs_admitted_total', 'counter', '수락된 작업 수', stats['admitted_total']),
+            ('separator_jobs_completed_total', 'counter', '실행을 마친 작업 수', stats['completed_total']),
+            ('separator_jobs_rejected_total', 'counter', '한도 초과로 거절된 요청 수',
+             {(('reason', reason),): count for reason, count in stats['rejected_total'].items()}),
+            ('separator_jobs_invalid_total', 'counter', '사전 검증에서 거절된 요청 수',
+             {(('code', code),): count for code, count in rejections.items()}),
+            ('separator_backlog_seconds', 'gauge', '대기열의 예상 남은 처리 시간 (초)', stats['backlog_seconds']),
+            ('separator_realtime_factor', 'gauge', '곡 길이 1초당 예상 처리 시간 (초)', stats['rtf']),
+            ('separator_process_rss_bytes', 'gauge', '현재 프로세스 RSS', int(memory['rss_mb'] * MB)),
+            ('separator_inference_batches_total', 'counter', '실행한 모델 forward 수', batching['batches']),
+            ('separator_inference_batch_items_total', 'counter', 'forward로 처리한 segment 수', batching['items']),
+            ('separator_live_sessions', 'gauge', '열려 있는 실시간 분리 세션 수', live['sessions']),
+            ('separator_live_sessions_rejected_total', 'counter', '세션 한도 초과로 거절된 실시간 세션 수',
+             live['rejected_total']),
+        ]
+        for key, name, description in [
+            ('rss_peak_mb', 'separator_stage_peak_rss_bytes', '단계 동안의 최대 RSS'),
+            ('traced_peak_mb', 'separator_stage_peak_traced_bytes', '단계 동안 tracemalloc으로 추적한 최대 할당'),
+            ('tensor_peak_mb', 'separator_stage_peak_tensor_bytes', '단계 동안의 최대 CUDA/MPS 텐서 할당'),
+        ]:
+            for kind, label in [('last', '마지막 작업'), ('peak', '서버 시작 이후 최대')]:
+                values = {
+                    (('stage', stage),): int(stage_memory[kind][key] * MB)
+                    for stage, stage_memory in memory['stages'].items() if stage_memory[kind].get(key) is not None
+                }
+                if values:
+                    samples.append((f"{name}{'' if kind == 'last' else '_max'}", 'gauge',
+                                    f"{description} ({label})", values))
+        return Response(render_metrics(samples), mimetype='text/plain; version=0.0.4')
+
+    @app.route('/history')
+    def job_history():
+        """최근 작업 목록 (예: /history?limit=20)"""
+        if result_index is None:
+            return jsonify({'jobs': []})
+        try:
+            limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+        except ValueError:
+            return jsonify({'error': 'limit은 정수여야 합니다.'}), 400
+        return jsonify({'jobs': result_index.recent_jobs(limit)})
+
+    @app.route('/mix')
+    def mix_audio():
+        """
+        stem별 게인으로 믹스 생성 (예: /mix?track=곡명&vocals=0.3&drums=0)
+
+        지정하지 않은 stem의 게인은 1.0이다. 같은 게인 조합은 캐시된 파일로 응답한다.
+        """
+        track = request.args.get('track', '')
+        if not track or track != clean_filename(track):
+            return jsonify({'error': '올바른 트랙 이름이 아닙니다.'}), 400
+
+        paths = mixer.stem_paths(track, separator.model.sources)
+        if not paths:
+            return jsonify({'error': '트랙을 찾을 수 없습니다.'}), 404
+
+        gains = {name: 1.0 for name in paths}
+        for name, value in request.args.items():
+            if name == 'track':
+                continue
+            if name not in paths:
+                return jsonify({'error': f'알 수 없는 stem입니다: {name}'}), 400
+            try:
+                gain = float(value)
+            except ValueError:
+                return jsonify({'error': f'게인은 숫자여야 합니다: {name}={value}'}), 400
+            if not 0 <= gain <= Config.MIX_MAX_GAIN:
+                return jsonify({'error': f'게인은 0~{Config.MIX_MAX_GAIN} 범위여야 합니다: {name}'}), 400
+            gains[name] = gain
+
+        download_name = f"{track}_mix.wav"
+        cache_path = mixer.cache_path(track, paths, gains)
+        if cache_path.exists():
+            if result_index is not None:
+                result_index.touch_track(track)
+            logger.info(f"믹스 캐시 사용: {cache_path.name}")
+            return send_file(cache_path.resolve(), mimetype='audio/wav', download_name=download_name, conditional=True)
+
+        if result_index is not None:
+            result_index.touch_track(track)
+        logger.info(f"믹스 생성: {track} {gains}")
+        total_bytes, stream = mixer.stream_mix(paths, gains, cache_path)
+        return Response(stream, mimetype='audio/wav', headers={
+            'Content-Length': str(total_bytes),
+            'Content-Disposition': f"inline; filename*=UTF-8''{quote(download_name)}",
+        })
+
+    @app.route('/stream/<track>/<stem>/index.m3u8')
+    def stream_playlist(track, stem):
+        """stem의 HLS 플레이리스트 (세그먼트는 요청될 때 변환)"""
+        paths, gains = stream_sources(track, stem)
+        if not paths:
+            return jsonify({'error': '트랙을 찾을 수 없습니다.'}), 404
+        if result_index is not None:
+            result_index.touch_track(track)
+        return Response(streamer.playlist(paths, gains), mimetype='application/vnd.apple.mpegurl',
+                        headers={'Cache-Control': 'no-cache'})
+
+    @app.route('/stream/<track>/<stem>/<int:segment_index>.ts')
+    def stream_segment(track, stem, segment_index):
+        """AAC 세그먼트 (처음 요청 시 변환 후 캐시)"""
+        paths, gains = stream_sources(track, stem)
+        if not paths:
+            return jsonify({'error': '트랙을 찾을 수 없습니다.'}), 404
+        try:
+            segment_path = streamer.segment(track, paths, gains, segment_index)
+        except IndexError as e:
+            return jsonify({'error': str(e)}), 404
+        # 세그먼트 URL은 stem 파일이 바뀌어도 같으므로 짧게만 캐시
+        return send_file(segment_path.resolve(), mimetype='video/mp2t', conditional=True, max_age=60)
+
+    @app.route('/peaks/<track>/<stem>')
+    def serve_peaks(track, stem):
+        """
+        파형 peak 파일 (audiowaveform .dat, 8-bit)
+
+        ?spp=픽셀당 샘플 수 또는 ?width=화면 너비로 확대 단계를 고른다.
+        분리 시 만들어 두지 않은 peak(반주 믹스, 이전 결과)은 처음 요청될 때 계산해 저장한다.
+        """
+        paths, gains = stream_sources(track, stem)
+        if not paths:
+            return jsonify({'error': '트랙을 찾을 수 없습니다.'}), 404
+
+        try:
+            spp = int(request.args['spp']) if 'spp' in request.args else None
+            width = int(request.args.get('width', 1000))
+        except ValueError:
+            return jsonify({'error': 'spp와 width는 정수여야 합니다.'}), 400
+
+        if spp is None:
+            _, frames, _, _ = open_mix_sources(paths, gains)
+            spp = choose_level(Config.PEAK_LEVELS, frames, max(width, 1))
+        elif spp not in Config.PEAK_LEVELS:
+            return jsonify({'error': f'지원하는 확대 단계: {Config.PEAK_LEVELS}'}), 400
+
+        prefix = f"{track}_{stem}"
+        path = peaks_path(Config.PEAKS_DIR, prefix, spp)
+        source_mtime = max(Path(p).stat().st_mtime_ns for p in paths.values())
+        if not path.exists() or path.stat().st_mtime_ns < source_mtime:
+            logger.info(f"peak 생성: {prefix}")
+            sr, chunks = mix_chunks(paths, gains)
+            write_peaks(chunks, sr, Config.PEAKS_DIR, prefix)
+
+        return send_file(path.resolve(), mimetype='application/octet-stream', conditional=True, max_age=60)
+
+    @app.route('/bundle/<track>')
+    def download_bundle(track):
+        """
+        여러 stem을 한 번에 다운로드 (예: /bundle/곡명?stems=vocals,drums&format=wav)
+
+        format=zip(기본)이면 stem별 WAV를 무압축 ZIP으로, format=wav면 stem들을 채널로 나란히 담은
+        다채널 WAV 하나로 보낸다. stems를 지정하지 않으면 저장된 모든 stem과 반주를 넣는다.
+        묶음은 보내면서 만들고, Range 요청으로 이어받을 수 있다.
+        """
+        bundle_format = request.args.get('format', 'zip')
+        if bundle_format not in BUNDLE_FORMATS:
+            return jsonify({'error': f"지원하는 형식: {', '.join(BUNDLE_FORMATS)}"}), 400
+
+        available = list(separator.model.sources) + ['accompaniment']
+        requested = [name.strip() for name in request.args.get('stems', '').split(',') if name.strip()]
+        for name in requested:
+            if name not in available:
+                return jsonify({'error': f'알 수 없는 stem입니다: {name}'}), 400
+
+        stems = {}
+        for name in dict.fromkeys(requested or available):
+            paths, gains = stream_sources(track, name)
+            if paths:
+                stems[name] = (paths, gains)
+            elif requested:
+                return jsonify({'error': f'stem을 찾을 수 없습니다: {name}'}), 404
+        if not stems:
+            return jsonify({'error': '트랙을 찾을 수 없습니다.'}), 404
+
+        try:
+            bundle = open_bundle(bundle_format, track, stems)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if result_index is not None:
+            result_index.touch_track(track)
+        logger.info(f"묶음 다운로드: {track} ({bundle_format}, {', '.join(stems)}, {bundle.size / 1024 / 1024:.1f}MB)"
+                    + (f" {request.headers['Range']}" if 'Range' in request.headers else ''))
+        return bundle.response(f"{track}_stems.{bundle.extension}")
+
+    @app.route('/live', methods=['POST'])
+    def open_live_session():
+        """
+        실시간 분리 세션 열기
+
+        쿼리: stem (기본 'accompaniment' = 보컬 제거), channels (1 또는 2), window, overlap (초)
+        이후 /live/<session_id>로 s16le PCM(모델 샘플레이트)을 보내면 분리된 stem PCM(스테레오)을 돌려받는다.
+        """
+        stem = request.args.get('stem', 'accompaniment')
+        if stem != 'accompaniment' and stem not in separator.model.sources:
+            return jsonify({'error': f'알 수 없는 stem입니다: {stem}'}), 400
+        try:
+            channels = int(request.args.get('channels', 2))
+            window = float(request.args['window']) if 'window' in request.args else None
+            overlap = float(request.args['overlap']) if 'overlap' in request.args else None
+        except ValueError:
+            return jsonify({'error': 'channels, window, overlap은 숫자여야 합니다.'}), 400
+        if channels not in (1, 2) or (window is not None and window <= 0) or (overlap is not None and overlap < 0):
+            return jsonify({'error': 'channels는 1 또는 2, window는 양수, overlap은 0 이상이어야 합니다.'}), 400
+
+        session_id, stream = live_sessions.open(stem, channels, window, overlap)
+        if session_id is None:
+            response = jsonify({'error': '실시간 세션이 가득 찼습니다.', 'retry_after': live_sessions.idle_timeout})
+            response.headers['Retry-After'] = str(int(live_sessions.idle_timeout))
+            return response, 429
+        return jsonify({
+            'session_id': session_id,
+            'format': 's16le',
+            'input_channels': channels,
+            'output_channels': 2,
+            **stream.stats(),
+        })
+
+    @app.route('/live/<session_id>', methods=['POST'])
+    def push_live_chunk(session_id):
+        """
+        PCM 조각 보내고 분리가 끝난 구간 받기 (?final=1이면 남은 구간을 모두 받고 세션 종료)
+
+        응답 본문은 s16le 스테레오 PCM (창이 아직 차지 않았으면 비어 있음)이고,
+        X-Live-Start-Frame 헤더는 응답 구간의 시작 위치 (프레임)이다.
+        """
+        session = live_sessions.get(session_id)
+        if session is None:
+            return jsonify({'error': '세션을 찾을 수 없습니다.'}), 404
+        body = request.get_data(cache=False)
+        if len(body) > Config.LIVE_MAX_CHUNK_BYTES:
+            return jsonify({'error': 'PCM 조각이 너무 큽니다.'}), 413
+        channels = session['channels']
+        if len(body) % (2 * channels):
+            return jsonify({'error': f'PCM 길이가 {channels}채널 16-bit 프레임의 배수가 아닙니다.'}), 400
+
+        pcm = np.frombuffer(body, dtype='<i2').reshape(-1, channels).astype(np.float32) / (2**15)
+        final = request.args.get('final') in ('1', 'true')
+        with session['lock']:
+            stream = session['stream']
+            start_frame = stream.frames_out
+            audio = stream.push(pcm)
+            if final:
+                audio = np.concatenate([audio, stream.flush()])
+            stats = stream.stats()
+        if final:
+            live_sessions.close(session_id)
+
+        out = (np.clip(audio, -1.0, 1.0) * 32767).astype('<i2')
+        response = Response(out.tobytes(), mimetype='application/octet-stream')
+        response.headers['X-Live-Start-Frame'] = str(start_frame)
+        response.headers['X-Live-Frames'] = str(len(out))
+        if stats['rtf'] is not None:
+            response.headers['X-Live-RTF'] = str(stats['rtf'])
+        return response
+
+    @app.route('/live/<session_id>', methods=['GET', 'DELETE'])
+    def live_session_status(session_id):
+        """세션 통계 (지연 시간, RTF) 조회, DELETE면 세션 종료"""
+        session = live_sessions.get(session_id)
+        if session is None:
+            return jsonify({'error': '세션을 찾을 수 없습니다.'}), 404
+        stats = session['stream'].stats()
+        if request.method == 'DELETE':
+            live_sessions.close(session_id)
+        return jsonify({'session_id': session_id, **stats})
+
+    def process_audio_file(audio_file: str, title: str, preset: str, workspace, job: Job,
+                           ticket: Ticket = None, resumable: bool = False) -> dict:
+        """
+        다운로드/업로드된 미디어 파일을 변환, 로드, 분리 (YouTube와 업로드 공통)
+
+        stem 파일은 백그라운드로 저장되므로, 반환 시점에 디스크에 있는 stem은 job.ready로 확인한다.
+
+        Args:
+            audio_file: 작업 디렉토리 안의 미디어 파일 경로
+            title: 곡 제목
+            preset: 분리 프리셋
+            workspace: 작업 디렉토리
+            job: 작업 상태
+            ticket: 대기열 자리 (곡 길이로 예상 처리 시간을 갱신)
+            resumable: True면 긴 곡의 분리 결과를 블록마다 작업 디렉토리에 저장 (프로세스가 죽어도 이어서 분리)
+
+        Returns:
+            dict: 작업 상태를 포함한 분리 결과
+        """
+        # 2. wav로 변환
+        logger.info("2️⃣ 오디오 파일 변환 시작")
+        with job.stage('convert'):
+            wav_file = convert_to_wav(audio_file, str(workspace / "audio.wav"), keep_input=resumable)
+
+        # 3. 오디오 로드
+        logger.info("3️⃣ 오디오 파일 로드 시작")
+        # pydub 디코딩과 float32 변환의 메모리 최대값을 따로 기록
+        with job.stage('decode'):
+            audio = decode_audio(wav_file)
+        with job.stage('to_tensor'):
+            wav, sr = audio_to_tensor(audio)
+        del audio
+
+        # 임시 파일 정리 (오디오는 이미 메모리에 로드됨)
+        cleanup_temp_files(wav_file)
+
+        # 4. 지문으로 같은 곡의 기존 결과 확인
+        fingerprint = None
+        duration = wav.shape[-1] / sr
+        if ticket is not None:
+            ticket.update_duration(duration)
+        if result_index is not None and Config.FINGERPRINT_DEDUP:
+            logger.info("4️⃣ 오디오 지문 확인")
+            with job.stage('fingerprint'):
+                fingerprint = compute_fingerprint(wav, sr)
+                result_id, existing = result_index.find_duplicate(fingerprint, duration, separator.model_name, preset)
+            if existing:
+                logger.info(f"✅ 기존 분리 결과 재사용: {existing['title']}")
+                result_index.link_job(job.id, result_id)
+                result_index.touch_track(existing['track'])
+                ready = list(existing['stems']) + (['accompaniment'] if existing.get('accompaniment') else [])
+                job.complete(
+                    {**existing, 'title': title, 'deduplicated_from': existing['title'],
+                     'urls': result_urls(existing), 'stream_urls': result_stream_urls(existing),
+                     'peaks_urls': result_peaks_urls(existing), 'bundle_urls': result_bundle_urls(existing)},
+                    ready=ready
+                )
+                return job.to_dict()
+
+        # 5. 음원 분리 (파일 저장은 백그라운드에서 계속됨)
+        logger.info("5️⃣ 음원 분리 시작")
+        with job.stage('separate'):
+            result = separator.separate(wav, sr, title, preset=preset, job=job,
+                                        workspace=workspace if resumable else None)
+        # 처리 속도 추정은 분리 단계 시간으로만 갱신 (이어서 분리했으면 일부만 분리했으므로 반영하지 않음)
+        if ticket is not None and not result.get('resumed_seconds'):
+            ticket.release(observed_seconds=job.timings['separate'])
+
+        # 모든 stem이 디스크에 기록된 뒤에만 인덱스에 추가
+        if result_index is not None:
+            def index_result(finished_job):
+                if finished_job.status == 'completed':
+                    result_index.add_result(finished_job.id, result, separator.model_name, duration, fingerprint)
+                    result_index.prune()
+            job.add_done_callback(index_result)
+
+        job.complete({**result, 'urls': result_urls(result), 'stream_urls': result_stream_urls(result),
+                      'peaks_urls': result_peaks_urls(result), 'bundle_urls': result_bundle_urls(result)})
+
+        logger.info("="*50)
+        logger.info(f"✅ 분리 완료! (저장 완료 stem: {len(job.ready)}개)")
+        logger.info("="*50)
+        return job.to_dict()
+
+    def client_id() -> str:
+        """클라이언트 식별자 (수락 제어의 클라이언트별 한도에 사용)"""
+        if Config.TRUST_FORWARDED_FOR and request.headers.get('X-Forwarded-For'):
+            return request.headers['X-Forwarded-For'].split(',')[0].strip()
+        return request.remote_addr or 'unknown'
+
+    rejections = Counter()
+
+    def rejected_response(error: VideoRejectedError):
+        """사전 검증 실패 응답 (422 + 오류 코드)"""
+        rejections[error.code] += 1
+        logger.warning(f"작업 거절 ({error.code}): {error}")
+        return jsonify({'error': str(error), 'code': error.code}), 422
+
+    def queue_full_response(error: QueueFullError):
+        """한도 초과 응답 (429 + Retry-After)"""
+        response = jsonify({'error': str(error), 'reason': error.reason, 'retry_after': error.retry_after})
+        response.headers['Retry-After'] = str(error.retry_after)
+        return response, 429
+
+    def join_inflight_job(job: Job):
+        """
+        진행 중인 작업의 결과를 기다려 같은 응답을 반환
+
+        COALESCE_WAIT_TIMEOUT 안에 결과가 나오지 않으면 202와 현재 상태를 반환한다 (/jobs로 확인).
+        """
+        job.wait_result(Config.COALESCE_WAIT_TIMEOUT)
+        status = job.to_dict()
+        if status['status'] == 'failed':
+            return jsonify({'error': status['error'], 'job_id': job.id}), 500
+        if not job.result:
+            return jsonify({'success': False, 'coalesced': True, **status}), 202
+        return jsonify({'success': True, 'coalesced': True, **status})
+
     @app.route('/separate', methods=['POST'])
     def separate_audio():
         """음원 분리 API"""
+        workspace = None
+        job = None
+        ticket = None
         try:
             data = request.json
             youtube_url = data.get('url')
@@ -56,41 +603,166 @@ def init_routes(app, downloader: YouTubeDownloader, separator: AudioSeparator):
                 logger.warning("URL이 제공되지 않음")
                 return jsonify({'error': 'URL이 제공되지 않았습니다.'}), 400
 
+            preset = data.get('preset') or Config.DEFAULT_PRESET
+            if preset not in available_presets():
+                logger.warning(f"알 수 없는 프리셋: {preset}")
+                return jsonify({'error': f'알 수 없는 프리셋입니다: {preset}'}), 400
+
+            # 같은 영상/모델/프리셋 작업이 진행 중이면 다운로드와 분리 없이 그 결과를 받음
+            key = (extract_video_id(youtube_url), separator.model_name, preset)
+            inflight = jobs.inflight(key)
+            if inflight is not None:
+                return join_inflight_job(inflight)
+
+            # 다운로드 전에 메타데이터로 검증 (한도 밖이면 422), 곡 길이는 예상 처리 시간 계산에 사용
+            video_info = None
+            try:
+                video_info = downloader.fetch_info(youtube_url)
+                validate_video_info(video_info)
+            except VideoRejectedError as e:
+                return rejected_response(e)
+            except Exception as e:
+                logger.warning(f"메타데이터 없이 진행: {e}")
+            duration = video_info['duration'] if video_info else None
+
+            # 대기열 자리 확보 (한도를 넘으면 429)
+            try:
+                ticket = admission.admit(client_id(), duration)
+            except QueueFullError as e:
+                return queue_full_response(e)
+
+            job, created = jobs.create_or_attach(key, title=video_info['title'] if video_info else None,
+                                                 source=youtube_url, source_type='youtube')
+            if not created:
+                ticket.release()
+                return join_inflight_job(job)
+
             logger.info(f"="*50)
             logger.info(f"처리 시작: {youtube_url}")
             logger.info(f"="*50)
 
-            # 1. YouTube 다운로드
-            logger.info("1️⃣ YouTube 다운로드 시작")
-            audio_file, title = downloader.download_audio(youtube_url)
+            with ticket:
+                # 같은 영상/모델/프리셋은 같은 작업 디렉토리 (이전 실행이 중간에 죽었으면 원본과 체크포인트를 재사용)
+                workspace = create_job_workspace(Config.TEMP_DIR, key)
 
-            # 2. mp4를 wav로 변환
-            logger.info("2️⃣ 오디오 파일 변환 시작")
-            wav_file = convert_to_wav(
-                audio_file,
-                str(Config.TEMP_DIR / "temp_audio.wav")
-            )
+                # 1. YouTube 다운로드
+                audio_file, title = load_source(workspace)
+                if audio_file:
+                    logger.info("1️⃣ 이전 실행에서 받은 원본 사용 (다운로드 건너뜀)")
+                else:
+                    logger.info("1️⃣ YouTube 다운로드 시작")
+                    with job.stage('download'):
+                        audio_file, title = downloader.download_audio(youtube_url, output_path=workspace,
+                                                                      info=video_info)
+                    save_source(workspace, audio_file, title)
 
-            # 3. 오디오 로드
-            logger.info("3️⃣ 오디오 파일 로드 시작")
-            wav, sr = load_audio_with_pydub(wav_file)
+                result = process_audio_file(audio_file, title, preset, workspace, job, ticket, resumable=True)
 
-            # 4. 음원 분리
-            logger.info("4️⃣ 음원 분리 시작")
-            result = separator.separate(wav, sr, title)
+            # 성공한 작업만 작업 디렉토리 삭제 (실패하면 원본과 체크포인트를 남겨 다음 요청이 이어서 분리,
+            # 재개되지 않은 디렉토리는 시작 시 prune_workspaces가 CHECKPOINT_MAX_AGE 기준으로 정리)
+            cleanup_workspace(workspace)
+            return jsonify({
+                'success': True,
+                **result
+            })
 
-            # 5. 임시 파일 정리
-            cleanup_temp_files(wav_file)
+        except Exception as e:
+            logger.error(f"음원 분리 처리 중 오류: {str(e)}", exc_info=True)
+            if job is not None:
+                job.fail(str(e))
+            return jsonify({'error': str(e)}), 500
+        finally:
+            if ticket is not None:
+                ticket.release()
+
+    @app.route('/upload', methods=['POST'])
+    def upload_audio():
+        """
+        로컬 파일 업로드 후 음원 분리 API
+
+        요청 본문 전체가 파일 내용이며 (multipart 아님), 파일명과 프리셋은 쿼리로 받는다.
+        예: curl -X POST --data-binary @song.mp3 "http://host/upload?filename=song.mp3&preset=fast"
+        """
+        workspace = None
+        job = None
+        ticket = None
+        try:
+            filename = request.args.get('filename') or request.headers.get('X-Filename')
+            if not filename:
+                logger.warning("업로드 파일명이 제공되지 않음")
+                return jsonify({'error': '파일명이 제공되지 않았습니다.'}), 400
+
+            preset = request.args.get('preset') or Config.DEFAULT_PRESET
+            if preset not in available_presets():
+                logger.warning(f"알 수 없는 프리셋: {preset}")
+                return jsonify({'error': f'알 수 없는 프리셋입니다: {preset}'}), 400
+
+            content_length = request.content_length
+            if content_length is not None and content_length > Config.MAX_UPLOAD_BYTES:
+                logger.warning(f"업로드 크기 초과: {content_length} bytes")
+                return jsonify({'error': '파일이 너무 큽니다.'}), 413
+
+            # 본문을 받기 전에 대기열 자리 확보 (한도를 넘으면 429)
+            try:
+                ticket = admission.admit(client_id())
+            except QueueFullError as e:
+                return queue_full_response(e)
 
-            logger.info("="*50)
-            logger.info("✅ 모든 작업 완료!")
-            logger.info("="*50)
+            logger.info(f"="*50)
+            logger.info(f"업로드 처리 시작: {filename}")
+            logger.info(f"="*50)
+
+            workspace = create_job_workspace(Config.TEMP_DIR)
+
+            # 1. 요청 본문을 청크 단위로 작업 디렉토리에 저장 (전체를 메모리에 올리지 않음)
+            logger.info("1️⃣ 업로드 수신 시작")
+            suffix = Path(filename).suffix.lower()[:10]
+            upload_file = workspace / f"upload{suffix}"
+            received = 0
+            with open(upload_file, 'wb') as f:
+                while True:
+                    chunk = request.stream.read(Config.UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    received += len(chunk)
+                    if received > Config.MAX_UPLOAD_BYTES:
+                        logger.warning(f"업로드 크기 초과: {received} bytes 이상")
+                        return jsonify({'error': '파일이 너무 큽니다.'}), 413
+                    f.write(chunk)
 
+            if received == 0:
+                return jsonify({'error': '빈 파일입니다.'}), 400
+            logger.info(f"업로드 수신 완료: {received / 1024 / 1024:.1f} MB")
+
+            # 컨테이너 검증
+            try:
+                media_info = probe_media(upload_file)
+            except ValueError as e:
+                logger.warning(f"업로드 파일 검증 실패: {e}")
+                return jsonify({'error': str(e)}), 415
+            logger.info(f"미디어 확인: {media_info['format']}, {media_info['duration']:.1f}초")
+            try:
+                validate_duration(media_info['duration'])
+            except VideoRejectedError as e:
+                return rejected_response(e)
+            ticket.update_duration(media_info['duration'])
+
+            title = Path(filename).stem
+            job = jobs.create(title, source=filename, source_type='upload')
+            with ticket:
+                result = process_audio_file(str(upload_file), title, preset, workspace, job, ticket)
             return jsonify({
                 'success': True,
                 **result
             })
 
         except Exception as e:
-            logger.error(f"음원 분리 처리 중 오류: {str(e)}", exc_info=True)
-            return jsonify({'error': str(e)}), 500
\ No newline at end of file
+            logger.error(f"업로드 처리 중 오류: {str(e)}", exc_info=True)
+            if job is not None:
+                job.fail(str(e))
+            return jsonify({'error': str(e)}), 500
+        finally:
+            if ticket is not None:
+                ticket.release()
+            if workspace is not None:
+                cleanup_workspace(workspace)
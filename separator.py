@@ -1,33 +1,60 @@
 """
 Demucs 음원 분리 모듈
 """
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
 import torch
 from pathlib import Path
 from demucs.pretrained import get_model
 from demucs.apply import apply_model
 from torchaudio.transforms import Resample
 
-from utils import clean_filename, save_audio_scipy, cleanup_temp_files
+from config import Config
+from utils import (
+    clean_filename, save_audio_wav, cleanup_temp_files, available_cpus, find_active_spans, cpu_supports_bf16
+)
+from presets import resolve_preset
+from peaks import write_peaks, tensor_chunks
+from batching import InferenceBatcher
+from checkpoint import SeparationCheckpoint, audio_digest
+from jobs import Job
 from logger import get_logger
 
 logger = get_logger('separator')
 
 
+def buffer_dtype(precision: str) -> torch.dtype:
+    """분리된 stem을 int16으로 저장하기 전까지 보관하는 형식"""
+    if precision == 'bfloat16':
+        return getattr(torch, Config.REDUCED_BUFFER_DTYPE)
+    return torch.float32
+
+
 class AudioSeparator:
     """Demucs를 사용한 음원 분리 클래스"""
 
-    def __init__(self, model_name: str = 'htdemucs', output_dir: str = './output', use_gpu: bool = True):
+    def __init__(self, model_name: str = 'htdemucs', output_dir: str = './output', use_gpu: bool = True,
+                 precision: str = None, max_batch: int = None, model=None):
         """
         Args:
             model_name: Demucs 모델 이름 (htdemucs, htdemucs_ft, htdemucs_6s)
             output_dir: 출력 디렉토리
             use_gpu: GPU 사용 여부
+            precision: 추론 정밀도 'float32' 또는 'bfloat16' (None이면 Config.INFERENCE_PRECISION)
+            max_batch: 동시 작업의 segment를 묶을 최대 개수 (None이면 Config.INFERENCE_BATCH_MAX, 1이면 끔)
+            model: 이미 만든 모델 (주어지면 model_name으로 로드하지 않음, 부하 테스트의 작은 모델 등)
         """
         self.output_dir = Path(output_dir)
         self.model_name = model_name
 
-        logger.info(f"Demucs 모델 로딩 중: {model_name}")
-        self.model = get_model(model_name)
+        if model is not None:
+            self.model = model
+        else:
+            logger.info(f"Demucs 모델 로딩 중: {model_name}")
+            self.model = get_model(model_name)
 
         # 디바이스 설정
         if use_gpu:
@@ -47,18 +74,289 @@ class AudioSeparator:
         self.model.to(self.device)
         logger.info("모델 로딩 완료")
 
-    def separate(self, wav: torch.Tensor, sr: int, title: str) -> dict:
+        # 추론 정밀도 (bfloat16은 bf16을 지원하는 CPU에서만)
+        self.precision = precision or Config.INFERENCE_PRECISION
+        if self.precision == 'bfloat16':
+            if self.device.type != 'cpu':
+                logger.warning(f"bfloat16 autocast는 CPU 전용입니다. float32 사용 ({self.device})")
+                self.precision = 'float32'
+            elif not cpu_supports_bf16():
+                logger.warning("CPU가 bfloat16을 지원하지 않습니다. float32 사용")
+                self.precision = 'float32'
+            else:
+                logger.info(f"bfloat16 autocast 사용 (stem 보관: {Config.REDUCED_BUFFER_DTYPE})")
+
+        # 결과 파일을 백그라운드로 저장하는 writer
+        self._writer_pool = ThreadPoolExecutor(
+            max_workers=Config.OUTPUT_WRITER_THREADS,
+            thread_name_prefix='stem-writer'
+        )
+
+        # 동시에 처리 중인 분리 작업 수 (auto 프리셋 판단용)
+        self._active_jobs = 0
+        self._active_lock = threading.Lock()
+
+        # 웹 서버의 작업 수락 제어 (init_routes가 연결, 있으면 auto 프리셋이 대기 중인 작업도 고려)
+        self.admission = None
+
+        # 실시간 분리 세션 (init_routes가 연결, 세션은 수락 제어를 거치지 않으므로 auto 프리셋이 따로 셈)
+        self.live_sessions = None
+
+        # bfloat16 실패 후 float32로 영구 전환할 때 사용 (작업마다 시작 시점의 정밀도를 따로 씀)
+        self._precision_lock = threading.Lock()
+
+        # 동시에 분리 중인 작업의 segment를 한 번의 forward로 묶어 실행
+        self.batcher = InferenceBatcher(max_batch, concurrency=lambda: self.active_jobs)
+        if self.batcher.max_batch > 1:
+            for sub_model in getattr(self.model, 'models', [self.model]):
+                self.batcher.wrap(sub_model)
+            logger.info(f"작업 간 배치 추론 사용 (최대 {self.batcher.max_batch}개, "
+                        f"대기 {self.batcher.max_wait * 1000:.0f}ms)")
+
+    @property
+    def active_jobs(self) -> int:
+        """현재 처리 중인 분리 작업 수"""
+        with self._active_lock:
+            return self._active_jobs
+
+    def queue_depth(self) -> int:
+        """
+        이 작업 외에 처리 중이거나 대기 중인 작업 수 (auto 프리셋 판단용)
+
+        작업 수락 제어가 연결되어 있으면 대기열의 작업까지 세고 (이 작업의 실행 슬롯 제외),
+        없으면 (CLI 등) 분리 중인 작업 수를 쓴다. 열려 있는 실시간 세션도 더한다.
         """
-        오디오를 stems로 분리
+        live = self.live_sessions.count() if self.live_sessions is not None else 0
+        if self.admission is not None:
+            return max(self.admission.outstanding() - 1, self.active_jobs) + live
+        return self.active_jobs + live
+
+    def separation_params(self, preset: str, duration: float) -> tuple:
+        """
+        프리셋을 이 모델에 맞는 apply_model 파라미터로 변환
 
         Args:
-            wav: 오디오 텐서 (2, samples)
+            preset: 프리셋 이름 (fast, balanced, quality, auto)
+            duration: 곡 길이 (초)
+
+        Returns:
+            tuple: (적용된 프리셋 이름, apply_model 파라미터 dict)
+        """
+        preset, params = resolve_preset(preset, duration, self.queue_depth(), available_cpus())
+
+        # htdemucs 계열은 학습된 segment 길이를 넘길 수 없음
+        max_segment = getattr(self.model, 'max_allowed_segment', float('inf'))
+        if params['segment'] is not None and params['segment'] > max_segment:
+            logger.debug(f"segment {params['segment']}초 → 모델 최대값 {max_segment}초로 제한")
+            params['segment'] = max_segment
+
+        return preset, params
+
+    def _run_model(self, wav: torch.Tensor, params: dict, precision: str,
+                   checkpoint: SeparationCheckpoint = None) -> tuple:
+        """
+        무음 구간을 건너뛰며 Demucs 실행
+
+        유효 구간만 모델에 넣고 나머지는 0으로 채운다.
+        checkpoint가 있으면 유효 구간을 블록 단위로 분리하고, 이미 저장된 블록은 다시 분리하지 않는다.
+
+        Args:
+            wav: 오디오 텐서 (channels, samples), 모델 샘플레이트
+            params: apply_model 파라미터
+            precision: 이 작업의 추론 정밀도
+            checkpoint: 블록별 결과를 저장/복원할 체크포인트
+
+        Returns:
+            tuple: (sources 텐서 (1, stems, channels, samples), 건너뛴 샘플 수, 체크포인트에서 복원한 샘플 수,
+                    실제로 사용한 정밀도 (bfloat16이 실패하면 float32))
+        """
+        length = wav.shape[-1]
+
+        if Config.SILENCE_SKIP:
+            spans = find_active_spans(
+                wav, self.model.samplerate,
+                threshold_db=Config.SILENCE_THRESHOLD_DB,
+                min_silence=Config.SILENCE_MIN_DURATION,
+                padding=Config.SILENCE_PADDING
+            )
+        else:
+            spans = [(0, length)]
+
+        if checkpoint is None and spans == [(0, length)]:
+            sources, precision = self._apply_model(wav, params, precision)
+            return sources, 0, 0, precision
+
+        skipped = length - sum(end - start for start, end in spans)
+        if skipped:
+            logger.info(f"무음 구간 건너뜀: {skipped / self.model.samplerate:.1f}초 "
+                        f"({skipped / length:.0%}), 유효 구간 {len(spans)}개")
+
+        sources = torch.zeros(1, len(self.model.sources), wav.shape[0], length, dtype=buffer_dtype(precision))
+        resumed = 0
+        for start, end in spans:
+            logger.debug(f"구간 분리: {start} ~ {end}")
+            if checkpoint is None:
+                sources[..., start:end], precision = self._apply_model(wav[:, start:end], params, precision)
+            else:
+                blocks_resumed, precision = self._run_blocks(wav, start, end, params, precision, checkpoint, sources)
+                resumed += blocks_resumed
+        return sources, skipped, resumed, precision
+
+    def _run_blocks(self, wav: torch.Tensor, start: int, end: int, params: dict, precision: str,
+                    checkpoint: SeparationCheckpoint, sources: torch.Tensor) -> tuple:
+        """
+        유효 구간 하나를 블록 단위로 분리하며 블록마다 체크포인트에 저장
+
+        블록의 각 샘플에 겹치는 segment가 모두 포함되도록 앞뒤로 segment 하나씩 더 넣되,
+        시작 위치를 구간 전체의 segment 위치(stride 배수)에 맞춰 apply_model이 같은 segment를 만들게 한다.
+
+        Args:
+            wav: 오디오 텐서 (channels, samples), 모델 샘플레이트
+            start, end: 유효 구간 (샘플)
+            params: apply_model 파라미터
+            precision: 이 작업의 추론 정밀도
+            checkpoint: 블록별 결과를 저장/복원할 체크포인트
+            sources: 결과를 채울 텐서 (1, stems, channels, samples)
+
+        Returns:
+            tuple: (체크포인트에서 복원한 샘플 수, 실제로 사용한 정밀도)
+        """
+        block = int(Config.CHECKPOINT_BLOCK_SECONDS * self.model.samplerate)
+        segment = params['segment'] or max(float(m.segment) for m in getattr(self.model, 'models', [self.model]))
+        segment_length = int(self.model.samplerate * segment)
+        stride = int((1 - params['overlap']) * segment_length)
+        resumed = 0
+        for block_start in range(start, end, block):
+            block_end = min(block_start + block, end)
+            output = checkpoint.load(block_start, block_end)
+            if output is not None:
+                resumed += block_end - block_start
+            else:
+                lo = start + max(0, (block_start - start - segment_length) // stride) * stride
+                hi = min(end, block_end + segment_length)
+                output, precision = self._apply_model(wav[:, lo:hi], params, precision)
+                output = output[0, ..., block_start - lo:block_end - lo]
+                checkpoint.save(block_start, block_end, output)
+                logger.info(f"체크포인트 저장: {block_end / self.model.samplerate:.0f}초 / "
+                            f"{wav.shape[-1] / self.model.samplerate:.0f}초")
+            sources[0, ..., block_start:block_end] = output
+        return resumed, precision
+
+    def _apply_model(self, wav: torch.Tensor, params: dict, precision: str) -> tuple:
+        """
+        apply_model 실행 (bfloat16이면 CPU autocast, 실패하면 float32로 다시 실행)
+
+        정밀도는 호출마다 인자로 받으므로 동시에 실행 중인 다른 작업에 영향을 주지 않는다.
+        bfloat16이 실패하면 이후 작업도 float32를 쓰도록 self.precision을 lock 안에서 바꾼다.
+
+        Args:
+            wav: 오디오 텐서 (channels, samples)
+            params: apply_model 파라미터
+            precision: 추론 정밀도 ('float32' 또는 'bfloat16')
+
+        Returns:
+            tuple: (sources 텐서 (1, stems, channels, samples), CPU, buffer_dtype(precision),
+                    실제로 사용한 정밀도)
+        """
+        mix = wav.unsqueeze(0).to(self.device)
+        if precision == 'bfloat16':
+            try:
+                with torch.no_grad(), torch.autocast('cpu', dtype=torch.bfloat16):
+                    sources = apply_model(self.model, mix, device=self.device, **params)
+                return sources.to(buffer_dtype(precision)), precision
+            except RuntimeError as e:
+                with self._precision_lock:
+                    if self.precision == 'bfloat16':
+                        logger.warning(f"bfloat16 실행 실패, 이후 float32 사용: {e}")
+                        self.precision = 'float32'
+                precision = 'float32'
+
+        with torch.no_grad():
+            sources = apply_model(self.model, mix, device=self.device, **params)
+        return sources.cpu(), precision
+
+    def separate_window(self, wav: torch.Tensor) -> torch.Tensor:
+        """
+        모델 샘플레이트의 짧은 구간 하나를 분리 (실시간 분리용, shift/무음 건너뛰기 없음)
+
+        Args:
+            wav: 오디오 텐서 (2, samples), 모델 샘플레이트
+
+        Returns:
+            sources 텐서 (stems, channels, samples), CPU, buffer_dtype
+        """
+        params = dict(Config.SEPARATION_PRESETS['fast'], shifts=0)
+        sources, _ = self._apply_model(wav, params, self.precision)
+        return sources[0]
+
+    def _write_stem(self, name: str, tensor: torch.Tensor, sr: int, path: Path, job: Job = None) -> None:
+        """
+        stem 하나를 저장하고 디스크에 완전히 기록되면 작업에 알림
+
+        임시 파일에 쓰고 fsync한 뒤 이름을 바꾸므로, 최종 경로의 파일은 항상 완전한 파일이다.
+
+        Args:
+            name: stem 이름
+            tensor: 오디오 텐서 (channels, samples)
             sr: 샘플레이트
-            title: 저장할 파일명
+            path: 최종 저장 경로
+            job: 저장 상태를 알릴 작업
+        """
+        tmp_path = path.with_name(path.name + '.partial')
+        try:
+            with job.stage(f'write:{name}') if job is not None else nullcontext():
+                save_audio_wav(tensor, sr, tmp_path)
+                with open(tmp_path, 'rb+') as f:
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+                logger.info(f"저장 완료: {name} -> {path.name}")
+                self._write_peaks(name, tensor, sr, path)
+            if job is not None:
+                job.mark_stem_ready(name)
+        except Exception as e:
+            cleanup_temp_files(str(tmp_path))
+            if job is None:
+                raise
+            job.mark_stem_failed(name, str(e))
+
+    def _write_peaks(self, name: str, tensor: torch.Tensor, sr: int, path: Path) -> None:
+        """
+        메모리에 있는 stem으로 파형 peak 파일 생성 (실패해도 stem 저장은 성공으로 처리)
+
+        WAV 저장 뒤에 생성하므로 peak 파일이 WAV보다 오래되었다면 이전 결과의 것이다.
+        """
+        try:
+            write_peaks(tensor_chunks(tensor), sr, self.output_dir / Config.PEAKS_DIR.name, path.stem)
+        except Exception as e:
+            logger.warning(f"peak 생성 실패: {name} ({e})")
+
+    def separate_stems(self, wav: torch.Tensor, sr: int, preset: str = None, job: Job = None,
+                       accompaniment: bool = False, workspace: Path = None) -> dict:
+        """
+        오디오를 stems로 분리해 메모리에 있는 텐서로 반환 (파일을 쓰지 않음)
+
+        같은 프로세스에서 분석(키/템포 검출 등)에 바로 쓰는 경우 파일 저장 후 다시 읽는 과정이 필요 없다.
+
+        Args:
+            wav: 오디오 텐서 (channels, samples)
+            sr: 샘플레이트
+            preset: 분리 프리셋 (None이면 Config.DEFAULT_PRESET)
+            job: 단계별 시간을 기록할 작업
+            accompaniment: True면 반주(보컬을 뺀 합)도 포함
+            workspace: 작업 디렉토리 (주어지고 곡이 Config.CHECKPOINT_MIN_SECONDS 이상이면
+                       블록별 체크포인트를 저장하고, 이전 실행의 체크포인트가 있으면 이어서 분리)
 
         Returns:
-            dict: 분리된 파일 정보
+            dict: {'sr': 모델 샘플레이트, 'stems': {stem 이름: 텐서 (channels, samples)},
+                   'preset', 'params', 'precision', 'skipped_seconds', 'skipped_ratio', 'resumed_seconds'}
+                   (bfloat16 모드에서는 텐서가 Config.REDUCED_BUFFER_DTYPE 형식)
         """
+        requested_preset = preset or Config.DEFAULT_PRESET
+        preset, params = self.separation_params(preset, wav.shape[-1] / sr)
+        precision = self.precision
+
+        with self._active_lock:
+            self._active_jobs += 1
         try:
             logger.info("음원 분리 시작")
             logger.debug(f"입력 텐서 shape: {wav.shape}, 샘플레이트: {sr}")
@@ -71,53 +369,166 @@ class AudioSeparator:
             # 리샘플링
             if sr != self.model.samplerate:
                 logger.info(f"리샘플링: {sr} Hz → {self.model.samplerate} Hz")
-                resampler = Resample(sr, self.model.samplerate)
-                wav = resampler(wav)
+                with job.stage('resample') if job is not None else nullcontext():
+                    resampler = Resample(sr, self.model.samplerate)
+                    wav = resampler(wav)
                 sr = self.model.samplerate
 
-            # 배치 차원 추가 및 디바이스로 이동
-            wav = wav.unsqueeze(0).to(self.device)
             logger.debug(f"처리할 텐서 shape: {wav.shape}")
 
-            # 음원 분리 실행
-            logger.info("Demucs 모델 실행 중...")
-            with torch.no_grad():
-                sources = apply_model(self.model, wav, device=self.device)
+            # 긴 곡은 블록별 체크포인트 (같은 입력/모델/프리셋/정밀도의 이전 실행이 있으면 이어서)
+            checkpoint = None
+            if (workspace is not None and Config.CHECKPOINTING
+                    and wav.shape[-1] / sr >= Config.CHECKPOINT_MIN_SECONDS):
+                checkpoint = SeparationCheckpoint(workspace)
+                key = {
+                    'model': self.model_name,
+                    'preset': requested_preset,
+                    'precision': precision,
+                    'length': wav.shape[-1],
+                    'digest': audio_digest(wav),
+                }
+                preset, params = checkpoint.open(key, preset, params)
 
-            # CPU로 이동
-            sources = sources.cpu()
+            # 음원 분리 실행 (무음 구간 제외)
+            logger.info(f"Demucs 모델 실행 중... (프리셋: {preset}, {params})")
+            with job.stage('model') if job is not None else nullcontext():
+                sources, skipped, resumed, precision = self._run_model(wav, params, precision, checkpoint)
+            if resumed:
+                logger.info(f"체크포인트에서 이어서 분리: {resumed / sr:.1f}초 복원")
             logger.info("음원 분리 완료")
             logger.debug(f"출력 sources shape: {sources.shape}")
 
-            # 파일 저장
-            safe_title = clean_filename(title)
             sources_names = self.model.sources
-            logger.info(f"파일 저장 중: {safe_title}")
-
-            saved_files = {}
-            for i, source_name in enumerate(sources_names):
-                output_path = self.output_dir / f"{safe_title}_{source_name}.wav"
-                save_audio_scipy(sources[0, i], sr, output_path)
-                saved_files[source_name] = str(output_path)
-                logger.info(f"저장 완료: {source_name} -> {output_path.name}")
-
-            # 반주 생성 (보컬 제외)
-            logger.info("반주 생성 중...")
-            accompaniment = torch.zeros_like(sources[0, 0])
-            for i, name in enumerate(sources_names):
-                if name != 'vocals':
-                    accompaniment += sources[0, i]
-
-            accompaniment_path = self.output_dir / f"{safe_title}_accompaniment.wav"
-            save_audio_scipy(accompaniment, sr, accompaniment_path)
-            logger.info(f"반주 저장 완료: {accompaniment_path.name}")
+            stems = {name: sources[0, i] for i, name in enumerate(sources_names)}
+
+            # 반주 생성 (전체 합에서 보컬을 빼는 한 번의 reduction)
+            if accompaniment:
+                mix = sources[0].sum(dim=0, dtype=torch.float32)
+                if 'vocals' in sources_names:
+                    mix -= sources[0, sources_names.index('vocals')]
+                stems['accompaniment'] = mix.to(sources.dtype)
 
             return {
-                'title': title,
-                'stems': saved_files,
-                'accompaniment': str(accompaniment_path)
+                'sr': sr,
+                'stems': stems,
+                'preset': preset,
+                'params': params,
+                'precision': precision,
+                'skipped_seconds': round(skipped / sr, 2),
+                'skipped_ratio': round(skipped / wav.shape[-1], 4),
+                'resumed_seconds': round(resumed / sr, 2)
             }
 
         except Exception as e:
             logger.error(f"음원 분리 실패: {str(e)}", exc_info=True)
-            raise Exception(f"음원 분리 실패: {str(e)}")
\ No newline at end of file
+            raise Exception(f"음원 분리 실패: {str(e)}")
+        finally:
+            with self._active_lock:
+                self._active_jobs -= 1
+
+    def iter_stems(self, wav: torch.Tensor, sr: int, preset: str = None, segment_seconds: float = None,
+                   as_numpy: bool = False, accompaniment: bool = False):
+        """
+        separate_stems 결과를 stem별로 (segment_seconds가 있으면 구간별로) 나눠 내보내는 generator
+
+        점진적으로 분리하는 스트리밍이 아니다. 첫 구간을 내보내기 전에 곡 전체를 분리하므로
+        메모리 최대값과 첫 구간까지 걸리는 시간은 separate_stems와 같다.
+        내보내는 구간은 결과 텐서의 view이다 (as_numpy이고 float32가 아닌 경우에만 구간 단위로 변환).
+
+        사용법:
+            for chunk in separator.iter_stems(wav, sr, segment_seconds=30, as_numpy=True):
+                analyze(chunk['name'], chunk['audio'], chunk['sr'])
+
+        Args:
+            wav: 오디오 텐서 (channels, samples)
+            sr: 샘플레이트
+            preset: 분리 프리셋
+            segment_seconds: 구간 길이 (초, None이면 stem 전체)
+            as_numpy: True면 np.ndarray (float32), False면 torch 텐서
+            accompaniment: True면 반주도 포함
+
+        Yields:
+            dict: {'name': stem 이름, 'sr': 샘플레이트, 'start': 시작 프레임, 'audio': (channels, frames)}
+        """
+        separated = self.separate_stems(wav, sr, preset=preset, accompaniment=accompaniment)
+        sr = separated['sr']
+        for name, tensor in separated['stems'].items():
+            frames = tensor.shape[-1]
+            step = int(segment_seconds * sr) if segment_seconds else frames
+            for start in range(0, frames, max(step, 1)):
+                audio = tensor[:, start:start + step]
+                if as_numpy:
+                    audio = audio.float().numpy()
+                yield {'name': name, 'sr': sr, 'start': start, 'audio': audio}
+
+    def write_stems(self, stems: dict, sr: int, title: str, job: Job = None) -> dict:
+        """
+        stem 텐서를 WAV 파일로 저장 (separate_stems 결과의 파일 출력)
+
+        job이 주어지면 백그라운드 writer에 넘기고 바로 반환하며, 각 stem이 디스크에 기록될 때마다
+        job에 표시된다. job이 없으면 모든 파일이 저장된 뒤 반환한다.
+
+        Args:
+            stems: {stem 이름: 텐서 (channels, samples)}
+            sr: 샘플레이트
+            title: 저장할 파일명
+            job: 저장 상태를 추적할 작업
+
+        Returns:
+            dict: {stem 이름: 저장 경로}
+        """
+        safe_title = clean_filename(title)
+        paths = {name: self.output_dir / f"{safe_title}_{name}.wav" for name in stems}
+        logger.info(f"파일 저장 중: {safe_title}")
+
+        if job is not None:
+            job.expect_stems(list(stems))
+        futures = [
+            self._writer_pool.submit(self._write_stem, name, tensor, sr, paths[name], job)
+            for name, tensor in stems.items()
+        ]
+
+        # 작업이 없으면 (벤치마크 등) 저장이 끝날 때까지 대기
+        if job is None:
+            for future in futures:
+                future.result()
+        return paths
+
+    def separate(self, wav: torch.Tensor, sr: int, title: str, preset: str = None, job: Job = None,
+                 workspace: Path = None) -> dict:
+        """
+        오디오를 stems로 분리하고 WAV 파일로 저장
+
+        job이 주어지면 파일 저장은 백그라운드에서 진행되고, 각 stem이 디스크에 기록될 때마다
+        job에 표시된다. job이 없으면 모든 파일이 저장된 뒤 반환한다.
+
+        Args:
+            wav: 오디오 텐서 (2, samples)
+            sr: 샘플레이트
+            title: 저장할 파일명
+            preset: 분리 프리셋 (None이면 Config.DEFAULT_PRESET)
+            job: 저장 상태를 추적할 작업
+            workspace: 체크포인트를 저장할 작업 디렉토리 (separate_stems 참고)
+
+        Returns:
+            dict: 분리된 파일 정보
+        """
+        # 반주는 기본값으로 미리 만들지 않고 /mix에서 요청 시 생성
+        separated = self.separate_stems(wav, sr, preset=preset, job=job,
+                                        accompaniment=Config.EAGER_ACCOMPANIMENT, workspace=workspace)
+        paths = self.write_stems(separated['stems'], separated['sr'], title, job)
+
+        accompaniment_path = paths.get('accompaniment')
+        return {
+            'title': title,
+            'track': clean_filename(title),
+            'model': self.model_name,
+            'stems': {name: str(paths[name]) for name in self.model.sources},
+            'accompaniment': str(accompaniment_path) if accompaniment_path else None,
+            'preset': separated['preset'],
+            'params': separated['params'],
+            'precision': separated['precision'],
+            'skipped_seconds': separated['skipped_seconds'],
+            'skipped_ratio': separated['skipped_ratio']
+        }
\ No newline at end of file
@@ -0,0 +1,423 @@
+let wakeLock = null;
+
+// Wake Lock 요청 (화면 꺼짐 방지)
+async function requestWakeLock() {
+    try {
+        if ('wakeLock' in navigator) {
+            wakeLock = await navigator.wakeLock.request('screen');
+            wakeLock.addEventListener('release', () => {
+                console.log('Wake Lock 해제됨');
+            });
+        }
+    } catch (err) {
+        console.log('Wake Lock 오류:', err);
+    }
+}
+
+// 오디오 재생 시 Wake Lock 활성화
+document.addEventListener('play', (e) => {
+    if (e.target.tagName === 'AUDIO') {
+        requestWakeLock();
+    }
+}, true);
+
+// 오디오 정지 시 Wake Lock 해제
+document.addEventListener('pause', (e) => {
+    if (e.target.tagName === 'AUDIO') {
+        if (wakeLock !== null) {
+            wakeLock.release().then(() => {
+                wakeLock = null;
+            });
+        }
+    }
+}, true);
+
+async function separateAudio() {
+    const url = document.getElementById('youtube_url').value;
+    const preset = document.getElementById('preset').value;
+
+    if (!url) {
+        showStatus('YouTube URL을 입력해주세요.', 'error');
+        return;
+    }
+
+    await runSeparation(() => fetch('/separate', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({ url: url, preset: preset })
+    }));
+}
+
+async function uploadAudio() {
+    const file = document.getElementById('audio_file').files[0];
+    const preset = document.getElementById('preset').value;
+
+    if (!file) {
+        showStatus('업로드할 오디오 파일을 선택해주세요.', 'error');
+        return;
+    }
+
+    // 파일 내용을 그대로 본문으로 전송 (서버가 청크 단위로 저장)
+    const query = `filename=${encodeURIComponent(file.name)}&preset=${encodeURIComponent(preset)}`;
+    await runSeparation(() => fetch(`/upload?${query}`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/octet-stream',
+        },
+        body: file
+    }));
+}
+
+async function runSeparation(sendRequest) {
+    const spinner = document.getElementById('spinner');
+    const buttons = document.querySelectorAll('.container > button');
+    const audioPlayer = document.getElementById('audioPlayer');
+
+    buttons.forEach(button => button.disabled = true);
+    spinner.style.display = 'block';
+    audioPlayer.style.display = 'none';
+    showStatus('처리 중입니다... 잠시만 기다려주세요.\\n(첫 실행 시 모델 다운로드로 시간이 걸릴 수 있습니다)', 'info');
+
+    try {
+        const response = await sendRequest();
+        const data = await response.json();
+
+        if (response.ok) {
+            let message = '✅ 완료! 아래에서 바로 들어보세요.';
+            if (data.skipped_seconds > 0) {
+                message += `\\n(무음 ${data.skipped_seconds}초는 분리를 건너뛰었습니다)`;
+            }
+            showStatus(message, 'success');
+            createAudioPlayers(data);
+        } else {
+            showStatus(`❌ 오류: ${data.error}`, 'error');
+        }
+    } catch (error) {
+        showStatus(`❌ 오류: ${error.message}`, 'error');
+    } finally {
+        buttons.forEach(button => button.disabled = false);
+        spinner.style.display = 'none';
+    }
+}
+
+function createAudioPlayers(data) {
+    const audioPlayer = document.getElementById('audioPlayer');
+    const playerTitle = document.getElementById('playerTitle');
+    const playersContainer = document.getElementById('playersContainer');
+
+    playerTitle.textContent = data.title;
+    playersContainer.innerHTML = '';
+
+    // 모바일 안내 메시지
+    if (/iPhone|iPad|iPod|Android/i.test(navigator.userAgent)) {
+        const mobileNotice = document.createElement('div');
+        mobileNotice.style.cssText = `
+            background: #fff3cd;
+            border: 1px solid #ffc107;
+            border-radius: 8px;
+            padding: 12px;
+            margin-bottom: 15px;
+            font-size: 0.9em;
+            color: #856404;
+        `;
+        mobileNotice.innerHTML = `
+            <strong>📱 모바일 재생 팁:</strong><br>
+            • Chrome/Safari에서 백그라운드 재생이 제한될 수 있습니다<br>
+            • 화면을 켜둔 상태로 사용하세요<br>
+            • 다운로드 후 기본 음악 앱에서 재생하면 더 좋습니다
+        `;
+        playersContainer.appendChild(mobileNotice);
+    }
+
+    const stemNames = {
+        'vocals': '🎤 보컬',
+        'drums': '🥁 드럼',
+        'bass': '🎸 베이스',
+        'other': '🎹 기타 악기',
+        'accompaniment': '🎵 반주 (전체)'
+    };
+
+    const ready = new Set(data.ready || []);
+    if (data.status === 'completed') {
+        // 반주는 모든 stem이 저장된 뒤 /mix로 생성됨
+        Object.keys(data.urls || {}).forEach(stem => ready.add(stem));
+    }
+
+    for (const [stem, url] of Object.entries(data.urls || {})) {
+        const streamUrl = (data.stream_urls || {})[stem];
+        const peaksUrl = (data.peaks_urls || {})[stem];
+        createStemPlayer(stem, url, streamUrl, peaksUrl, stemNames[stem] || stem, ready.has(stem));
+    }
+
+    createMixer(data);
+    createBundleLinks(data);
+    audioPlayer.style.display = 'block';
+
+    // 아직 저장 중인 stem이 있으면 저장되는 대로 플레이어 활성화
+    if (data.job_id && data.status !== 'completed') {
+        pollJob(data.job_id, ready);
+    }
+}
+
+async function pollJob(jobId, shown) {
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        let job;
+        try {
+            const response = await fetch(`/jobs/${jobId}`);
+            if (!response.ok) return;
+            job = await response.json();
+        } catch (error) {
+            continue;
+        }
+
+        const readyStems = job.status === 'completed' ? Object.keys(job.urls) : job.ready;
+        for (const stem of readyStems) {
+            if (!shown.has(stem)) {
+                shown.add(stem);
+                activateStemPlayer(stem);
+            }
+        }
+
+        if (job.status === 'failed') {
+            showStatus(`❌ 일부 파일 저장 실패: ${job.error}`, 'error');
+            return;
+        }
+        if (job.status === 'completed') {
+            document.getElementById('mixButton').disabled = false;
+            activateBundleLinks();
+            return;
+        }
+    }
+}
+
+function createStemPlayer(stem, url, streamUrl, peaksUrl, displayName, ready) {
+    const playersContainer = document.getElementById('playersContainer');
+
+    const playerDiv = document.createElement('div');
+    playerDiv.className = 'stem-player';
+    playerDiv.id = `stem-${stem}`;
+    playerDiv.dataset.url = url;
+    playerDiv.dataset.streamUrl = streamUrl || '';
+    playerDiv.dataset.peaksUrl = peaksUrl || '';
+    playerDiv.dataset.displayName = displayName;
+    playersContainer.appendChild(playerDiv);
+
+    if (ready) {
+        activateStemPlayer(stem);
+    } else {
+        playerDiv.innerHTML = `
+            <div class="stem-header">
+                <span class="stem-name">${displayName}</span>
+                <span class="stem-pending">⏳ 저장 중...</span>
+            </div>
+        `;
+    }
+}
+
+function createMixer(data) {
+    const playersContainer = document.getElementById('playersContainer');
+    const stems = Object.keys(data.stems || {});
+    if (!data.track || stems.length === 0) return;
+
+    const mixerDiv = document.createElement('div');
+    mixerDiv.className = 'stem-player';
+    mixerDiv.innerHTML = `
+        <div class="stem-header">
+            <span class="stem-name">🎚️ 나만의 믹스</span>
+        </div>
+        ${stems.map(stem => `
+            <div class="mix-row">
+                <span>${stem}</span>
+                <input type="range" min="0" max="200" value="100" data-stem="${stem}"
+                       oninput="this.nextElementSibling.textContent = this.value + '%'">
+                <span>100%</span>
+            </div>
+        `).join('')}
+        <button id="mixButton" ${data.status === 'completed' ? '' : 'disabled'}>믹스 듣기</button>
+        <audio controls preload="none" id="audio-mix"></audio>
+    `;
+    playersContainer.appendChild(mixerDiv);
+
+    document.getElementById('mixButton').addEventListener('click', () => {
+        const params = new URLSearchParams({ track: data.track });
+        mixerDiv.querySelectorAll('input[type="range"]').forEach(slider => {
+            params.set(slider.dataset.stem, (slider.value / 100).toFixed(2));
+        });
+        const audio = document.getElementById('audio-mix');
+        audio.src = `/mix?${params}`;
+        audio.play();
+    });
+}
+
+function createBundleLinks(data) {
+    // 모든 stem을 ZIP 또는 다채널 WAV 하나로 받기 (stem이 모두 저장된 뒤 활성화)
+    const urls = data.bundle_urls || {};
+    if (!urls.zip) return;
+
+    const bundleDiv = document.createElement('div');
+    bundleDiv.className = 'stem-player';
+    bundleDiv.id = 'bundle';
+    bundleDiv.innerHTML = `
+        <div class="stem-header">
+            <span class="stem-name">📦 전체 다운로드</span>
+            <span class="stem-pending">⏳ 저장 중...</span>
+        </div>
+        <div class="bundle-links">
+            <a href="${urls.zip}" download class="download-btn">ZIP (stem별 WAV)</a>
+            ${urls.wav ? `<a href="${urls.wav}" download class="download-btn">다채널 WAV</a>` : ''}
+        </div>
+    `;
+    document.getElementById('playersContainer').appendChild(bundleDiv);
+
+    if (data.status === 'completed') {
+        activateBundleLinks();
+    }
+}
+
+function activateBundleLinks() {
+    const bundleDiv = document.getElementById('bundle');
+    if (!bundleDiv) return;
+    bundleDiv.querySelector('.stem-pending').style.display = 'none';
+    bundleDiv.querySelector('.bundle-links').classList.add('ready');
+}
+
+function activateStemPlayer(stem) {
+    const playerDiv = document.getElementById(`stem-${stem}`);
+    if (!playerDiv) return;
+    const url = playerDiv.dataset.url;
+    const streamUrl = playerDiv.dataset.streamUrl;
+    const displayName = playerDiv.dataset.displayName;
+    const filename = decodeURIComponent(url.split('/').pop());
+
+    // HLS를 재생할 수 있는 브라우저(iOS/Android 등)는 AAC 스트림, 나머지는 WAV 재생
+    playerDiv.innerHTML = `
+        <div class="stem-header">
+            <span class="stem-name">${displayName}</span>
+            <a href="${url}" download class="download-btn">다운로드</a>
+        </div>
+        <canvas class="waveform" id="wave-${stem}"></canvas>
+        <audio controls preload="metadata" id="audio-${stem}">
+            ${streamUrl ? `<source src="${streamUrl}" type="application/vnd.apple.mpegurl">` : ''}
+            <source src="${url}" type="audio/wav">
+            브라우저가 오디오 재생을 지원하지 않습니다.
+        </audio>
+    `;
+
+    const audioElement = document.getElementById(`audio-${stem}`);
+    drawWaveform(playerDiv, audioElement);
+
+    // iOS Safari에서 오디오 로드 강제
+    if (/iPhone|iPad|iPod/i.test(navigator.userAgent)) {
+        audioElement.load();
+    }
+
+    // Media Session API 설정
+    if ('mediaSession' in navigator) {
+        audioElement.addEventListener('play', () => {
+            updateMediaSession(displayName, filename);
+        });
+
+        audioElement.addEventListener('ended', () => {
+            if ('mediaSession' in navigator) {
+                navigator.mediaSession.playbackState = 'paused';
+            }
+        });
+    }
+}
+
+async function drawWaveform(playerDiv, audioElement) {
+    // 서버에서 미리 계산한 peak 파일로 파형 표시 (WAV를 받지 않음)
+    const canvas = playerDiv.querySelector('canvas.waveform');
+    if (!canvas) return;
+    if (!playerDiv.dataset.peaksUrl) {
+        canvas.remove();
+        return;
+    }
+
+    const ratio = window.devicePixelRatio || 1;
+    canvas.width = Math.round(canvas.clientWidth * ratio);
+    canvas.height = Math.round(canvas.clientHeight * ratio);
+
+    let buffer;
+    try {
+        const response = await fetch(`${playerDiv.dataset.peaksUrl}?width=${canvas.width}`);
+        if (!response.ok) throw new Error(response.statusText);
+        buffer = await response.arrayBuffer();
+    } catch (error) {
+        canvas.remove();
+        return;
+    }
+
+    // audiowaveform .dat 헤더: version, flags, sample_rate, samples_per_pixel, length (각 4바이트)
+    const length = new DataView(buffer).getUint32(16, true);
+    const peaks = new Int8Array(buffer, 20, length * 2);
+    const context = canvas.getContext('2d');
+    const middle = canvas.height / 2;
+    const scale = middle / 128;
+
+    const render = () => {
+        const played = audioElement.duration ? audioElement.currentTime / audioElement.duration : 0;
+        context.clearRect(0, 0, canvas.width, canvas.height);
+        for (let x = 0; x < canvas.width; x++) {
+            const start = Math.floor(x * length / canvas.width);
+            const end = Math.max(Math.floor((x + 1) * length / canvas.width), start + 1);
+            let low = 127, high = -128;
+            for (let i = start; i < end && i < length; i++) {
+                low = Math.min(low, peaks[2 * i]);
+                high = Math.max(high, peaks[2 * i + 1]);
+            }
+            context.fillStyle = x / canvas.width < played ? '#667eea' : '#c5cae9';
+            context.fillRect(x, middle - high * scale, 1, Math.max((high - low) * scale, 1));
+        }
+    };
+
+    render();
+    audioElement.addEventListener('timeupdate', render);
+    canvas.addEventListener('click', (event) => {
+        if (!audioElement.duration) return;
+        const rect = canvas.getBoundingClientRect();
+        audioElement.currentTime = (event.clientX - rect.left) / rect.width * audioElement.duration;
+    });
+}
+
+function updateMediaSession(title, filename) {
+    if ('mediaSession' in navigator) {
+        navigator.mediaSession.metadata = new MediaMetadata({
+            title: title,
+            artist: document.getElementById('playerTitle').textContent || 'YouTube 음원 분리기',
+            album: '분리된 음원',
+            artwork: [
+                { src: 'https://via.placeholder.com/96', sizes: '96x96', type: 'image/png' },
+                { src: 'https://via.placeholder.com/128', sizes: '128x128', type: 'image/png' },
+                { src: 'https://via.placeholder.com/192', sizes: '192x192', type: 'image/png' },
+                { src: 'https://via.placeholder.com/256', sizes: '256x256', type: 'image/png' },
+                { src: 'https://via.placeholder.com/384', sizes: '384x384', type: 'image/png' },
+                { src: 'https://via.placeholder.com/512', sizes: '512x512', type: 'image/png' }
+            ]
+        });
+
+        navigator.mediaSession.setActionHandler('play', () => {
+            const audios = document.querySelectorAll('audio');
+            audios.forEach(audio => {
+                if (!audio.paused) {
+                    audio.play();
+                }
+            });
+        });
+
+        navigator.mediaSession.setActionHandler('pause', () => {
+            const audios = document.querySelectorAll('audio');
+            audios.forEach(audio => audio.pause());
+        });
+    }
+}
+
+function showStatus(message, type) {
+    const statusDiv = document.getElementById('status');
+    statusDiv.textContent = message;
+    statusDiv.className = type;
+    statusDiv.style.display = 'block';
+}
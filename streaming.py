@@ -0,0 +1,216 @@
+"""
+모바일 재생용 HLS 스트리밍 모듈
+
+stem WAV를 짧은 시간 구간(segment)으로 나눠 요청된 구간만 AAC(MPEG-TS)로 변환한다.
+변환한 구간은 디스크에 캐시되므로 실제로 재생된 부분만 한 번씩 인코딩된다.
+
+세그먼트를 따로 인코딩하면 세그먼트마다 인코더 priming과 끝 padding이 들어가 경계에서 끊김/클릭이 생긴다.
+그래서 세그먼트 경계를 AAC 프레임(1024 샘플) 단위에 맞추고, 앞뒤로 프레임 몇 개를 더 넣어(pre-roll) 인코딩한 뒤
+세그먼트 구간의 프레임만 남겨 곡 전체 기준 타임스탬프로 MPEG-TS에 담는다. 이어서 재생하면 디코더가
+이전 세그먼트의 마지막 프레임과 겹쳐 더하므로 곡 전체를 한 번에 인코딩한 것처럼 이어진다.
+"""
+import hashlib
+import json
+import math
+import os
+import subprocess
+import uuid
+from pathlib import Path
+
+from config import Config
+from mixer import open_mix_sources, mix_frames
+from logger import get_logger
+
+logger = get_logger('streaming')
+
+AAC_FRAME_SAMPLES = 1024    # AAC 프레임 하나의 샘플 수
+PREROLL_FRAMES = 2          # 세그먼트 앞에 더 인코딩하는 프레임 수 (인코더 priming + MDCT 겹침)
+POSTROLL_FRAMES = 1         # 세그먼트 뒤에 더 인코딩하는 프레임 수 (마지막 프레임이 padding 없이 인코딩되도록)
+
+
+def split_adts(data: bytes) -> list:
+    """
+    ADTS 스트림을 AAC 프레임 단위로 나누기
+
+    Args:
+        data: ADTS bytes
+
+    Returns:
+        list: 프레임별 bytes (ADTS 헤더 포함)
+
+    Raises:
+        ValueError: ADTS 동기 워드가 맞지 않을 때
+    """
+    frames = []
+    position = 0
+    while position + 7 <= len(data):
+        if data[position] != 0xFF or data[position + 1] & 0xF0 != 0xF0:
+            raise ValueError(f"ADTS 동기 워드가 아닙니다 (위치 {position})")
+        length = ((data[position + 3] & 0x03) << 11) | (data[position + 4] << 3) | (data[position + 5] >> 5)
+        frames.append(data[position:position + length])
+        position += length
+    return frames
+
+
+class SegmentStreamer:
+    """stem(또는 stem 믹스)을 HLS 플레이리스트와 AAC 세그먼트로 제공"""
+
+    def __init__(self, cache_dir: str, segment_seconds: float = None, bitrate: str = None):
+        """
+        Args:
+            cache_dir: 변환한 세그먼트를 저장할 디렉토리
+            segment_seconds: 세그먼트 길이 (초, None이면 Config.STREAM_SEGMENT_SECONDS)
+            bitrate: AAC 비트레이트 (None이면 Config.STREAM_BITRATE)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_seconds = segment_seconds or Config.STREAM_SEGMENT_SECONDS
+        self.bitrate = bitrate or Config.STREAM_BITRATE
+
+    def source_key(self, paths: dict, gains: dict) -> str:
+        """
+        원본 stem 파일 버전과 인코딩 설정으로 캐시 키 결정
+
+        같은 제목으로 다시 분리해 stem이 바뀌면 이전 세그먼트는 사용하지 않는다.
+        """
+        key = json.dumps({
+            'gains': {name: round(gains[name], 3) for name in sorted(gains)},
+            'mtimes': {name: Path(paths[name]).stat().st_mtime_ns for name in sorted(paths)},
+            'segment': self.segment_seconds,
+            'bitrate': self.bitrate,
+            'preroll': [PREROLL_FRAMES, POSTROLL_FRAMES],
+        }, sort_keys=True)
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+    def playlist(self, paths: dict, gains: dict) -> str:
+        """
+        VOD HLS 플레이리스트 생성 (세그먼트 URL은 플레이리스트 기준 상대 경로)
+
+        Args:
+            paths: {stem 이름: 경로}
+            gains: {stem 이름: 게인}
+
+        Returns:
+            m3u8 문자열
+        """
+        _, frames, _, sr = open_mix_sources(paths, gains)
+        segment_frames = self.segment_frames(sr)
+        count = max(math.ceil(frames / segment_frames), 1)
+
+        lines = [
+            '#EXTM3U',
+            '#EXT-X-VERSION:3',
+            f'#EXT-X-TARGETDURATION:{math.ceil(segment_frames / sr)}',
+            '#EXT-X-MEDIA-SEQUENCE:0',
+            '#EXT-X-PLAYLIST-TYPE:VOD',
+        ]
+        for index in range(count):
+            length = min(segment_frames, frames - index * segment_frames)
+            lines.append(f'#EXTINF:{length / sr:.3f},')
+            lines.append(f'{index}.ts')
+        lines.append('#EXT-X-ENDLIST')
+        return '\n'.join(lines) + '\n'
+
+    def segment(self, track: str, paths: dict, gains: dict, index: int) -> Path:
+        """
+        세그먼트 파일 경로 (캐시에 없으면 변환)
+
+        캐시는 트랙별 디렉토리에 저장되므로 결과를 지울 때 함께 지울 수 있다.
+
+        Args:
+            track: 트랙 이름
+            paths: {stem 이름: 경로}
+            gains: {stem 이름: 게인}
+            index: 세그먼트 번호 (0부터)
+
+        Returns:
+            MPEG-TS 세그먼트 파일 경로
+
+        Raises:
+            IndexError: 범위를 벗어난 세그먼트 번호
+        """
+        segment_path = self.cache_dir / track / self.source_key(paths, gains) / f"{index}.ts"
+        if segment_path.exists():
+            logger.debug(f"세그먼트 캐시 사용: {segment_path}")
+            return segment_path
+
+        active, frames, channels, sr = open_mix_sources(paths, gains)
+        segment_frames = self.segment_frames(sr)
+        start = index * segment_frames
+        if index < 0 or start >= max(frames, 1):
+            raise IndexError(f"세그먼트 범위 초과: {index}")
+        end = min(start + segment_frames, frames)
+
+        # 세그먼트 앞뒤로 프레임을 더 넣어 인코딩 (앞부분은 AAC 프레임 격자에 맞춤)
+        encode_start = max(start - PREROLL_FRAMES * AAC_FRAME_SAMPLES, 0)
+        encode_end = min(end + POSTROLL_FRAMES * AAC_FRAME_SAMPLES, frames)
+        pcm = mix_frames(active, encode_start, encode_end, channels)
+
+        # 인코더의 첫 프레임은 priming (타임스탬프 -1024), 이후 프레임 i는 encode_start + (i - 1) * 1024부터
+        aac_frames = self._encode_adts(pcm, channels, sr)
+        first = (start - encode_start) // AAC_FRAME_SAMPLES + 1
+        last = -(-(end - encode_start) // AAC_FRAME_SAMPLES) + 1
+        segment_path.parent.mkdir(parents=True, exist_ok=True)
+        self._mux(b''.join(aac_frames[first:last]), start / sr, segment_path)
+        return segment_path
+
+    def segment_frames(self, sr: int) -> int:
+        """세그먼트 길이 (샘플, AAC 프레임 단위로 맞춤)"""
+        return max(round(self.segment_seconds * sr / AAC_FRAME_SAMPLES), 1) * AAC_FRAME_SAMPLES
+
+    def _encode_adts(self, pcm: bytes, channels: int, sr: int) -> list:
+        """
+        PCM 구간을 AAC(ADTS)로 인코딩
+
+        Args:
+            pcm: 16-bit PCM bytes
+            channels: 채널 수
+            sr: 샘플레이트
+
+        Returns:
+            list: AAC 프레임별 bytes
+        """
+        cmd = [
+            'ffmpeg', '-v', 'error',
+            '-f', 's16le', '-ar', str(sr), '-ac', str(channels), '-i', 'pipe:0',
+            '-c:a', 'aac', '-b:a', self.bitrate,
+            '-f', 'adts', 'pipe:1'
+        ]
+        try:
+            completed = subprocess.run(cmd, input=pcm, capture_output=True, timeout=60)
+            if completed.returncode != 0:
+                raise RuntimeError(completed.stderr.decode('utf-8', 'replace').strip())
+            return split_adts(completed.stdout)
+        except Exception as e:
+            logger.error(f"세그먼트 인코딩 실패: {str(e)}", exc_info=True)
+            raise Exception(f"세그먼트 인코딩 실패: {str(e)}")
+
+    def _mux(self, adts: bytes, offset: float, segment_path: Path) -> None:
+        """
+        AAC 프레임을 다시 인코딩하지 않고 MPEG-TS 세그먼트로 저장 (.partial에 쓴 뒤 교체)
+
+        Args:
+            adts: 세그먼트 구간의 AAC 프레임 (ADTS)
+            offset: 세그먼트 시작 시각 (초, 곡 전체 기준 타임스탬프)
+            segment_path: 저장할 경로
+        """
+        tmp_path = segment_path.with_name(f"{segment_path.name}.{uuid.uuid4().hex}.partial")
+        cmd = [
+            'ffmpeg', '-v', 'error', '-y',
+            '-f', 'aac', '-i', 'pipe:0',
+            '-c', 'copy',
+            '-output_ts_offset', f'{offset:.6f}',
+            '-f', 'mpegts', str(tmp_path)
+        ]
+        try:
+            completed = subprocess.run(cmd, input=adts, capture_output=True, timeout=60)
+            if completed.returncode != 0:
+                raise RuntimeError(completed.stderr.decode('utf-8', 'replace').strip())
+            os.replace(tmp_path, segment_path)
+            logger.info(f"세그먼트 변환: {segment_path.relative_to(self.cache_dir)}")
+        except Exception as e:
+            logger.error(f"세그먼트 변환 실패: {str(e)}", exc_info=True)
+            raise Exception(f"세그먼트 변환 실패: {str(e)}")
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
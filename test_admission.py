@@ -0,0 +1,135 @@
+"""
+admission.py / 수락 제어와 스케줄링 테스트
+"""
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionController, QueueFullError, job_priority
+from config import Config
+from conftest import requires_ffmpeg
+
+
+def test_client_and_global_limits():
+    admission = AdmissionController(max_running=1, max_queued=2, max_per_client=2)
+    running = admission.admit('a', 100)
+    running.__enter__()
+    admission.admit('a', 100)
+
+    with pytest.raises(QueueFullError) as error:
+        admission.admit('a', 100)
+    assert error.value.reason == 'client'
+    # 예상 처리 시간 (100초 × RTF 0.5) 중 먼저 끝나는 작업 기준
+    assert error.value.retry_after == 50
+
+    admission.admit('b', 100)
+    with pytest.raises(QueueFullError) as error:
+        admission.admit('c', 100)
+    assert error.value.reason == 'global'
+
+    running.release()
+    admission.admit('c', 100)
+    stats = admission.stats()
+    assert (stats['running'], stats['queued']) == (0, 3)
+    assert stats['rejected_total'] == {'global': 1, 'client': 1}
+
+
+def test_release_is_idempotent_and_updates_rtf():
+    admission = AdmissionController(max_running=1, max_queued=1, max_per_client=1)
+    rtf = admission.rtf
+    with admission.admit('a', 1000) as ticket:
+        ticket.release(observed_seconds=100)
+    ticket.release(observed_seconds=100)
+    assert admission.outstanding() == 0
+    assert admission.stats()['completed_total'] == 1
+    # 분리 시간이 예상(1000초 × 0.5)보다 짧으면 RTF가 줄어듦 (한 번만 반영)
+    assert admission.rtf == pytest.approx(rtf + Config.ADMISSION_RTF_SMOOTHING * (0.1 - rtf))
+
+
+def test_release_without_separation_keeps_rtf():
+    admission = AdmissionController(max_running=1, max_queued=1, max_per_client=1)
+    rtf = admission.rtf
+    # 지문 재사용이나 실패로 분리 시간 없이 반환된 작업
+    with admission.admit('a', 1000):
+        pass
+    assert admission.stats()['completed_total'] == 1
+    assert admission.rtf == rtf
+
+
+@requires_ffmpeg
+def test_rtf_follows_separate_stage_only(client, separator, monkeypatch):
+    admission = separator.admission
+    rtf = admission.rtf
+    separate = separator.separate
+
+    def failing_separate(*args, **kwargs):
+        raise RuntimeError('분리 실패')
+
+    monkeypatch.setattr(separator, 'separate', failing_separate)
+    assert client.post('/separate', json={'url': 'https://youtu.be/abcdefghijk'}).status_code == 500
+    assert admission.rtf == rtf
+
+    monkeypatch.setattr(separator, 'separate', separate)
+    response = client.post('/separate', json={'url': 'https://youtu.be/abcdefghijk', 'preset': 'fast'})
+    assert response.status_code == 200
+    observed = response.get_json()['timings']['separate'] / 4.0
+    assert admission.rtf == pytest.approx(rtf + Config.ADMISSION_RTF_SMOOTHING * (observed - rtf), rel=1e-2)
+
+
+def test_separate_rejects_with_retry_after(client, separator):
+    admission = separator.admission
+    for _ in range(admission.max_per_client):
+        admission.admit('127.0.0.1', 60)
+
+    response = client.post('/separate', json={'url': 'https://youtu.be/abcdefghijk'})
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    assert response.get_json()['reason'] == 'client'
+
+    metrics = client.get('/metrics?format=json').get_json()
+    assert metrics['admission']['rejected_total']['client'] == 1
+
+
+def test_job_priority_policies():
+    assert job_priority(100, 0, 'sjf', aging=0.5) > job_priority(10, 0, 'sjf', aging=0.5)
+    # 오래 기다린 긴 작업이 방금 온 짧은 작업보다 앞섬
+    assert job_priority(100, 200, 'sjf', aging=0.5) < job_priority(10, 0, 'sjf', aging=0.5)
+    assert job_priority(10, 5, 'fifo') > job_priority(100, 50, 'fifo')
+
+
+def run_queued(admission, tickets: dict) -> tuple:
+    """대기 작업마다 실행 슬롯을 기다리는 스레드를 띄우고 (실행 순서 리스트, 스레드 목록) 반환"""
+    order = []
+
+    def worker(name):
+        with tickets[name]:
+            order.append(name)
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in tickets]
+    for thread in threads:
+        thread.start()
+    while not all(ticket.ready for ticket in tickets.values()):
+        time.sleep(0.01)
+    return order, threads
+
+
+@pytest.mark.parametrize('long_waited, expected', [
+    (0, ['short', 'long']),
+    (1000, ['long', 'short']),
+])
+def test_shortest_job_first_with_aging(monkeypatch, long_waited, expected):
+    monkeypatch.setattr(Config, 'SCHEDULER_POLICY', 'sjf')
+    admission = AdmissionController(max_running=1, max_queued=10, max_per_client=10)
+    running = admission.admit('a', 10)
+    running.__enter__()
+
+    tickets = {'long': admission.admit('b', 600), 'short': admission.admit('c', 30)}
+    tickets['long'].admitted_at -= long_waited
+    order, threads = run_queued(admission, tickets)
+    assert order == []
+
+    running.release()
+    for thread in threads:
+        thread.join(10)
+    assert order == expected
@@ -0,0 +1,81 @@
+"""
+assets.py (해시 이름, 미리 압축한 정적 파일) 테스트
+"""
+import gzip
+import os
+import re
+
+import pytest
+
+import assets as assets_module
+from assets import AssetBundle
+from config import Config
+
+
+@pytest.fixture
+def bundle(client):
+    return AssetBundle()
+
+
+def test_page_links_hashed_assets(client, bundle):
+    response = client.get('/', headers={'Accept-Encoding': 'identity'})
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'text/html; charset=utf-8'
+    assert response.headers['Cache-Control'] == 'public, max-age=0'
+
+    page = response.get_data(as_text=True)
+    for name in ('app.css', 'app.js', 'favicon.ico'):
+        url = bundle.urls[name]
+        assert re.fullmatch(r'/assets/\w+\.[0-9a-f]{%d}\.\w+' % Config.ASSET_HASH_LENGTH, url)
+        assert url in page
+
+
+def test_hashed_asset_headers(client, bundle):
+    response = client.get(bundle.urls['app.css'], headers={'Accept-Encoding': 'identity'})
+    assert response.status_code == 200
+    # charset이 두 번 붙지 않음
+    assert response.headers['Content-Type'] == 'text/css; charset=utf-8'
+    assert response.headers['Cache-Control'] == f"public, max-age={Config.ASSET_MAX_AGE}, immutable"
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == (Config.STATIC_DIR / 'app.css').read_bytes()
+
+    assert client.get('/assets/app.000000000000.css').status_code == 404
+    favicon = client.get('/favicon.ico')
+    assert favicon.headers['Cache-Control'] == f"public, max-age={Config.FAVICON_MAX_AGE}"
+
+
+def test_gzip_negotiation_and_etag(client, bundle):
+    url = bundle.urls['app.js']
+    response = client.get(url, headers={'Accept-Encoding': 'gzip, deflate'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Content-Type'].count('charset=utf-8') == 1
+    assert gzip.decompress(response.data) == (Config.STATIC_DIR / 'app.js').read_bytes()
+
+    # 형식마다 ETag가 다르고, 같은 형식의 ETag로 다시 요청하면 304
+    etag = response.headers['ETag']
+    assert etag != client.get(url, headers={'Accept-Encoding': 'identity'}).headers['ETag']
+    cached = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert cached.status_code == 304 and cached.data == b''
+    assert client.get(url, headers={'Accept-Encoding': 'identity', 'If-None-Match': etag}).status_code == 200
+
+
+def test_brotli_preferred_when_available(client, bundle):
+    brotli = pytest.importorskip('brotli')
+    response = client.get(bundle.urls['app.js'], headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.data) == (Config.STATIC_DIR / 'app.js').read_bytes()
+
+
+def test_small_or_incompressible_files_stay_uncompressed(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets_module, 'brotli', None)
+    static_dir = tmp_path / 'static'
+    static_dir.mkdir()
+    (static_dir / 'app.css').write_text('body{}', encoding='utf-8')
+    (static_dir / 'app.js').write_bytes(b'x' * 4096)
+    (static_dir / 'favicon.ico').write_bytes(os.urandom(4096))
+
+    bundle = AssetBundle(static_dir)
+    assert set(bundle.files['app.css'].variants) == {'identity'}
+    assert set(bundle.files['app.js'].variants) == {'identity', 'gzip'}
+    assert set(bundle.files['favicon.ico'].variants) == {'identity'}
@@ -0,0 +1,104 @@
+"""
+batching.py / 작업 간 배치 추론 테스트
+"""
+import copy
+import threading
+
+import torch
+
+from batching import InferenceBatcher
+from benchmark import synthetic_audio
+from config import Config
+
+
+class RecordingForward:
+    """호출된 batch 크기를 기록하는 forward (입력 × 2)"""
+
+    def __init__(self, error: Exception = None):
+        self.batch_sizes = []
+        self.error = error
+
+    def __call__(self, mix):
+        self.batch_sizes.append(mix.shape[0])
+        if self.error is not None:
+            raise self.error
+        return mix * 2
+
+
+def submit_concurrently(batcher, forward, inputs: list) -> list:
+    results = [None] * len(inputs)
+
+    def worker(index):
+        try:
+            results[index] = batcher.submit(forward, inputs[index])
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(inputs))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+def test_concurrent_requests_share_one_forward():
+    batcher = InferenceBatcher(max_batch=4, max_wait=5, concurrency=lambda: 3)
+    forward = RecordingForward()
+    inputs = [torch.full((1, 2, 8), float(i)) for i in range(3)]
+
+    results = submit_concurrently(batcher, forward, inputs)
+    assert forward.batch_sizes == [3]
+    for mix, output in zip(inputs, results):
+        assert torch.equal(output, mix * 2)
+    assert batcher.stats()['sizes'] == {3: 1}
+
+
+def test_different_shapes_are_not_batched():
+    batcher = InferenceBatcher(max_batch=4, max_wait=0.05, concurrency=lambda: 2)
+    forward = RecordingForward()
+    results = submit_concurrently(batcher, forward, [torch.ones(1, 2, 8), torch.ones(1, 2, 16)])
+    assert sorted(forward.batch_sizes) == [1, 1]
+    assert [tuple(output.shape) for output in results] == [(1, 2, 8), (1, 2, 16)]
+
+
+def test_error_reaches_every_request_in_batch():
+    batcher = InferenceBatcher(max_batch=2, max_wait=5, concurrency=lambda: 2)
+    forward = RecordingForward(RuntimeError('메모리 부족'))
+    results = submit_concurrently(batcher, forward, [torch.ones(1, 2, 8), torch.ones(1, 2, 8)])
+    assert forward.batch_sizes == [2]
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_lone_request_runs_after_max_wait():
+    batcher = InferenceBatcher(max_batch=4, max_wait=0.05, concurrency=lambda: 4)
+    forward = RecordingForward()
+    assert torch.equal(batcher.submit(forward, torch.ones(1, 2, 8)), torch.full((1, 2, 8), 2.0))
+    assert forward.batch_sizes == [1]
+
+
+def test_batched_separation_matches_sequential(tiny_model, monkeypatch):
+    from separator import AudioSeparator
+
+    monkeypatch.setattr(Config, 'SILENCE_SKIP', False)
+    separator = AudioSeparator(model_name='tiny', output_dir=Config.OUTPUT_DIR, use_gpu=False,
+                               model=copy.deepcopy(tiny_model), max_batch=2)
+    sr = separator.model.samplerate
+    inputs = [synthetic_audio(6, sr, seed=seed) for seed in (1, 2)]
+    expected = [separator.separate_stems(wav, sr, preset='fast')['stems'] for wav in inputs]
+
+    results = [None, None]
+
+    def worker(index):
+        results[index] = separator.separate_stems(inputs[index], sr, preset='fast')['stems']
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(60)
+
+    assert max(separator.batcher.stats()['sizes']) == 2
+    for stems, reference in zip(results, expected):
+        for name in reference:
+            torch.testing.assert_close(stems[name], reference[name], rtol=0, atol=1e-5)
@@ -0,0 +1,111 @@
+"""
+bundle.py / /bundle 테스트 (ZIP 배치, ZIP64, Range 이어받기, 다채널 WAV)
+"""
+import io
+import zipfile
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+import bundle as bundle_module
+from config import Config
+from utils import wav_header
+
+SR = 8000
+STEMS = ['drums', 'bass', 'other', 'vocals']
+
+
+@pytest.fixture
+def stems(monkeypatch):
+    """출력 디렉토리에 쓴 'song' 트랙의 stem들 (청크 경계가 여러 번 생기도록 짧은 청크)"""
+    monkeypatch.setattr(Config, 'BUNDLE_CHUNK_BYTES', 1000)
+    monkeypatch.setattr(bundle_module, '_crc_cache', type(bundle_module._crc_cache)())
+    rng = np.random.default_rng(0)
+    samples = {}
+    for name in STEMS:
+        data = (rng.standard_normal((3000, 2)) * 8000).astype('<i2')
+        (Config.OUTPUT_DIR / f"song_{name}.wav").write_bytes(wav_header(len(data), 2, SR) + data.tobytes())
+        samples[name] = data
+    return samples
+
+
+def read_zip(data: bytes) -> dict:
+    """ZIP을 열어 CRC32를 검사하고 {파일명: 내용} 반환"""
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        return {info.filename: archive.read(info) for info in archive.infolist()}
+
+
+def test_zip_layout(client, stems):
+    response = client.get('/bundle/song?stems=vocals,accompaniment')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'application/zip'
+    assert int(response.headers['Content-Length']) == len(response.data)
+    assert "song_stems.zip" in response.headers['Content-Disposition']
+
+    files = read_zip(response.data)
+    assert list(files) == ['song/song_vocals.wav', 'song/song_accompaniment.wav']
+    assert files['song/song_vocals.wav'] == (Config.OUTPUT_DIR / 'song_vocals.wav').read_bytes()
+
+    # 반주 파일이 없으면 보컬을 뺀 stem들을 섞어서 넣음
+    sr, accompaniment = wavfile.read(io.BytesIO(files['song/song_accompaniment.wav']))
+    expected = sum(stems[name].astype(np.float32) for name in ('drums', 'bass', 'other'))
+    assert sr == SR
+    np.testing.assert_array_equal(accompaniment, expected.clip(-32768, 32767).astype('<i2'))
+
+
+def test_forced_zip64_layout(client, stems, monkeypatch):
+    monkeypatch.setattr(bundle_module, 'ZIP64_LIMIT', 1000)
+    data = client.get('/bundle/song').data
+
+    files = read_zip(data)
+    assert len(files) == 5
+    for name in STEMS:
+        assert files[f"song/song_{name}.wav"] == (Config.OUTPUT_DIR / f"song_{name}.wav").read_bytes()
+    # ZIP64 끝 레코드와 로케이터가 있고, 일반 끝 레코드의 중앙 디렉토리 위치는 ZIP64 필드를 가리킴
+    assert data[-98:-94] == b'PK\x06\x06' and data[-42:-38] == b'PK\x06\x07'
+    assert data[-22:-18] == b'PK\x05\x06' and data[-6:-2] == b'\xff' * 4
+
+
+@pytest.mark.parametrize('bundle_format', ['zip', 'wav'])
+def test_range_resume_is_identical(client, stems, bundle_format):
+    url = f"/bundle/song?format={bundle_format}"
+    full = client.get(url)
+    etag = full.headers['ETag']
+
+    for cut in (0, 1, 45, 1000, 12345, len(full.data) - 1):
+        # 이어받을 때 CRC32 캐시가 비어 있어도 같은 바이트
+        bundle_module._crc_cache.clear()
+        head = client.get(url, headers={'Range': f"bytes=0-{cut - 1}"}).data if cut else b''
+        tail = client.get(url, headers={'Range': f"bytes={cut}-", 'If-Range': etag})
+        assert tail.status_code == 206
+        assert tail.headers['Content-Range'] == f"bytes {cut}-{len(full.data) - 1}/{len(full.data)}"
+        assert head + tail.data == full.data
+
+    # 묶음이 바뀌었으면 (If-Range 불일치) 전체를 다시 보냄, 범위를 벗어나면 416
+    assert client.get(url, headers={'Range': 'bytes=10-', 'If-Range': '"other"'}).status_code == 200
+    unsatisfiable = client.get(url, headers={'Range': f"bytes={len(full.data)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers['Content-Range'] == f"bytes */{len(full.data)}"
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+
+def test_multitrack_wav(client, stems):
+    response = client.get('/bundle/song?stems=vocals,drums&format=wav')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'audio/wav'
+    assert response.headers['X-Stem-Channels'] == 'vocals=1-2, drums=3-4'
+    assert b'vocals=1-2, drums=3-4' in response.data[:200]
+
+    sr, data = wavfile.read(io.BytesIO(response.data))
+    assert sr == SR and data.shape == (3000, 4)
+    np.testing.assert_array_equal(data, np.concatenate([stems['vocals'], stems['drums']], axis=1))
+
+
+def test_bundle_request_errors(client, stems):
+    assert client.get('/bundle/song?format=tar').status_code == 400
+    assert client.get('/bundle/song?stems=piano').status_code == 400
+    assert client.get('/bundle/missing').status_code == 404
+    (Config.OUTPUT_DIR / 'song_bass.wav').unlink()
+    assert client.get('/bundle/song?stems=bass').status_code == 404
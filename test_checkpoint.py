@@ -0,0 +1,114 @@
+"""
+checkpoint.py / 재개 가능한 분리 테스트
+"""
+import pytest
+import torch
+
+from benchmark import synthetic_audio
+from checkpoint import SeparationCheckpoint, load_source, prune_workspaces, save_source
+from config import Config
+from conftest import requires_ffmpeg
+from utils import create_job_workspace
+
+
+@pytest.fixture
+def short_blocks(monkeypatch):
+    """짧은 곡도 여러 블록으로 나눠 체크포인트하도록"""
+    monkeypatch.setattr(Config, 'CHECKPOINT_MIN_SECONDS', 10)
+    monkeypatch.setattr(Config, 'CHECKPOINT_BLOCK_SECONDS', 6)
+    monkeypatch.setattr(Config, 'SILENCE_SKIP', False)
+
+
+def test_resumed_run_matches_single_pass(separator, short_blocks):
+    wav = synthetic_audio(20, separator.model.samplerate, seed=1)
+    single = separator.separate_stems(wav.clone(), separator.model.samplerate, preset='fast')
+
+    workspace = create_job_workspace(Config.TEMP_DIR, ('video', 'tiny', 'fast'))
+    apply_model = separator._apply_model
+    calls = []
+
+    def crash_on_third_block(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 3:
+            raise RuntimeError('중단')
+        return apply_model(*args, **kwargs)
+
+    separator._apply_model = crash_on_third_block
+    with pytest.raises(Exception):
+        separator.separate_stems(wav.clone(), separator.model.samplerate, preset='fast', workspace=workspace)
+    assert len(list((workspace / 'checkpoint').glob('*.pt'))) == 2
+
+    separator._apply_model = apply_model
+    resumed = separator.separate_stems(wav.clone(), separator.model.samplerate, preset='fast', workspace=workspace)
+
+    assert resumed['resumed_seconds'] == 12
+    for name, stem in single['stems'].items():
+        torch.testing.assert_close(resumed['stems'][name], stem, rtol=0, atol=1e-6)
+
+
+def test_checkpoint_pins_preset_and_resets_on_key_change(tmp_path):
+    checkpoint = SeparationCheckpoint(tmp_path)
+    key = {'digest': 'a', 'preset': 'auto'}
+    assert checkpoint.open(key, 'fast', {'shifts': 0}) == ('fast', {'shifts': 0})
+    checkpoint.save(0, 10, torch.ones(4, 2, 10))
+
+    # auto가 다음 실행에서 다른 프리셋을 골라도 처음 고른 프리셋으로 이어서 분리
+    assert checkpoint.open(key, 'quality', {'shifts': 3}) == ('fast', {'shifts': 0})
+    assert torch.equal(checkpoint.load(0, 10), torch.ones(4, 2, 10))
+
+    # 입력이 바뀌면 이전 블록은 버림
+    assert checkpoint.open({'digest': 'b', 'preset': 'auto'}, 'quality', {'shifts': 3}) == ('quality', {'shifts': 3})
+    assert checkpoint.load(0, 10) is None
+
+
+class Payload:
+    """텐서가 아닌 pickle 객체"""
+
+
+def test_corrupt_block_is_recomputed(tmp_path):
+    checkpoint = SeparationCheckpoint(tmp_path)
+    checkpoint.open({'digest': 'a'}, 'fast', {})
+    (checkpoint.directory / '0-10.pt').write_bytes(b'broken')
+    assert checkpoint.load(0, 10) is None
+
+    # 임의의 객체나 텐서가 아닌 값이 든 블록도 unpickle하지 않고 다시 분리
+    torch.save({'payload': Payload()}, checkpoint.directory / '10-20.pt')
+    assert checkpoint.load(10, 20) is None
+    torch.save({'sources': torch.ones(2)}, checkpoint.directory / '20-30.pt')
+    assert checkpoint.load(20, 30) is None
+
+
+def test_source_marker_and_prune(tmp_path):
+    base_dir = tmp_path / 'workspaces'
+    workspace = create_job_workspace(base_dir, ('video', 'model', 'fast'))
+    assert create_job_workspace(base_dir, ('video', 'model', 'fast')) == workspace
+    assert load_source(workspace) == (None, None)
+
+    audio = workspace / 'song.mp4'
+    audio.write_bytes(b'audio')
+    save_source(workspace, str(audio), '노래')
+    assert load_source(workspace) == (str(audio), '노래')
+
+    assert prune_workspaces(base_dir, max_age=3600) == 0
+    assert prune_workspaces(base_dir, max_age=-1) == 1
+    assert not workspace.exists()
+
+
+@requires_ffmpeg
+def test_failed_job_keeps_workspace_for_resume(client, downloader, separator, monkeypatch):
+    def failing_separate(*args, **kwargs):
+        raise RuntimeError('분리 실패')
+
+    separate = separator.separate
+    monkeypatch.setattr(separator, 'separate', failing_separate)
+    response = client.post('/separate', json={'url': 'https://youtu.be/abcdefghijk', 'preset': 'fast'})
+    assert response.status_code == 500
+    workspaces = list(Config.TEMP_DIR.glob('job-*'))
+    assert len(workspaces) == 1 and load_source(workspaces[0])[0] is not None
+
+    # 다시 요청하면 다운로드 없이 남은 원본으로 분리하고, 성공하면 작업 디렉토리 삭제
+    monkeypatch.setattr(separator, 'separate', separate)
+    response = client.post('/separate', json={'url': 'https://youtu.be/abcdefghijk', 'preset': 'fast'})
+    assert response.status_code == 200, response.get_json()
+    assert downloader.downloads == 1
+    assert not workspaces[0].exists()
@@ -0,0 +1,63 @@
+"""
+cli.py (일괄 처리) 테스트
+"""
+import pytest
+
+from cli import BatchRunner, collect_inputs
+from config import Config
+from conftest import requires_ffmpeg
+from jobs import JobStore
+from result_index import ResultIndex
+
+
+def test_collect_inputs(tmp_path):
+    music = tmp_path / 'music'
+    (music / 'album').mkdir(parents=True)
+    for name in ('b.mp3', 'album/a.flac', 'cover.jpg'):
+        (music / name).write_bytes(b'')
+    list_file = tmp_path / 'list.txt'
+    list_file.write_text('# 주석\n\nhttps://youtu.be/abcdefghijk\n' + str(music / 'b.mp3') + '\n', encoding='utf-8')
+
+    inputs = collect_inputs([str(music), str(tmp_path / 'missing.mp3')], str(list_file))
+    assert inputs == [
+        (str(music / 'album' / 'a.flac'), 'file'),
+        (str(music / 'b.mp3'), 'file'),
+        ('https://youtu.be/abcdefghijk', 'youtube'),
+    ]
+
+
+@pytest.fixture
+def runner(downloader, separator):
+    def build(force=False):
+        index = ResultIndex(Config.RESULT_INDEX)
+        return BatchRunner(downloader, separator, JobStore(index=index), index, 'fast', force=force)
+    return build
+
+
+@requires_ffmpeg
+def test_processed_inputs_are_skipped(runner, downloader, monkeypatch):
+    monkeypatch.setattr(Config, 'FINGERPRINT_DEDUP', False)
+    first = runner().run('https://www.youtube.com/watch?v=abcdefghijk', 'youtube')
+    assert first['status'] == 'completed', first['error']
+    assert all((Config.OUTPUT_DIR / f"{first['track']}_{name}.wav").exists() for name in first['stems'])
+
+    # 다른 URL 형태의 같은 영상은 다운로드 없이 건너뜀 (새 프로세스에서도 인덱스로 확인)
+    second = runner().run('https://youtu.be/abcdefghijk', 'youtube')
+    assert second['status'] == 'skipped' and second['track'] == first['track']
+    assert downloader.downloads == 1
+
+    assert runner(force=True).run('https://youtu.be/abcdefghijk', 'youtube')['status'] == 'completed'
+    assert downloader.downloads == 2
+    assert not list(Config.TEMP_DIR.glob('job-*'))
+
+
+@requires_ffmpeg
+def test_failed_input_is_reported(runner, separator, monkeypatch):
+    def failing_separate(*args, **kwargs):
+        raise RuntimeError('분리 실패')
+
+    monkeypatch.setattr(separator, 'separate', failing_separate)
+    result = runner().run('https://youtu.be/abcdefghijk', 'youtube')
+    assert result['status'] == 'failed' and '분리 실패' in result['error']
+    # 다음 실행에서 이어서 분리하도록 작업 디렉토리는 남음
+    assert len(list(Config.TEMP_DIR.glob('job-*'))) == 1
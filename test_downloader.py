@@ -0,0 +1,114 @@
+"""
+downloader.py 테스트 (네트워크 없이 메타데이터 검증과 URL 처리)
+"""
+import pytest
+
+import downloader as downloader_module
+from config import Config
+from downloader import VideoRejectedError, YouTubeDownloader, extract_video_id, source_key, validate_video_info
+
+
+def info(**overrides) -> dict:
+    return {'video_id': 'abcdefghijk', 'title': '곡', 'duration': 240.0, 'is_live': False,
+            'audio_streams': 1, 'filesize': 4 * 1024 * 1024, **overrides}
+
+
+@pytest.mark.parametrize('overrides, code', [
+    ({'is_live': True}, 'live_stream'),
+    ({'audio_streams': 0}, 'no_audio_stream'),
+    ({'duration': 3 * 60 * 60}, 'too_long'),
+    ({'filesize': 10 ** 12}, 'too_large'),
+])
+def test_validate_video_info_rejects(overrides, code):
+    with pytest.raises(VideoRejectedError) as error:
+        validate_video_info(info(**overrides))
+    assert error.value.code == code
+
+
+def test_validate_video_info_accepts_unknown_values(monkeypatch):
+    validate_video_info(info())
+    validate_video_info(info(duration=None, filesize=None))
+    monkeypatch.setattr(Config, 'MAX_MEDIA_DURATION', None)
+    validate_video_info(info(duration=3 * 60 * 60))
+
+
+@pytest.mark.parametrize('url', [
+    'https://www.youtube.com/watch?v=abcdefghijk&list=PL1',
+    'https://youtu.be/abcdefghijk?t=30',
+    'https://m.youtube.com/shorts/abcdefghijk',
+    'https://www.youtube.com/embed/abcdefghijk',
+    ' https://www.youtube.com/live/abcdefghijk ',
+])
+def test_extract_video_id(url):
+    assert extract_video_id(url) == 'abcdefghijk'
+
+
+def test_extract_video_id_keeps_unknown_urls():
+    assert extract_video_id(' https://example.com/song ') == 'https://example.com/song'
+
+
+def test_separate_rejects_before_download(client, downloader, monkeypatch):
+    monkeypatch.setattr(downloader, 'fetch_info', lambda url: info(is_live=True))
+    response = client.post('/separate', json={'url': 'https://youtu.be/abcdefghijk'})
+    assert response.status_code == 422
+    assert response.get_json()['code'] == 'live_stream'
+    assert downloader.downloads == 0
+    assert client.get('/metrics?format=json').get_json()['rejected_validation'] == {'live_stream': 1}
+
+
+def test_source_key():
+    assert source_key('https://www.youtube.com/watch?v=abcdefghijk', 'youtube') == 'abcdefghijk'
+    assert source_key('/music/song.mp3', 'file') == '/music/song.mp3'
+    assert source_key('song.mp3', 'upload') is None
+    assert source_key(None, 'youtube') is None
+
+
+class FakeStream:
+    bitrate = 128000
+    is_live = False
+
+    @property
+    def filesize(self):
+        raise OSError('HEAD 요청 실패')
+
+    def download(self, output_path, filename):
+        path = f"{output_path}/{filename}"
+        open(path, 'wb').close()
+        return path
+
+
+class FakeStreams(list):
+    def filter(self, only_audio):
+        return self
+
+    def first(self):
+        return self[0] if self else None
+
+
+class FakeYouTube:
+    """영상 정보 조회 횟수를 세는 pytubefix.YouTube 대역"""
+    created = 0
+
+    def __init__(self, url):
+        FakeYouTube.created += 1
+        self.video_id, self.title, self.length = 'abcdefghijk', '곡', 240
+        self.vid_info = {'videoDetails': {}}
+        self.streams = FakeStreams([FakeStream()])
+
+
+def test_fetch_info_is_reused_for_download(monkeypatch, tmp_path):
+    monkeypatch.setattr(downloader_module, 'YouTube', FakeYouTube)
+    monkeypatch.setattr(FakeYouTube, 'created', 0)
+    downloader = YouTubeDownloader(tmp_path)
+
+    # 크기 조회가 실패하면 길이 × 비트레이트로 추정
+    video_info = downloader.fetch_info('https://youtu.be/abcdefghijk')
+    assert video_info['filesize'] == 240 * 128000 // 8
+    validate_video_info(video_info)
+
+    path, title = downloader.download_audio('https://youtu.be/abcdefghijk', info=video_info)
+    assert (path, title) == (f"{tmp_path}/temp_audio.mp4", '곡')
+    assert FakeYouTube.created == 1
+
+    downloader.download_audio('https://youtu.be/abcdefghijk')
+    assert FakeYouTube.created == 2
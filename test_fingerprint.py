@@ -0,0 +1,57 @@
+"""
+fingerprint.py / 지문 기반 중복 제거 테스트
+"""
+import numpy as np
+import pytest
+import torch
+
+from benchmark import synthetic_audio
+from config import Config
+from conftest import SyntheticDownloader, requires_ffmpeg
+from fingerprint import bit_error_rate, compute_fingerprint
+
+SR = 22050
+
+
+def reupload(wav: torch.Tensor, delay: float) -> torch.Tensor:
+    """앞에 무음이 붙고 음량과 잡음이 다른 재업로드"""
+    torch.manual_seed(0)
+    shifted = torch.cat([torch.zeros(2, int(delay * SR)), wav * 0.5], dim=1)[:, :wav.shape[-1]]
+    return shifted + 0.01 * torch.randn_like(wav)
+
+
+def chirp(seconds: float) -> torch.Tensor:
+    t = torch.arange(int(seconds * SR)) / SR
+    return (0.3 * torch.sin(2 * np.pi * (200 + 40 * t) * t)).repeat(2, 1)
+
+
+def test_reupload_matches_and_other_song_does_not():
+    song = synthetic_audio(20, SR)
+    fingerprint = compute_fingerprint(song, SR)
+    assert fingerprint.dtype == np.uint32 and len(fingerprint) > Config.FINGERPRINT_MIN_FRAMES
+
+    same = bit_error_rate(fingerprint, compute_fingerprint(reupload(song, 0.3), SR), Config.FINGERPRINT_MAX_OFFSET)
+    other = bit_error_rate(fingerprint, compute_fingerprint(chirp(20), SR), Config.FINGERPRINT_MAX_OFFSET)
+    assert same < Config.FINGERPRINT_MAX_BER < other
+
+
+def test_too_short_audio_is_not_compared():
+    short = compute_fingerprint(synthetic_audio(3, SR), SR)
+    assert bit_error_rate(short, short, Config.FINGERPRINT_MAX_OFFSET) == 1.0
+    assert len(compute_fingerprint(torch.zeros(2, 100), SR)) == 0
+
+
+@pytest.fixture
+def downloader(separator):
+    """모든 영상이 같은 12초 오디오 (지문 비교 최소 길이 이상)"""
+    return SyntheticDownloader(separator.model.samplerate, duration=12.0)
+
+
+@requires_ffmpeg
+def test_same_audio_under_other_video_id_reuses_stems(client):
+    first = client.post('/separate', json={'url': 'https://youtu.be/aaaaaaaaaaa', 'preset': 'fast'}).get_json()
+    second = client.post('/separate', json={'url': 'https://youtu.be/bbbbbbbbbbb', 'preset': 'fast'}).get_json()
+
+    assert 'deduplicated_from' not in first
+    assert second['deduplicated_from'] == first['title']
+    assert second['stems'] == first['stems']
@@ -0,0 +1,42 @@
+"""
+jobs.py 테스트
+"""
+from jobs import Job
+
+
+def test_job_completes_after_all_stems_are_written():
+    job = Job('a')
+    done = []
+    job.add_done_callback(done.append)
+
+    job.expect_stems(['vocals', 'drums'])
+    job.complete({'title': '곡'})
+    assert job.to_dict()['status'] == 'writing'
+    assert job.wait_result(0)
+
+    job.mark_stem_ready('drums')
+    assert job.to_dict()['pending'] == ['vocals']
+    assert not done
+
+    job.mark_stem_ready('vocals')
+    assert job.to_dict()['status'] == 'completed'
+    assert job.ready == ['drums', 'vocals']
+    assert done == [job]
+
+    # 끝난 작업에 등록한 콜백은 바로 호출
+    job.add_done_callback(done.append)
+    assert done == [job, job]
+
+
+def test_failed_stem_write_fails_job():
+    job = Job('a')
+    job.expect_stems(['vocals', 'drums'])
+    job.mark_stem_failed('vocals', '디스크 가득 참')
+    job.mark_stem_ready('drums')
+    assert job.to_dict()['status'] == 'writing'
+
+    # 결과가 등록되기 전에는 끝나지 않음
+    job.complete({'title': '곡'})
+    status = job.to_dict()
+    assert status['status'] == 'failed'
+    assert 'vocals' in status['error']
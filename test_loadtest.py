@@ -0,0 +1,69 @@
+"""
+loadtest.py 보조 기능 테스트 (가짜 소스 서버와 다운로더)
+"""
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from config import Config
+from downloader import VideoRejectedError
+from loadtest import (FakeDownloader, FakeSourceServer, SyntheticCatalog, apply_overrides, parse_mix,
+                      percentiles, source_audio)
+
+
+@pytest.fixture
+def source(tmp_path):
+    catalog = SyntheticCatalog([2.0])
+    server = FakeSourceServer(catalog, tmp_path / 'source', sr=8000)
+    url = server.start()
+    yield catalog, url
+    server.stop()
+
+
+def test_fake_downloader_serves_catalog(source, tmp_path):
+    catalog, url = source
+    video_id = catalog.add()
+    downloader = FakeDownloader(tmp_path, url, latency=0)
+
+    info = downloader.fetch_info(f"https://youtu.be/{video_id}")
+    assert info['video_id'] == video_id and info['duration'] == 2.0
+
+    path, title = downloader.download_audio(f"https://www.youtube.com/watch?v={video_id}")
+    sr, audio = wavfile.read(path)
+    assert title == info['title']
+    assert sr == 8000 and np.array_equal(audio, source_audio(2.0, 0, 8000))
+
+
+def test_fake_downloader_rejections_and_failures(source, tmp_path):
+    catalog, url = source
+    private = catalog.add(unavailable='private')
+    with pytest.raises(VideoRejectedError) as error:
+        FakeDownloader(tmp_path, url, latency=0).fetch_info(f"https://youtu.be/{private}")
+    assert error.value.code == 'private'
+
+    with pytest.raises(Exception, match='주입된 오류'):
+        FakeDownloader(tmp_path, url, latency=0, failure_rate=1.0).download_audio(f"https://youtu.be/{catalog.add()}")
+
+
+def test_source_audio_is_deterministic_per_seed():
+    assert np.array_equal(source_audio(1, 3, 8000), source_audio(1, 3, 8000))
+    assert not np.array_equal(source_audio(1, 3, 8000), source_audio(1, 4, 8000))
+
+
+def test_parse_mix_and_overrides(monkeypatch):
+    assert parse_mix('new=6,repeat') == {'new': 6.0, 'repeat': 1.0}
+    with pytest.raises(ValueError):
+        parse_mix('unknown=1')
+
+    monkeypatch.setattr(Config, 'MAX_RUNNING_JOBS', Config.MAX_RUNNING_JOBS)
+    monkeypatch.setattr(Config, 'DEFAULT_PRESET', Config.DEFAULT_PRESET)
+    assert apply_overrides(['MAX_RUNNING_JOBS=3', 'DEFAULT_PRESET=fast']) == {'MAX_RUNNING_JOBS': 3,
+                                                                           'DEFAULT_PRESET': 'fast'}
+    assert Config.MAX_RUNNING_JOBS == 3
+    with pytest.raises(ValueError):
+        apply_overrides(['NO_SUCH_SETTING=1'])
+
+
+def test_percentiles():
+    assert percentiles([]) == ['-'] * 4
+    assert percentiles([1.0, 2.0, 3.0])[-1] == '3.00'
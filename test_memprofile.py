@@ -0,0 +1,31 @@
+"""
+memprofile.py / 단계별 메모리 기록 테스트
+"""
+import numpy as np
+
+from config import Config
+from conftest import requires_ffmpeg
+from memprofile import MemoryProfiler
+
+
+def test_stage_records_peak_of_allocation():
+    profiler = MemoryProfiler()
+    with profiler.stage('allocate') as memory:
+        block = np.ones(8 * 1024 * 1024 // 8)
+        del block
+    assert memory['traced_peak_mb'] >= 7
+    assert profiler.stats()['stages']['allocate']['last']['traced_peak_mb'] == memory['traced_peak_mb']
+
+
+@requires_ffmpeg
+def test_job_records_decode_and_tensor_conversion_separately(client, monkeypatch):
+    monkeypatch.setattr(Config, 'MEMORY_PROFILING', True)
+    response = client.post('/separate', json={'url': 'https://youtu.be/memoryprof1', 'preset': 'fast'})
+    assert response.status_code == 200, response.get_json()
+
+    memory = response.get_json()['memory']
+    assert 'load' not in memory
+    for stage in ('convert', 'decode', 'to_tensor', 'model'):
+        assert memory[stage]['rss_peak_mb'] > 0
+    # float32 변환 단계는 16-bit PCM의 두 배 크기 배열을 만듦
+    assert memory['to_tensor']['traced_peak_mb'] > memory['decode']['traced_peak_mb']
@@ -0,0 +1,80 @@
+"""
+mixer.py / /mix 테스트
+"""
+import io
+
+import numpy as np
+import pytest
+from scipy.io import wavfile
+
+from config import Config
+from mixer import StemMixer, read_wav_info
+from utils import wav_header
+
+SR = 8000
+STEMS = ['drums', 'bass', 'other', 'vocals']
+
+
+@pytest.fixture
+def stems(monkeypatch):
+    """출력 디렉토리에 쓴 'song' 트랙의 stem들 (청크 경계가 여러 번 생기도록 짧은 청크)"""
+    monkeypatch.setattr(Config, 'MIX_CHUNK_FRAMES', 1000)
+    rng = np.random.default_rng(0)
+    samples = {}
+    for name in STEMS:
+        data = (rng.standard_normal((4500, 2)) * 12000).clip(-32768, 32767).astype('<i2')
+        (Config.OUTPUT_DIR / f"song_{name}.wav").write_bytes(wav_header(len(data), 2, SR) + data.tobytes())
+        samples[name] = data
+    return samples
+
+
+def reference_mix(stems: dict, gains: dict) -> np.ndarray:
+    mixed = sum(stems[name].astype(np.float32) * np.float32(gains.get(name, 1.0)) for name in stems)
+    return mixed.clip(-32768, 32767).astype('<i2')
+
+
+def test_stream_mix_matches_reference_and_caches(stems):
+    mixer = StemMixer(Config.OUTPUT_DIR, Config.MIX_CACHE_DIR)
+    paths = mixer.stem_paths('song', STEMS)
+    gains = {'drums': 0.5, 'bass': 2.0, 'other': 0.0, 'vocals': 1.0}
+    cache_path = mixer.cache_path('song', paths, gains)
+
+    total_bytes, stream = mixer.stream_mix(paths, gains, cache_path)
+    body = b''.join(stream)
+    assert len(body) == total_bytes
+    assert cache_path.read_bytes() == body
+
+    sr, mixed = wavfile.read(io.BytesIO(body))
+    assert sr == SR
+    np.testing.assert_array_equal(mixed, reference_mix(stems, gains))
+    assert read_wav_info(cache_path)['frames'] == 4500
+
+
+def test_interrupted_mix_leaves_no_cache(stems):
+    mixer = StemMixer(Config.OUTPUT_DIR, Config.MIX_CACHE_DIR)
+    paths = mixer.stem_paths('song', STEMS)
+    gains = dict.fromkeys(STEMS, 1.0)
+    cache_path = mixer.cache_path('song', paths, gains)
+
+    _, stream = mixer.stream_mix(paths, gains, cache_path)
+    next(stream)
+    stream.close()
+    assert not list(Config.MIX_CACHE_DIR.iterdir())
+
+
+def test_mix_endpoint(client, stems):
+    assert client.get('/mix?track=missing').status_code == 404
+    assert client.get('/mix?track=../song').status_code == 400
+    assert client.get('/mix?track=song&piano=1').status_code == 400
+    assert client.get('/mix?track=song&vocals=loud').status_code == 400
+    assert client.get('/mix?track=song&vocals=3').status_code == 400
+
+    first = client.get('/mix?track=song&vocals=0')
+    assert first.status_code == 200
+    body = first.get_data()
+    _, mixed = wavfile.read(io.BytesIO(body))
+    np.testing.assert_array_equal(mixed, reference_mix(stems, {'vocals': 0}))
+
+    # 같은 게인 조합은 캐시 파일로 응답
+    assert len(list(Config.MIX_CACHE_DIR.glob('song_mix_*.wav'))) == 1
+    assert client.get('/mix?track=song&vocals=0.0').get_data() == body
@@ -0,0 +1,64 @@
+"""
+peaks.py / /peaks 테스트
+"""
+import numpy as np
+import pytest
+import torch
+
+from config import Config
+from peaks import DAT_HEADER, choose_level, compute_peaks, encode_dat, tensor_chunks
+from utils import wav_header
+
+
+def brute_force(audio: np.ndarray, spp: int) -> np.ndarray:
+    pixels = [audio[start:start + spp] for start in range(0, len(audio), spp)]
+    pairs = np.array([(pixel.min(), pixel.max()) for pixel in pixels])
+    return np.clip(np.round(pairs * 127), -128, 127).astype(np.int8)
+
+
+def test_chunked_peaks_match_direct_computation():
+    rng = np.random.default_rng(0)
+    audio = rng.uniform(-1, 1, (10000, 2)).astype(np.float32)
+    levels = [16, 64, 256]
+
+    chunked = compute_peaks((audio[start:start + 1024] for start in range(0, len(audio), 1024)), levels)
+    for spp in levels:
+        np.testing.assert_array_equal(chunked[spp], brute_force(audio, spp))
+
+    # 텐서 청크 (channels, samples) 입력도 같은 결과
+    from_tensor = compute_peaks(tensor_chunks(torch.from_numpy(audio.T.copy()), 1024), levels)
+    np.testing.assert_array_equal(from_tensor[256], chunked[256])
+
+
+def test_levels_must_be_multiples():
+    with pytest.raises(ValueError):
+        compute_peaks([np.zeros((100, 2), dtype=np.float32)], [16, 40])
+
+
+def test_encode_dat_header():
+    pairs = np.array([[-3, 5], [0, 127]], dtype=np.int8)
+    data = encode_dat(pairs, 44100, 256)
+    assert DAT_HEADER.unpack(data[:DAT_HEADER.size]) == (1, 1, 44100, 256, 2)
+    assert data[DAT_HEADER.size:] == pairs.tobytes()
+
+
+def test_choose_level():
+    levels = [256, 1024, 4096]
+    assert choose_level(levels, 44100 * 60, 1000) == 1024
+    assert choose_level(levels, 44100 * 600, 1000) == 4096
+    assert choose_level(levels, 1000, 1000) == 256
+
+
+def test_peaks_endpoint_generates_missing_files(client):
+    samples = (np.sin(np.arange(44100) / 10)[:, None].repeat(2, axis=1) * 16000).astype('<i2')
+    for name in ('drums', 'bass', 'other', 'vocals'):
+        (Config.OUTPUT_DIR / f"song_{name}.wav").write_bytes(wav_header(len(samples), 2, 44100) + samples.tobytes())
+
+    assert client.get('/peaks/song/vocals?spp=100').status_code == 400
+    assert client.get('/peaks/missing/vocals').status_code == 404
+
+    response = client.get('/peaks/song/vocals?width=100')
+    assert response.status_code == 200
+    header = DAT_HEADER.unpack(response.get_data()[:DAT_HEADER.size])
+    assert header[3] == 256 and header[4] == 44100 // 256 + 1
+    assert len(list(Config.PEAKS_DIR.glob('song_vocals_*.dat'))) == len(Config.PEAK_LEVELS)
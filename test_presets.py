@@ -0,0 +1,50 @@
+"""
+presets.py / auto 프리셋 선택 테스트
+"""
+import pytest
+
+import separator as separator_module
+from admission import AdmissionController
+from presets import choose_auto_preset, resolve_preset
+
+
+@pytest.mark.parametrize('duration, queue_depth, cpu_count, expected', [
+    (180, 0, 8, 'quality'),
+    (180, 0, 4, 'balanced'),
+    (180, 1, 8, 'balanced'),
+    (180, 2, 8, 'fast'),
+    # 코어가 적은 서버도 한가하면 fast로 떨어지지 않음
+    (180, 0, 2, 'balanced'),
+    (180, 0, 1, 'balanced'),
+    (180, 1, 2, 'fast'),
+    (900, 0, 16, 'fast'),
+])
+def test_choose_auto_preset(duration, queue_depth, cpu_count, expected):
+    assert choose_auto_preset(duration, queue_depth, cpu_count) == expected
+
+
+def test_resolve_preset_rejects_unknown():
+    assert resolve_preset('fast', 60, 0, 8)[0] == 'fast'
+    with pytest.raises(ValueError):
+        resolve_preset('ultra', 60, 0, 8)
+
+
+def test_auto_preset_counts_queued_jobs(separator, monkeypatch):
+    monkeypatch.setattr(separator_module, 'available_cpus', lambda: 8)
+    assert separator.separation_params('auto', 180)[0] == 'quality'
+
+    admission = AdmissionController(max_running=1, max_queued=10, max_per_client=10)
+    separator.admission = admission
+    running = admission.admit('a', 180)
+    running.__enter__()
+    assert separator.queue_depth() == 0
+    assert separator.separation_params('auto', 180)[0] == 'quality'
+
+    # 실행 중인 작업은 이 작업 하나지만 대기열에 두 개가 더 있으면 부하가 큰 것으로 판단
+    queued = [admission.admit('b', 180), admission.admit('c', 180)]
+    assert separator.queue_depth() == 2
+    assert separator.separation_params('auto', 180)[0] == 'fast'
+
+    for ticket in queued + [running]:
+        ticket.release()
+    assert separator.queue_depth() == 0
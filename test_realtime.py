@@ -0,0 +1,75 @@
+"""
+realtime.py / /live 테스트
+"""
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import torch
+
+from realtime import LiveSessions, SlidingWindowSeparator
+
+SR = 100
+
+
+class IdentitySeparator:
+    """입력을 그대로 'vocals'로, 절반을 'drums'로 돌려주는 가짜 분리기 (crossfade 검증용)"""
+
+    model = SimpleNamespace(samplerate=SR, sources=['drums', 'vocals'])
+
+    def separate_window(self, wav: torch.Tensor) -> torch.Tensor:
+        return torch.stack([wav * 0.5, wav.clone()])
+
+
+@pytest.mark.parametrize('chunk_frames', [7, 100, 450, 2000])
+def test_windows_are_stitched_back_exactly(chunk_frames):
+    stream = SlidingWindowSeparator(IdentitySeparator(), 'vocals', window_seconds=3, overlap_seconds=1)
+    pcm = np.random.default_rng(0).uniform(-1, 1, (1234, 2)).astype(np.float32)
+
+    outputs = [stream.push(pcm[start:start + chunk_frames]) for start in range(0, len(pcm), chunk_frames)]
+    outputs.append(stream.flush())
+    audio = np.concatenate(outputs)
+
+    assert len(audio) == len(pcm) == stream.frames_out
+    np.testing.assert_allclose(audio, pcm, atol=1e-6)
+
+
+def test_accompaniment_and_mono_input():
+    stream = SlidingWindowSeparator(IdentitySeparator(), 'accompaniment', window_seconds=2, overlap_seconds=0.5)
+    pcm = np.linspace(-1, 1, 500, dtype=np.float32)[:, None]
+    audio = np.concatenate([stream.push(pcm), stream.flush()])
+    # 보컬을 뺀 합 = drums (입력의 절반), 모노 입력은 두 채널로 복제
+    np.testing.assert_allclose(audio, np.repeat(pcm, 2, axis=1) * 0.5, atol=1e-6)
+    assert stream.stats()['windows'] == 3
+
+
+def test_session_limit():
+    sessions = LiveSessions(IdentitySeparator(), max_sessions=1)
+    session_id, _ = sessions.open('vocals')
+    assert sessions.open('vocals') == (None, None)
+    sessions.close(session_id)
+    assert sessions.open('vocals')[0] is not None
+
+
+def test_live_endpoint(client, separator):
+    assert client.post('/live?stem=piano').status_code == 400
+    opened = client.post('/live?stem=vocals&channels=1&window=2&overlap=0.5').get_json()
+    assert client.post('/live').status_code == 429
+    # 열린 세션은 수락 제어를 거치지 않으므로 부하 판단과 지표에 따로 반영
+    assert separator.queue_depth() == 1
+    live = client.get('/metrics?format=json').get_json()['live']
+    assert (live['sessions'], live['opened_total'], live['rejected_total']) == (1, 1, 1)
+    assert 'separator_live_sessions 1' in client.get('/metrics').get_data(as_text=True)
+
+    url = f"/live/{opened['session_id']}"
+    assert client.post(url, data=b'\x00' * 3).status_code == 400
+    pcm = (np.sin(np.arange(3 * separator.model.samplerate) / 20) * 16000).astype('<i2')
+    first = client.post(url, data=pcm[:separator.model.samplerate * 2].tobytes())
+    last = client.post(url + '?final=1', data=pcm[separator.model.samplerate * 2:].tobytes())
+
+    frames = [int(response.headers['X-Live-Frames']) for response in (first, last)]
+    assert int(last.headers['X-Live-Start-Frame']) == frames[0]
+    assert sum(frames) == len(pcm)
+    assert len(first.get_data()) + len(last.get_data()) == len(pcm) * 2 * 2
+    assert client.get(url).status_code == 404
+    assert separator.queue_depth() == 0
@@ -0,0 +1,78 @@
+"""
+result_index.py 테스트
+"""
+from config import Config
+from jobs import JobStore
+from result_index import ResultIndex
+
+
+def add_completed_job(index, source, source_type, track='song', preset='fast'):
+    jobs = JobStore(index=index)
+    job = jobs.create(source=source, source_type=source_type)
+    path = Config.OUTPUT_DIR / f"{track}_vocals.wav"
+    path.write_bytes(b'RIFF')
+    result = {'track': track, 'title': track, 'preset': preset, 'params': {}, 'stems': {'vocals': str(path)}}
+    index.add_result(job.id, result, 'tiny', 10.0)
+    job.complete(result, ready=['vocals'])
+    return result
+
+
+def test_find_by_source_matches_other_url_forms():
+    index = ResultIndex(Config.RESULT_INDEX)
+    add_completed_job(index, 'https://www.youtube.com/watch?v=abcdefghijk', 'youtube')
+
+    _, found = index.find_by_source('https://youtu.be/abcdefghijk?t=10', 'youtube', 'tiny', 'fast')
+    assert found['track'] == 'song'
+    assert index.find_by_source('https://youtu.be/abcdefghijk', 'youtube', 'tiny', 'quality') == (None, None)
+    assert index.find_by_source('https://youtu.be/abcdefghijk', 'youtube', 'other', 'auto') == (None, None)
+    assert index.find_by_source('https://youtu.be/zzzzzzzzzzz', 'youtube', 'tiny', 'auto') == (None, None)
+
+
+def test_find_by_source_uses_source_key_index():
+    index = ResultIndex(Config.RESULT_INDEX)
+    plan = index._conn().execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM jobs WHERE source_key = ? AND status = 'completed'", ('x',)
+    ).fetchall()
+    assert any('jobs_source' in row['detail'] for row in plan)
+
+
+def test_jobs_survive_restart():
+    index = ResultIndex(Config.RESULT_INDEX)
+    jobs = JobStore(index=index)
+    finished = jobs.create('끝난 곡', source='song.mp3', source_type='upload')
+    finished.complete({'title': '끝난 곡'})
+    running = jobs.create('진행 중', source='other.mp3', source_type='upload')
+
+    # 재시작 후 (메모리의 작업 저장소가 비어도) 인덱스에서 조회
+    restarted = JobStore(index=ResultIndex(Config.RESULT_INDEX))
+    assert restarted.describe(finished.id)['status'] == 'completed'
+    assert restarted.describe(running.id)['status'] == 'interrupted'
+    assert [job['job_id'] for job in index.recent_jobs()] == [running.id, finished.id]
+
+
+def test_prune_removes_least_recently_used_results(monkeypatch):
+    index = ResultIndex(Config.RESULT_INDEX)
+    add_completed_job(index, 'a.wav', 'file', track='old')
+    add_completed_job(index, 'b.wav', 'file', track='new')
+    with index._conn() as conn:
+        conn.execute("UPDATE results SET accessed_at = 0 WHERE track = 'old'")
+    Config.MIX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    mix = Config.MIX_CACHE_DIR / 'old_mix_0123.wav'
+    mix.write_bytes(b'mix')
+
+    monkeypatch.setattr(Config, 'RESULT_RETENTION_DAYS', None)
+    monkeypatch.setattr(Config, 'RESULT_MAX_BYTES', 4)
+    assert index.prune(force=True) == 1
+
+    assert not (Config.OUTPUT_DIR / 'old_vocals.wav').exists() and not mix.exists()
+    assert (Config.OUTPUT_DIR / 'new_vocals.wav').exists()
+    assert index.find_by_source('a.wav', 'file', 'tiny', 'auto') == (None, None)
+    assert index.find_by_source('b.wav', 'file', 'tiny', 'auto')[1]['track'] == 'new'
+
+
+def test_missing_files_drop_result():
+    index = ResultIndex(Config.RESULT_INDEX)
+    add_completed_job(index, 'a.wav', 'file')
+    (Config.OUTPUT_DIR / 'song_vocals.wav').unlink()
+    assert index.find_by_source('a.wav', 'file', 'tiny', 'auto') == (None, None)
+    assert index._conn().execute('SELECT COUNT(*) FROM results').fetchone()[0] == 0
@@ -0,0 +1,120 @@
+"""
+routes.py API 테스트 (가짜 다운로더와 작은 모델 사용)
+"""
+import shutil
+import threading
+
+import pytest
+
+from benchmark import synthetic_audio
+from config import Config
+from conftest import requires_ffmpeg
+from jobs import Job, JobStore
+from utils import save_audio_wav
+
+requires_ffprobe = pytest.mark.skipif(shutil.which('ffprobe') is None, reason='ffprobe 필요')
+
+
+def upload(client, body: bytes, filename: str = 'song.wav', preset: str = 'fast'):
+    query = f"?filename={filename}&preset={preset}" if filename else ''
+    return client.post('/upload' + query, data=body, content_type='application/octet-stream')
+
+
+def test_upload_rejects_bad_requests(client, monkeypatch):
+    assert upload(client, b'data', filename=None).status_code == 400
+    assert upload(client, b'data', preset='ultra').status_code == 400
+    assert upload(client, b'').status_code == 400
+    assert upload(client, b'not audio' * 100).status_code == 415
+
+    monkeypatch.setattr(Config, 'MAX_UPLOAD_BYTES', 100)
+    assert upload(client, b'x' * 101).status_code == 413
+
+    # 거절된 업로드의 작업 디렉토리는 남지 않음
+    assert not list(Config.TEMP_DIR.glob('job-*'))
+
+
+@requires_ffprobe
+def test_upload_separates_file(client, separator, tmp_path):
+    path = tmp_path / 'song.wav'
+    save_audio_wav(synthetic_audio(4, separator.model.samplerate), separator.model.samplerate, str(path))
+
+    response = upload(client, path.read_bytes())
+    assert response.status_code == 200, response.get_json()
+    assert set(response.get_json()['stems']) == set(separator.model.sources)
+    assert not list(Config.TEMP_DIR.glob('job-*'))
+
+
+def test_job_store_coalesces_same_key():
+    jobs = JobStore()
+    leader, created = jobs.create_or_attach(('video', 'tiny', 'fast'))
+    follower, joined = jobs.create_or_attach(('video', 'tiny', 'fast'))
+    assert created and not joined and follower is leader
+    assert jobs.create_or_attach(('video', 'tiny', 'quality'))[1]
+
+    # 끝난 작업의 키는 해제되어 다음 요청은 새 작업
+    leader.fail('실패')
+    assert jobs.inflight(('video', 'tiny', 'fast')) is None
+    assert jobs.create_or_attach(('video', 'tiny', 'fast'))[0] is not leader
+
+
+def concurrent_separate(client, separator, monkeypatch, outcome):
+    """
+    첫 요청이 분리하는 동안 같은 영상의 두 번째 요청이 합류하게 한 뒤 두 응답 반환
+
+    outcome: 첫 요청의 분리가 끝날 때 호출할 함수 (결과를 반환하거나 예외를 냄)
+    """
+    separating, joined = threading.Event(), threading.Event()
+    separate_calls = []
+
+    def slow_separate(*args, **kwargs):
+        separate_calls.append(1)
+        separating.set()
+        assert joined.wait(10)
+        return outcome(*args, **kwargs)
+
+    wait_result = Job.wait_result
+
+    def signalling_wait(job, timeout=None):
+        joined.set()
+        return wait_result(job, timeout)
+
+    monkeypatch.setattr(separator, 'separate', slow_separate)
+    monkeypatch.setattr(Job, 'wait_result', signalling_wait)
+
+    body = {'url': 'https://youtu.be/abcdefghijk', 'preset': 'fast'}
+    responses = {}
+
+    def request(name, url):
+        response = client.application.test_client().post('/separate', json={**body, 'url': url})
+        responses[name] = (response.status_code, response.get_json())
+
+    leader = threading.Thread(target=request, args=('leader', body['url']))
+    leader.start()
+    assert separating.wait(30)
+    request('follower', 'https://www.youtube.com/watch?v=abcdefghijk')
+    leader.join(30)
+    assert len(separate_calls) == 1
+    return responses['leader'], responses['follower']
+
+
+@requires_ffmpeg
+def test_concurrent_requests_share_one_separation(client, downloader, separator, monkeypatch):
+    separate = separator.separate
+    leader, follower = concurrent_separate(client, separator, monkeypatch, separate)
+
+    assert leader[0] == follower[0] == 200
+    assert follower[1]['coalesced'] and follower[1]['job_id'] == leader[1]['job_id']
+    assert follower[1]['stems'] == leader[1]['stems']
+    assert downloader.downloads == 1
+
+
+@requires_ffmpeg
+def test_leader_failure_propagates_to_joined_requests(client, downloader, separator, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError('모델 오류')
+
+    leader, follower = concurrent_separate(client, separator, monkeypatch, fail)
+
+    assert leader[0] == follower[0] == 500
+    assert '모델 오류' in follower[1]['error']
+    assert downloader.downloads == 1
@@ -0,0 +1,120 @@
+"""
+separator.py 테스트
+"""
+import threading
+
+import numpy as np
+import torch
+
+import separator as separator_module
+from benchmark import synthetic_audio
+from config import Config
+from jobs import Job
+
+
+def test_bf16_failure_falls_back_for_this_call_and_later_jobs(separator, monkeypatch):
+    monkeypatch.setattr(Config, 'SILENCE_SKIP', False)
+    apply_model = separator_module.apply_model
+    calls = []
+
+    def fail_under_autocast(*args, **kwargs):
+        calls.append(torch.is_autocast_enabled('cpu'))
+        if calls[-1]:
+            raise RuntimeError('bf16 미지원 연산')
+        return apply_model(*args, **kwargs)
+
+    monkeypatch.setattr(separator_module, 'apply_model', fail_under_autocast)
+    separator.precision = 'bfloat16'
+    wav = synthetic_audio(2, separator.model.samplerate)
+
+    result = separator.separate_stems(wav, separator.model.samplerate, preset='fast')
+    assert calls == [True, False]
+    assert result['precision'] == 'float32'
+    assert result['stems']['vocals'].dtype == torch.float32
+    assert separator.precision == 'float32'
+
+
+def test_downgrade_does_not_change_running_job(separator, monkeypatch):
+    monkeypatch.setattr(Config, 'SILENCE_SKIP', False)
+    apply_model = separator_module.apply_model
+
+    def downgraded_by_other_job(*args, **kwargs):
+        # 다른 작업의 bfloat16 실패로 이 작업이 실행되는 도중 전환됨
+        separator.precision = 'float32'
+        return apply_model(*args, **kwargs)
+
+    monkeypatch.setattr(separator_module, 'apply_model', downgraded_by_other_job)
+    separator.precision = 'bfloat16'
+    wav = synthetic_audio(2, separator.model.samplerate)
+
+    result = separator.separate_stems(wav, separator.model.samplerate, preset='fast')
+    assert result['precision'] == 'bfloat16'
+    assert result['stems']['vocals'].dtype == getattr(torch, Config.REDUCED_BUFFER_DTYPE)
+
+
+def test_silent_gap_is_skipped_and_spans_are_stitched(separator):
+    sr = separator.model.samplerate
+    music = synthetic_audio(3, sr)
+    wav = torch.cat([music, torch.zeros(2, 5 * sr), music], dim=1)
+    _, params = separator.separation_params('fast', wav.shape[-1] / sr)
+
+    result = separator.separate_stems(wav, sr, preset='fast')
+    assert result['skipped_seconds'] == 4.0
+
+    # 유효 구간은 그 구간만 따로 분리한 결과와 같고, 건너뛴 무음은 0
+    pad = int(Config.SILENCE_PADDING * sr)
+    for start, end in [(0, 3 * sr + pad), (8 * sr - pad, 11 * sr)]:
+        expected, _ = separator._apply_model(wav[:, start:end], params, 'float32')
+        for i, name in enumerate(separator.model.sources):
+            torch.testing.assert_close(result['stems'][name][:, start:end], expected[0, i])
+    for stem in result['stems'].values():
+        assert not stem[:, 3 * sr + pad:8 * sr - pad].any()
+
+
+def test_write_stems_returns_before_files_are_flushed(separator, monkeypatch):
+    save_audio_wav = separator_module.save_audio_wav
+    gate = threading.Event()
+
+    def blocked_save(*args, **kwargs):
+        gate.wait(10)
+        save_audio_wav(*args, **kwargs)
+
+    monkeypatch.setattr(separator_module, 'save_audio_wav', blocked_save)
+    job = Job('a')
+    stems = {'vocals': torch.zeros(2, 1000), 'drums': torch.zeros(2, 1000)}
+
+    paths = separator.write_stems(stems, 44100, 'song', job)
+    assert job.to_dict()['pending'] == ['drums', 'vocals']
+    assert not any(path.exists() for path in paths.values())
+
+    done = threading.Event()
+    job.add_done_callback(lambda _: done.set())
+    job.complete({'title': 'song'})
+    gate.set()
+    assert done.wait(10)
+    assert job.to_dict()['status'] == 'completed'
+    assert all(path.exists() for path in paths.values())
+    assert not list(Config.OUTPUT_DIR.glob('*.partial'))
+
+
+def test_iter_stems_yields_views_without_writing_files(separator, monkeypatch):
+    monkeypatch.setattr(Config, 'SILENCE_SKIP', False)
+    sr = separator.model.samplerate
+    wav = synthetic_audio(3, sr)
+    full = separator.separate_stems(wav, sr, preset='fast', accompaniment=True)
+
+    chunks = {}
+    for chunk in separator.iter_stems(wav, sr, preset='fast', segment_seconds=1, as_numpy=True, accompaniment=True):
+        assert chunk['sr'] == sr and chunk['audio'].dtype == np.float32
+        assert chunk['start'] == sum(part.shape[-1] for part in chunks.get(chunk['name'], []))
+        chunks.setdefault(chunk['name'], []).append(chunk['audio'])
+
+    assert set(chunks) == set(separator.model.sources) | {'accompaniment'}
+    for name, parts in chunks.items():
+        assert len(parts) == 3
+        np.testing.assert_allclose(np.concatenate(parts, axis=1), full['stems'][name].numpy(), atol=1e-6)
+    np.testing.assert_allclose(
+        chunks['accompaniment'][0],
+        sum(chunks[name][0] for name in separator.model.sources if name != 'vocals'), atol=1e-5
+    )
+    assert not list(Config.OUTPUT_DIR.glob('*.wav'))
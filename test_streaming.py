@@ -0,0 +1,104 @@
+"""
+streaming.py (HLS 세그먼트) 테스트
+"""
+import subprocess
+
+import numpy as np
+import pytest
+
+from conftest import requires_ffmpeg
+from streaming import AAC_FRAME_SAMPLES, SegmentStreamer, split_adts
+from utils import wav_header
+
+SR = 44100
+
+
+@pytest.fixture
+def stem_file(tmp_path):
+    t = np.arange(SR * 13) / SR
+    pcm = np.stack([0.5 * np.sin(2 * np.pi * 440 * t) + 0.1 * np.sin(2 * np.pi * 3000 * t),
+                    0.5 * np.sin(2 * np.pi * 660 * t)]).T
+    samples = (pcm * 32767 * 0.8).astype('<i2')
+    path = tmp_path / 'song_vocals.wav'
+    path.write_bytes(wav_header(len(samples), 2, SR) + samples.tobytes())
+    return path, samples
+
+
+def read_ts_audio(data: bytes) -> tuple:
+    """MPEG-TS에서 첫 PES의 PTS(90kHz)와 오디오 PES payload(ADTS) 추출"""
+    pes, first_pts, payloads = None, None, []
+    for position in range(0, len(data), 188):
+        packet = data[position:position + 188]
+        pid = ((packet[1] & 0x1F) << 8) | packet[2]
+        if pid in (0, 0x1000) or pid == 0x1FFF:
+            continue
+        offset = 4
+        if packet[3] & 0x20:
+            offset += 1 + packet[4]
+        payload = packet[offset:]
+        if packet[1] & 0x40:
+            if payload[:3] != b'\x00\x00\x01' or payload[3] != 0xC0:
+                continue
+            if pes is not None:
+                payloads.append(pes)
+            header_length = payload[8]
+            if first_pts is None:
+                p = payload[9:14]
+                first_pts = (((p[0] >> 1) & 0x07) << 30) | (p[1] << 22) | ((p[2] >> 1) << 15) | (p[3] << 7) | (p[4] >> 1)
+            pes = payload[9 + header_length:]
+        elif pes is not None:
+            pes += payload
+    if pes is not None:
+        payloads.append(pes)
+    return first_pts, b''.join(payloads)
+
+
+def decode_adts(adts: bytes) -> np.ndarray:
+    completed = subprocess.run(['ffmpeg', '-v', 'error', '-f', 'aac', '-i', 'pipe:0', '-f', 's16le', 'pipe:1'],
+                               input=adts, capture_output=True, check=True)
+    return np.frombuffer(completed.stdout, dtype='<i2').reshape(-1, 2).astype(np.float64)
+
+
+def test_playlist_segments_are_frame_aligned(tmp_path, stem_file):
+    path, samples = stem_file
+    streamer = SegmentStreamer(tmp_path / 'streams', segment_seconds=4.0)
+    playlist = streamer.playlist({'vocals': path}, {'vocals': 1.0})
+
+    durations = [float(line[8:-1]) for line in playlist.splitlines() if line.startswith('#EXTINF:')]
+    assert len(durations) == 4
+    assert streamer.segment_frames(SR) % AAC_FRAME_SAMPLES == 0
+    assert sum(durations) == pytest.approx(len(samples) / SR, abs=0.005)
+    assert '#EXT-X-ENDLIST' in playlist
+
+
+def test_split_adts_rejects_garbage():
+    assert split_adts(b'') == []
+    with pytest.raises(ValueError):
+        split_adts(b'\x00' * 16)
+
+
+@requires_ffmpeg
+def test_segments_play_back_without_gaps(tmp_path, stem_file):
+    path, samples = stem_file
+    streamer = SegmentStreamer(tmp_path / 'streams', segment_seconds=4.0)
+    paths, gains = {'vocals': path}, {'vocals': 1.0}
+    segment_frames = streamer.segment_frames(SR)
+
+    pts, adts = [], b''
+    for index in range(4):
+        first_pts, audio = read_ts_audio(streamer.segment('song', paths, gains, index).read_bytes())
+        pts.append(first_pts)
+        adts += audio
+
+    # 세그먼트 시작 타임스탬프가 곡 전체 기준으로 이어짐
+    steps = np.diff(pts) / 90000
+    assert steps == pytest.approx([segment_frames / SR] * 3, abs=1e-4)
+
+    # 세그먼트를 이어서 디코딩하면 경계에도 priming/padding으로 인한 끊김이 없음
+    decoded = decode_adts(adts)
+    assert abs(len(decoded) - len(samples)) < AAC_FRAME_SAMPLES
+    frames = min(len(decoded), len(samples))
+    error = np.abs(decoded[:frames] - samples[:frames])
+    interior = error[segment_frames // 2 - 2000:segment_frames // 2 + 2000].max()
+    for boundary in range(segment_frames, frames, segment_frames):
+        assert error[boundary - 2000:boundary + 2000].max() < 2 * interior + 500
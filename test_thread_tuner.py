@@ -0,0 +1,60 @@
+"""
+thread_tuner.py 테스트 (실제 측정 대신 calibrate를 바꿔 캐시 동작 확인)
+"""
+import json
+
+import pytest
+
+import thread_tuner
+from config import Config
+
+
+@pytest.fixture
+def tuner(monkeypatch):
+    """측정/적용 호출을 기록하는 자동 튜닝 환경"""
+    monkeypatch.setattr(Config, 'THREAD_AUTOTUNE', True)
+    calls = {'calibrate': 0, 'applied': []}
+
+    def calibrate(model_name, cpus):
+        calls['calibrate'] += 1
+        return {'intra_op': 2, 'inter_op': 1, 'seconds': 1.0, 'measurements': []}
+
+    monkeypatch.setattr(thread_tuner, 'calibrate', calibrate)
+    monkeypatch.setattr(thread_tuner, 'apply_thread_config', lambda intra, inter: calls['applied'].append((intra, inter)))
+    return calls
+
+
+def test_candidate_configs_cover_powers_of_two_and_shared_split(monkeypatch):
+    monkeypatch.setattr(Config, 'THREAD_TUNE_CONCURRENCY', 3)
+    configs = thread_tuner.candidate_configs(6)
+    assert sorted({intra for intra, _ in configs}) == [1, 2, 4, 6]
+    assert {inter for _, inter in configs} == {1, 2}
+    assert thread_tuner.candidate_configs(1) == [(1, 1)]
+
+
+def test_measured_config_is_cached(tuner):
+    assert thread_tuner.tune_threads('tiny')['intra_op'] == 2
+    assert thread_tuner.tune_threads('tiny')['intra_op'] == 2
+    assert tuner['calibrate'] == 1
+    assert tuner['applied'] == [(2, 1), (2, 1)]
+    assert len(json.loads(Config.THREAD_TUNE_CACHE.read_text())) == 1
+
+    # 모델이 바뀌면 다시 측정
+    thread_tuner.tune_threads('other')
+    assert tuner['calibrate'] == 2
+
+
+def test_failed_calibration_keeps_torch_defaults(tuner, monkeypatch):
+    def failing(model_name, cpus):
+        raise RuntimeError('측정 실패')
+
+    monkeypatch.setattr(thread_tuner, 'calibrate', failing)
+    assert thread_tuner.tune_threads('tiny') is None
+    assert tuner['applied'] == []
+    assert not Config.THREAD_TUNE_CACHE.exists()
+
+
+def test_disabled_autotune_skips(tuner, monkeypatch):
+    monkeypatch.setattr(Config, 'THREAD_AUTOTUNE', False)
+    assert thread_tuner.tune_threads('tiny') is None
+    assert tuner['calibrate'] == 0
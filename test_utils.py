@@ -0,0 +1,64 @@
+"""
+utils.py 테스트
+"""
+import numpy as np
+import pytest
+import torch
+from scipy.io import wavfile
+
+from utils import find_active_spans, save_audio_wav
+
+SR = 1000
+
+
+def tone(seconds: float) -> torch.Tensor:
+    t = torch.arange(int(seconds * SR)) / SR
+    return (0.5 * torch.sin(2 * torch.pi * 50 * t)).repeat(2, 1)
+
+
+def silence(seconds: float) -> torch.Tensor:
+    return torch.zeros(2, int(seconds * SR))
+
+
+def spans_of(wav: torch.Tensor, padding: float = 0.5) -> list:
+    return find_active_spans(wav, SR, threshold_db=-50, min_silence=2.0, padding=padding)
+
+
+def test_active_spans_skip_long_silence_with_padding():
+    wav = torch.cat([silence(3), tone(4), silence(5), tone(2)], dim=1)
+    assert spans_of(wav) == [(2500, 7500), (11500, 14000)]
+
+
+def test_short_silence_and_overlapping_padding_are_merged():
+    wav = torch.cat([tone(2), silence(1), tone(2), silence(2.5), tone(1)], dim=1)
+    assert spans_of(wav) == [(0, 5500), (7000, 8500)]
+    assert spans_of(wav, padding=1.5) == [(0, 8500)]
+
+
+def test_all_silent_and_all_active():
+    assert spans_of(silence(10)) == []
+    assert spans_of(tone(3)) == [(0, 3 * SR)]
+
+
+def reference_wav(audio: torch.Tensor, sr: int, path) -> bytes:
+    """이전 writer(save_audio_scipy)와 같은 방식으로 전체를 한 번에 변환해 저장"""
+    audio_np = audio.float().numpy()
+    audio_np = audio_np.T if audio_np.ndim == 2 else audio_np.reshape(-1, 1)
+    wavfile.write(str(path), sr, (np.clip(audio_np, -1.0, 1.0) * 32767).astype(np.int16))
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize('dtype', [torch.float32, torch.float16, torch.bfloat16])
+@pytest.mark.parametrize('chunk_frames', [1000, 4096, 100000])
+def test_chunked_wav_writer_is_byte_identical(tmp_path, dtype, chunk_frames):
+    torch.manual_seed(0)
+    # 범위를 넘는 값(클리핑)과 청크 경계에 걸치지 않는 길이 포함
+    audio = (torch.randn(2, 10007) * 0.6).to(dtype)
+    save_audio_wav(audio, 44100, str(tmp_path / 'chunked.wav'), chunk_frames=chunk_frames)
+    assert (tmp_path / 'chunked.wav').read_bytes() == reference_wav(audio, 44100, tmp_path / 'reference.wav')
+
+
+def test_chunked_wav_writer_mono(tmp_path):
+    audio = torch.linspace(-1.5, 1.5, 5000)
+    save_audio_wav(audio, 22050, str(tmp_path / 'mono.wav'), chunk_frames=777)
+    assert (tmp_path / 'mono.wav').read_bytes() == reference_wav(audio, 22050, tmp_path / 'reference.wav')
@@ -0,0 +1,210 @@
+"""
+torch 스레드 수 자동 튜닝 모듈
+
+시작 시 cgroup CPU 제한을 읽고, 후보 (intra-op, inter-op) 스레드 조합마다
+짧은 합성 입력으로 Demucs를 실행해 가장 빠른 조합을 고정한다.
+결과는 캐시 파일에 저장되어 다음 시작부터는 측정을 건너뛴다.
+"""
+import json
+import multiprocessing
+import statistics
+import threading
+import time
+
+import torch
+
+from config import Config
+from utils import available_cpus, read_cgroup_cpu_limit
+from logger import get_logger
+
+logger = get_logger('thread_tuner')
+
+
+def candidate_configs(cpus: int) -> list:
+    """
+    측정할 (intra-op, inter-op) 스레드 조합 목록
+
+    Args:
+        cpus: 사용 가능한 CPU 코어 수
+
+    Returns:
+        (intra, inter) 튜플 리스트
+    """
+    intra_candidates = {cpus}
+    n = 1
+    while n < cpus:
+        intra_candidates.add(n)
+        n *= 2
+
+    # 동시 작업이 각자 intra-op 스레드를 쓰므로 나눠 쓰는 경우도 후보에 포함
+    concurrency = max(Config.THREAD_TUNE_CONCURRENCY, 1)
+    intra_candidates.add(max(cpus // concurrency, 1))
+
+    inter_candidates = sorted({1, min(2, cpus)})
+    return [(intra, inter) for intra in sorted(intra_candidates) for inter in inter_candidates]
+
+
+def _measure_config(model_name: str, intra: int, inter: int, seconds: float,
+                    repeats: int, concurrency: int, result_queue) -> None:
+    """
+    자식 프로세스에서 한 스레드 조합의 추론 시간 측정
+
+    inter-op 스레드 수는 프로세스당 한 번만 설정할 수 있으므로 조합마다 새 프로세스를 쓴다.
+    """
+    try:
+        torch.set_num_threads(intra)
+        torch.set_num_interop_threads(inter)
+
+        from demucs.pretrained import get_model
+        from demucs.apply import apply_model
+
+        model = get_model(model_name)
+        model.eval()
+        length = int(seconds * model.samplerate)
+        generator = torch.Generator().manual_seed(0)
+        mix = torch.randn(1, model.audio_channels, length, generator=generator) * 0.1
+
+        def run():
+            with torch.no_grad():
+                apply_model(model, mix, shifts=0, split=True, device='cpu')
+
+        # 워밍업
+        run()
+
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            workers = [threading.Thread(target=run) for _ in range(concurrency)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            timings.append(time.perf_counter() - start)
+
+        result_queue.put((intra, inter, statistics.median(timings), None))
+    except Exception as e:
+        result_queue.put((intra, inter, None, str(e)))
+
+
+def calibrate(model_name: str, cpus: int) -> dict:
+    """
+    후보 스레드 조합을 모두 측정해 가장 빠른 조합 반환
+
+    Args:
+        model_name: Demucs 모델 이름
+        cpus: 사용 가능한 CPU 코어 수
+
+    Returns:
+        dict: {'intra_op': ..., 'inter_op': ..., 'seconds': ..., 'measurements': [...]}
+    """
+    ctx = multiprocessing.get_context('spawn')
+    concurrency = max(Config.THREAD_TUNE_CONCURRENCY, 1)
+    measurements = []
+
+    for intra, inter in candidate_configs(cpus):
+        result_queue = ctx.Queue()
+        process = ctx.Process(
+            target=_measure_config,
+            args=(model_name, intra, inter, Config.THREAD_TUNE_SECONDS,
+                  Config.THREAD_TUNE_REPEATS, concurrency, result_queue)
+        )
+        process.start()
+        try:
+            _, _, elapsed, error = result_queue.get(timeout=Config.THREAD_TUNE_TIMEOUT)
+        except Exception:
+            elapsed, error = None, '시간 초과'
+        process.join(timeout=5)
+        if process.is_alive():
+            process.kill()
+
+        if error:
+            logger.warning(f"스레드 조합 측정 실패 (intra={intra}, inter={inter}): {error}")
+            continue
+
+        logger.info(f"스레드 조합 측정: intra={intra}, inter={inter} → {elapsed:.2f}초")
+        measurements.append({'intra_op': intra, 'inter_op': inter, 'seconds': elapsed})
+
+    if not measurements:
+        raise RuntimeError("모든 스레드 조합 측정에 실패했습니다")
+
+    best = min(measurements, key=lambda m: m['seconds'])
+    return {**best, 'measurements': measurements}
+
+
+def _cache_key(model_name: str, cpus: int, cpu_limit: float) -> str:
+    """하드웨어/모델/torch 버전이 바뀌면 다시 측정하도록 캐시 키 생성"""
+    return (f"{model_name}|cpus={cpus}|limit={cpu_limit}|torch={torch.__version__}"
+            f"|concurrency={Config.THREAD_TUNE_CONCURRENCY}")
+
+
+def apply_thread_config(intra: int, inter: int) -> None:
+    """
+    torch 스레드 수 설정
+
+    Args:
+        intra: intra-op 스레드 수
+        inter: inter-op 스레드 수
+    """
+    torch.set_num_threads(intra)
+    try:
+        torch.set_num_interop_threads(inter)
+    except RuntimeError as e:
+        # 이미 병렬 작업이 시작된 뒤에는 inter-op 스레드 수를 바꿀 수 없음
+        logger.warning(f"inter-op 스레드 수 설정 실패: {e}")
+    logger.info(f"torch 스레드 설정: intra-op={intra}, inter-op={inter}")
+
+
+def tune_threads(model_name: str) -> dict:
+    """
+    캐시된 스레드 설정을 적용하거나, 없으면 측정 후 적용 및 저장
+
+    모델 로딩과 추론이 시작되기 전에 호출해야 inter-op 설정이 반영된다.
+
+    Args:
+        model_name: Demucs 모델 이름
+
+    Returns:
+        dict: 적용된 설정 (튜닝을 건너뛰면 None)
+    """
+    if not Config.THREAD_AUTOTUNE:
+        logger.info("스레드 자동 튜닝 비활성화 (설정)")
+        return None
+
+    if Config.USE_GPU and (torch.cuda.is_available() or torch.backends.mps.is_available()):
+        logger.info("GPU 사용 환경이므로 스레드 자동 튜닝 건너뜀")
+        return None
+
+    cpu_limit = read_cgroup_cpu_limit()
+    cpus = available_cpus()
+    key = _cache_key(model_name, cpus, cpu_limit)
+    logger.info(f"CPU 환경: 사용 가능 코어 {cpus}개, cgroup 제한 {cpu_limit or '없음'}")
+
+    cache_file = Config.THREAD_TUNE_CACHE
+    cache = {}
+    if cache_file.exists():
+        try:
+            cache = json.loads(cache_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            logger.warning(f"스레드 캐시 읽기 실패: {e}")
+
+    config = cache.get(key)
+    if config:
+        logger.info("캐시된 스레드 설정 사용")
+    else:
+        logger.info("스레드 설정 측정 시작 (최초 1회)")
+        try:
+            config = calibrate(model_name, cpus)
+        except Exception as e:
+            logger.error(f"스레드 튜닝 실패, torch 기본값 사용: {e}", exc_info=True)
+            return None
+
+        cache[key] = config
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(cache, indent=2), encoding='utf-8')
+            logger.info(f"스레드 설정 저장: {cache_file}")
+        except OSError as e:
+            logger.warning(f"스레드 캐시 저장 실패: {e}")
+
+    apply_thread_config(config['intra_op'], config['inter_op'])
+    return config
@@ -1,12 +1,19 @@
 """
 유틸리티 함수 모음
 """
+import json
+import math
 import os
+import shutil
+import hashlib
+import struct
+import subprocess
+import uuid
 from pathlib import Path
 from pydub import AudioSegment
 import numpy as np
-from scipy.io import wavfile
 import torch
+from config import Config
 from logger import get_logger
 
 logger = get_logger('utils')
@@ -42,13 +49,156 @@ def cleanup_temp_files(temp_file: str) -> None:
         logger.warning(f"정리 중 오류: {e}")
 
 
-def convert_to_wav(input_file: str, output_file: str) -> str:
+def create_job_workspace(base_dir: str, key: tuple = None) -> Path:
+    """
+    작업별 임시 디렉토리 생성 (동시 요청끼리 임시 파일이 겹치지 않도록)
+
+    Args:
+        base_dir: 임시 파일 기본 디렉토리
+        key: 작업 키 (주어지면 같은 키는 같은 디렉토리를 사용해, 중단된 작업의 파일을 이어서 씀)
+
+    Returns:
+        생성된 작업 디렉토리 경로
+    """
+    if key is None:
+        workspace = Path(base_dir) / uuid.uuid4().hex
+    else:
+        workspace = Path(base_dir) / f"job-{hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:20]}"
+        if workspace.exists():
+            logger.info(f"이전 작업 디렉토리 재사용: {workspace.name}")
+            return workspace
+    workspace.mkdir(parents=True)
+    logger.debug(f"작업 디렉토리 생성: {workspace}")
+    return workspace
+
+
+def cleanup_workspace(workspace: str) -> None:
+    """
+    작업 디렉토리 통째로 정리
+
+    Args:
+        workspace: 삭제할 작업 디렉토리 경로
+    """
+    try:
+        if os.path.isdir(workspace):
+            shutil.rmtree(workspace)
+            logger.info(f"작업 디렉토리 삭제: {Path(workspace).name}")
+    except Exception as e:
+        logger.warning(f"정리 중 오류: {e}")
+
+
+def probe_media(media_file: str) -> dict:
+    """
+    ffprobe로 컨테이너와 오디오 스트림 확인
+
+    Args:
+        media_file: 검사할 미디어 파일 경로
+
+    Returns:
+        dict: {'format': 컨테이너 이름, 'duration': 길이(초), 'audio_streams': 오디오 스트림 수}
+
+    Raises:
+        ValueError: 읽을 수 없는 파일이거나 오디오 스트림이 없을 때
+    """
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-show_entries', 'format=format_name,duration:stream=codec_type',
+        '-of', 'json', str(media_file)
+    ]
+    try:
+        completed = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise ValueError(f"ffprobe 실행 실패: {e}")
+
+    if completed.returncode != 0:
+        logger.warning(f"ffprobe 오류: {completed.stderr.strip()}")
+        raise ValueError("지원하지 않거나 손상된 미디어 파일입니다.")
+
+    info = json.loads(completed.stdout or '{}')
+    audio_streams = sum(1 for stream in info.get('streams', []) if stream.get('codec_type') == 'audio')
+    if audio_streams == 0:
+        raise ValueError("오디오 스트림이 없는 파일입니다.")
+
+    media_format = info.get('format', {})
+    result = {
+        'format': media_format.get('format_name'),
+        'duration': float(media_format.get('duration') or 0),
+        'audio_streams': audio_streams,
+    }
+    logger.debug(f"미디어 정보: {result}")
+    return result
+
+
+def read_cgroup_cpu_limit() -> float:
+    """
+    cgroup CPU 할당량(quota / period) 읽기
+
+    cgroup v2(cpu.max)를 먼저 보고, 없으면 v1(cpu.cfs_quota_us)을 본다.
+
+    Returns:
+        사용 가능한 CPU 수 (제한이 없거나 읽을 수 없으면 None)
+    """
+    try:
+        cpu_max = Path('/sys/fs/cgroup/cpu.max')
+        if cpu_max.exists():
+            quota, period = cpu_max.read_text().split()[:2]
+            if quota == 'max':
+                return None
+            return int(quota) / int(period)
+
+        quota_file = Path('/sys/fs/cgroup/cpu/cpu.cfs_quota_us')
+        period_file = Path('/sys/fs/cgroup/cpu/cpu.cfs_period_us')
+        if quota_file.exists() and period_file.exists():
+            quota = int(quota_file.read_text())
+            if quota <= 0:
+                return None
+            return quota / int(period_file.read_text())
+    except (OSError, ValueError) as e:
+        logger.debug(f"cgroup CPU 제한 읽기 실패: {e}")
+    return None
+
+
+def available_cpus() -> int:
+    """
+    현재 프로세스가 사용할 수 있는 CPU 코어 수
+
+    CPU affinity와 컨테이너의 cgroup CPU 할당량 중 작은 값을 사용한다.
+
+    Returns:
+        CPU 코어 수 (최소 1)
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # macOS 등 sched_getaffinity가 없는 플랫폼
+        cpus = os.cpu_count() or 1
+
+    limit = read_cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(cpus, 1)
+
+
+def cpu_supports_bf16() -> bool:
+    """
+    CPU가 bfloat16 연산을 하드웨어로 지원하는지 확인 (AVX512-BF16, AMX 등)
+
+    지원하지 않는 CPU에서도 autocast는 동작하지만 에뮬레이션이라 float32보다 느리다.
+    """
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def convert_to_wav(input_file: str, output_file: str, keep_input: bool = False) -> str:
     """
     오디오 파일을 WAV로 변환
 
     Args:
         input_file: 입력 파일 경로
         output_file: 출력 파일 경로
+        keep_input: True면 원본 파일을 지우지 않음 (작업을 재개할 때 다시 다운로드하지 않도록)
 
     Returns:
         변환된 WAV 파일 경로
@@ -59,7 +209,7 @@ def convert_to_wav(input_file: str, output_file: str) -> str:
         audio.export(output_file, format="wav")
 
         # 원본 파일 삭제
-        if os.path.exists(input_file):
+        if not keep_input and os.path.exists(input_file):
             os.remove(input_file)
             logger.debug(f"원본 파일 삭제: {input_file}")
 
@@ -70,19 +220,35 @@ def convert_to_wav(input_file: str, output_file: str) -> str:
         raise Exception(f"오디오 변환 실패: {str(e)}")
 
 
-def load_audio_with_pydub(audio_file: str) -> tuple:
+def decode_audio(audio_file: str) -> AudioSegment:
     """
-    pydub를 사용해 오디오 파일을 torch tensor로 로드
+    WAV 파일을 pydub AudioSegment로 디코딩 (16-bit PCM 원본을 메모리에 올림)
 
     Args:
-        audio_file: 로드할 오디오 파일 경로
+        audio_file: 로드할 WAV 파일 경로
 
     Returns:
-        tuple: (오디오 텐서, 샘플레이트)
+        AudioSegment
     """
     try:
         logger.info(f"오디오 로드 중: {audio_file}")
-        audio = AudioSegment.from_wav(audio_file)
+        return AudioSegment.from_wav(audio_file)
+    except Exception as e:
+        logger.error(f"오디오 로드 실패: {str(e)}", exc_info=True)
+        raise Exception(f"오디오 로드 실패: {str(e)}")
+
+
+def audio_to_tensor(audio: AudioSegment) -> tuple:
+    """
+    디코딩한 AudioSegment를 float32 torch tensor로 변환
+
+    Args:
+        audio: decode_audio 결과
+
+    Returns:
+        tuple: (오디오 텐서 (channels, samples), 샘플레이트)
+    """
+    try:
         sr = audio.frame_rate
 
         # numpy 배열로 변환
@@ -100,37 +266,139 @@ def load_audio_with_pydub(audio_file: str) -> tuple:
         logger.info(f"오디오 로드 완료: shape={wav.shape}, sr={sr}")
         return wav, sr
     except Exception as e:
-        logger.error(f"오디오 로드 실패: {str(e)}", exc_info=True)
-        raise Exception(f"오디오 로드 실패: {str(e)}")
+        logger.error(f"오디오 변환 실패: {str(e)}", exc_info=True)
+        raise Exception(f"오디오 변환 실패: {str(e)}")
+
+
+def load_audio_with_pydub(audio_file: str) -> tuple:
+    """
+    pydub를 사용해 오디오 파일을 torch tensor로 로드 (decode_audio + audio_to_tensor)
+
+    Args:
+        audio_file: 로드할 오디오 파일 경로
+
+    Returns:
+        tuple: (오디오 텐서, 샘플레이트)
+    """
+    return audio_to_tensor(decode_audio(audio_file))
 
 
-def save_audio_scipy(audio_tensor: torch.Tensor, sample_rate: int, output_path: str) -> None:
+def find_active_spans(wav: torch.Tensor, sr: int, threshold_db: float,
+                      min_silence: float, padding: float, frame_seconds: float = 0.05) -> list:
     """
-    torch tensor를 WAV 파일로 저장
+    에너지 기반으로 무음이 아닌 구간 찾기
+
+    프레임별 RMS가 threshold_db 미만인 구간이 min_silence초 이상 이어지면 무음으로 보고,
+    나머지 구간을 앞뒤로 padding초 넓혀 반환한다.
 
     Args:
-        audio_tensor: 저장할 오디오 텐서
+        wav: 오디오 텐서 (channels, samples)
+        sr: 샘플레이트
+        threshold_db: 무음 판단 기준 (dBFS)
+        min_silence: 건너뛸 최소 무음 길이 (초)
+        padding: 유효 구간 앞뒤로 추가할 여유 (초)
+        frame_seconds: 에너지 계산 프레임 길이 (초)
+
+    Returns:
+        list: [(시작 샘플, 끝 샘플), ...] 유효 구간 목록 (전부 무음이면 빈 리스트)
+    """
+    length = wav.shape[-1]
+    frame = max(int(frame_seconds * sr), 1)
+    n_frames = math.ceil(length / frame)
+
+    # 프레임별 평균 에너지 (채널 평균)
+    padded = torch.nn.functional.pad(wav, (0, n_frames * frame - length))
+    energy = padded.reshape(wav.shape[0], n_frames, frame).pow(2).mean(dim=(0, 2))
+    rms_db = 10 * torch.log10(energy + 1e-12)
+    silent = (rms_db < threshold_db).numpy()
+
+    # 무음 구간의 시작/끝 프레임 (경계 검출)
+    edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+    silence_starts = np.flatnonzero(edges == 1)
+    silence_ends = np.flatnonzero(edges == -1)
+
+    # 충분히 긴 무음만 남김
+    long_enough = (silence_ends - silence_starts) * frame >= min_silence * sr
+    silence_starts, silence_ends = silence_starts[long_enough], silence_ends[long_enough]
+
+    # 무음의 여집합이 유효 구간
+    active_starts = np.concatenate(([0], silence_ends)) * frame
+    active_ends = np.concatenate((silence_starts, [n_frames])) * frame
+    nonempty = active_ends > active_starts
+    active_starts, active_ends = active_starts[nonempty], active_ends[nonempty]
+
+    # 여유 추가 후 겹치는 구간 병합
+    pad = int(padding * sr)
+    spans = []
+    for start, end in zip(active_starts, active_ends):
+        start, end = max(int(start) - pad, 0), min(int(end) + pad, length)
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (spans[-1][0], max(spans[-1][1], end))
+        else:
+            spans.append((start, end))
+    return spans
+
+
+def wav_header(frames: int, channels: int, sr: int) -> bytes:
+    """
+    16-bit PCM WAV 헤더 생성
+
+    Args:
+        frames: 프레임 수
+        channels: 채널 수
+        sr: 샘플레이트
+
+    Returns:
+        44바이트 WAV 헤더
+    """
+    block_align = channels * 2
+    data_size = frames * block_align
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', 36 + data_size, b'WAVE',
+        b'fmt ', 16, 1, channels, sr, sr * block_align, block_align, 16,
+        b'data', data_size
+    )
+
+
+def save_audio_wav(audio_tensor: torch.Tensor, sample_rate: int, output_path: str,
+                   chunk_frames: int = None) -> None:
+    """
+    torch tensor를 16-bit PCM WAV 파일로 저장 (청크 단위로 변환해 바로 기록)
+
+    전체 길이의 numpy 복사본을 만들지 않으므로 stem 길이와 관계없이
+    청크 크기만큼의 버퍼만 추가로 사용한다.
+
+    Args:
+        audio_tensor: 저장할 오디오 텐서 (channels, samples) 또는 (samples,)
         sample_rate: 샘플레이트
         output_path: 출력 파일 경로
+        chunk_frames: 한 번에 변환하는 프레임 수 (None이면 Config.WAV_WRITE_CHUNK_FRAMES)
     """
     try:
         logger.debug(f"오디오 저장 중: {output_path}")
+        chunk_frames = chunk_frames or Config.WAV_WRITE_CHUNK_FRAMES
 
-        # CPU로 이동 및 numpy 변환
-        audio_np = audio_tensor.cpu().numpy()
+        audio = audio_tensor.detach().cpu()
+        if audio.dim() == 1:
+            audio = audio.unsqueeze(0)
+        channels, frames = audio.shape
 
-        # (channels, samples) -> (samples, channels)
-        if audio_np.ndim == 2:
-            audio_np = audio_np.T
-        else:
-            audio_np = audio_np.reshape(-1, 1)
+        # 청크마다 재사용하는 변환 버퍼 (frames, channels)
+        scaled = np.empty((chunk_frames, channels), dtype=np.float32)
+        pcm = np.empty((chunk_frames, channels), dtype='<i2')
 
-        # int16으로 변환
-        audio_np = np.clip(audio_np, -1.0, 1.0)
-        audio_np = (audio_np * 32767).astype(np.int16)
+        with open(output_path, 'wb') as f:
+            f.write(wav_header(frames, channels, sample_rate))
+            for start in range(0, frames, chunk_frames):
+                n = min(chunk_frames, frames - start)
+                # (channels, n) -> (n, channels), float16/bfloat16은 이 구간만 float32로 변환
+                chunk = audio[:, start:start + n].float().numpy().T
+                np.clip(chunk, -1.0, 1.0, out=scaled[:n])
+                np.multiply(scaled[:n], 32767, out=scaled[:n])
+                np.copyto(pcm[:n], scaled[:n], casting='unsafe')
+                f.write(memoryview(pcm[:n]).cast('B'))
 
-        # wav 파일로 저장
-        wavfile.write(str(output_path), sample_rate, audio_np)
         logger.debug(f"저장 완료: {output_path}")
     except Exception as e:
         logger.error(f"오디오 저장 실패: {str(e)}", exc_info=True)